@@ -2,24 +2,90 @@
 Downloader for multex east corpus.
 """
 
+import argparse
+import hashlib
 import os
 from os.path import expanduser, abspath
+import re
+import shutil
 import sys
-import urllib
+import time
 import zipfile
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    from urllib.request import Request, urlopen
+    from urllib.error import HTTPError
+except ImportError:
+    from urllib2 import Request, urlopen, HTTPError
 
 import nltk.data
 
 isCustomPath = False
 
+# the url of the corpus archive, can be replaced by a mirror with the environment
+# variable MTE_DOWNLOAD_URL or the url argument of download()
+DEFAULT_URL = "https://www.clarin.si/repository/xmlui/bitstream/handle/11356/1043/MTE1984-ana.zip"
+ARCHIVE_NAME = "mte_teip5.zip"
+
+# the language files of the corpus, e.g. MTE1984-ana/oana-en.xml
+LANGUAGE_FILE = re.compile(r'^(?:.*/)?oana-(\w+)\.xml$')
+
+# end of central directory record of a zip file: signature, fixed size and maximal comment length
+EOCD_SIGNATURE = b'\x50\x4b\x05\x06'
+EOCD_SIZE = 22
+EOCD_MAX_COMMENT = 0xffff
+
+# Progress of a download, passed to the on_progress callback. The phase is one of
+# 'download', 'resume', 'skip', 'verify', 'extract' and 'done'. Bytes are those of
+# the archive while downloading and the uncompressed bytes of the members while
+# extracting, the throughput is given in bytes per second. Unknown values are None.
+ProgressEvent = namedtuple('ProgressEvent', ['phase', 'bytes_done', 'bytes_total',
+                                             'members_done', 'members_total', 'throughput'])
+
 
-def main():
-    download()
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Downloads the MULTEXT-East corpus.")
+    parser.add_argument("-d", "--target-dir",
+                        help="directory the corpus is saved to, asked interactively if not given")
+    parser.add_argument("-l", "--languages", nargs="+", metavar="LANG",
+                        help="language codes of the files that are extracted, e.g. en sl (default is all)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="number of worker processes extracting the files")
+    parser.add_argument("--url", help="url of the archive, e.g. of a mirror")
+    parser.add_argument("--checksum", help="expected sha256 digest of the archive")
+    parser.add_argument("--no-extract", dest="extract", action="store_false",
+                        help="keep only the archive, MTECorpusReader can read it directly")
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not report the progress")
+    args = parser.parse_args(argv)
+    download(args.target_dir, languages=args.languages, workers=args.workers,
+             on_progress=(lambda event: None) if args.quiet else None,
+             url=args.url, checksum=args.checksum, extract=args.extract)
 
 
-def download():
+def download(target_dir=None, languages=None, workers=None, on_progress=None, url=None, checksum=None,
+             extract=True):
+    """
+    Downloads and extracts the corpus. An interrupted download is resumed and
+    an archive that has already been downloaded and verified is not fetched again.
+
+    :param target_dir: The directory the archive and the extracted corpus (mte_teip5)
+                       are saved to, the user is asked for it if it is not given
+    :param languages: The language codes of the files that are extracted, e.g.
+                      ['en', 'sl'] (default is all languages)
+    :param workers: Number of worker processes extracting the files (default is serial extraction)
+    :param on_progress: Function called with a ProgressEvent whenever the download
+                        progresses (default is console_report)
+    :param url: The url of the archive, e.g. of a local mirror (default is
+                MTE_DOWNLOAD_URL from the environment or DEFAULT_URL)
+    :param checksum: The expected sha256 hex digest of the (repaired) archive,
+                     a mismatching archive is downloaded again
+    :param extract: Set 'False' to keep only the archive, MTECorpusReader can read
+                    the files directly from it
+    """
     try:
-        __download__()
+        __download__(target_dir, languages, workers, on_progress, url, checksum, extract)
     except KeyboardInterrupt:
         print("\nDiscarded download due to keyboard interrupt.\n")
 
@@ -52,9 +118,11 @@ def __getFilePath__():
         return abspath(nltk.data.path[pathNum]) + "/corpora/"
 
 
-def __download__():
-    filePath = __getFilePath__()
-    finished = False
+def __download__(target_dir=None, languages=None, workers=None, on_progress=None, url=None, checksum=None,
+                 extract=True):
+    filePath = __getFilePath__() if target_dir is None else abspath(target_dir) + "/"
+    url = url or os.environ.get("MTE_DOWNLOAD_URL") or DEFAULT_URL
+    on_progress = console_report if on_progress is None else on_progress
 
     try:
         if not os.path.exists(filePath):
@@ -62,37 +130,229 @@ def __download__():
     except EnvironmentError:
         print("Could not create or write to file")
     else:
-        # download zip archive
-        with open(filePath + "mte_teip5.zip", "wb") as f:
-            url = "https://www.clarin.si/repository/xmlui/bitstream/handle/11356/1043/MTE1984-ana.zip"
-            try:
-                request = urllib.urlopen(url)
-            except:
-                request = urllib.request.urlopen(url)
-            chunk_read_write(f, request, report_hook=chunk_report)
-            print("Download finished")
-
-        # handle "invalid" zip format from clarin.si
-        with open(filePath + "mte_teip5.zip", "r+b") as f:
-            content = f.read()
-            pos = content.rfind(
-                b'\x50\x4b\x05\x06')  # reverse find: this string of bytes is the end of the zip's central directory.
-            if pos > 0:
-                f.seek(pos + 20)  # +20: see secion V.I in 'ZIP format' link above.
-                f.truncate()
-                f.write(b'\x00\x00')  # Zip file comment length: 0 byte length; tell zip applications to stop reading.
-                f.seek(0)
-
-        # extract zip archive
-        print("Extracting files...")
-        with zipfile.ZipFile(filePath + "mte_teip5.zip", "r") as z:
-            z.extractall(filePath)
-        os.rename(filePath + "MTE1984-ana", filePath + "mte_teip5")
-
-    print("Done")
+        archive = filePath + ARCHIVE_NAME
+        if __is_verified__(archive, checksum):
+            on_progress(ProgressEvent('skip', None, None, None, None, None))
+        else:
+            fetch_archive(url, archive, checksum, on_progress)
+
+        if extract:
+            extract_archive(archive, filePath + "mte_teip5", languages, workers, on_progress)
+        on_progress(ProgressEvent('done', None, None, None, None, None))
+
+
+def extract_archive(archive, target, languages=None, workers=None, on_progress=None):
+    """
+    Extracts the corpus archive into the target directory, which replaces an
+    existing one. Only the files of the given languages are extracted, all
+    other files of the corpus are extracted as well. With more than one worker
+    the members are decompressed in parallel by a pool of processes.
+
+    :param archive: The path of the zip archive
+    :param target: The directory the files are extracted to
+    :param languages: The language codes of the files that are extracted (default is all languages)
+    :param workers: Number of worker processes (default is serial extraction)
+    :param on_progress: Function called with a ProgressEvent after each extracted member
+    :return: the names of the extracted members
+    :rtype: list(str)
+    """
+    with zipfile.ZipFile(archive, "r") as z:
+        infos = [i for i in z.infolist() if __is_selected__(i.filename, languages) and not i.filename.endswith("/")]
+    members = [i.filename for i in infos]
+    sizes = dict((i.filename, i.file_size) for i in infos)
+    bytes_total = sum(sizes.values())
+    tmp = target + ".tmp"
+    if os.path.exists(tmp):
+        shutil.rmtree(tmp)
+
+    start, bytes_done = time.time(), 0
+    def report(members_done, member):
+        if on_progress is not None:
+            elapsed = time.time() - start
+            on_progress(ProgressEvent('extract', bytes_done, bytes_total, members_done, len(members),
+                                      bytes_done / elapsed if elapsed > 0 else None))
+
+    report(0, None)
+    if workers is not None and workers > 1 and len(members) > 1:
+        # ZipFile.extract creates missing directories with an exists check followed by makedirs,
+        # which races between the workers, so all directories are created up front
+        for directory in set(_member_directory(tmp, m) for m in members):
+            os.makedirs(directory, exist_ok=True)
+        with ProcessPoolExecutor(max_workers=min(workers, len(members))) as executor:
+            futures = [executor.submit(_extract_member, archive, m, tmp) for m in members]
+            for (done, future) in enumerate(as_completed(futures), 1):
+                member = future.result()
+                bytes_done += sizes[member]
+                report(done, member)
+    else:
+        for (done, member) in enumerate(members, 1):
+            _extract_member(archive, member, tmp)
+            bytes_done += sizes[member]
+            report(done, member)
+
+    # the members are stored in the directory MTE1984-ana, which becomes the target
+    content = os.path.join(tmp, "MTE1984-ana")
+    if os.path.exists(target):
+        shutil.rmtree(target)
+    os.rename(content if os.path.isdir(content) else tmp, target)
+    if os.path.exists(tmp):
+        shutil.rmtree(tmp)
+    return members
+
+
+def _member_directory(target, member):
+    # the directory ZipFile.extract writes a member to, with the same sanitizing of its name
+    parts = [p for p in os.path.splitdrive(member.replace("/", os.path.sep))[1].split(os.path.sep)
+             if p not in ("", os.path.curdir, os.path.pardir)]
+    return os.path.join(target, *parts[:-1])
+
+
+def _extract_member(archive, member, target):
+    # extracts a single member, this is the task executed by the worker processes
+    with zipfile.ZipFile(archive, "r") as z:
+        z.extract(member, target)
+    return member
+
+
+def __is_selected__(member, languages):
+    if languages is None:
+        return True
+    language = LANGUAGE_FILE.match(member)
+    return language is None or language.group(1) in languages
+
+
+def fetch_archive(url, archive, checksum=None, on_progress=None):
+    """
+    Downloads the archive into a partial file next to the target, which is continued
+    with a HTTP Range request if it already exists. The completed archive is repaired,
+    verified and then moved to its target together with a file holding its checksum.
+
+    :param url: The url of the archive
+    :param archive: The path the archive is saved to
+    :param checksum: The expected sha256 hex digest of the repaired archive
+    :param on_progress: Function called with a ProgressEvent after each received chunk
+    :raises IOError: if the transfer is interrupted or the downloaded archive does not match the checksum
+    """
+    on_progress = (lambda event: None) if on_progress is None else on_progress
+    partial = archive + ".part"
+    offset = os.path.getsize(partial) if os.path.exists(partial) else 0
+
+    request = Request(url)
+    if offset > 0:
+        request.add_header("Range", "bytes=%d-" % offset)
+    try:
+        response = urlopen(request)
+    except HTTPError as e:
+        if e.code != 416:
+            raise
+        # range not satisfiable, the partial file is already complete
+        response = None
+
+    if response is not None:
+        if offset > 0 and response.getcode() == 206:
+            on_progress(ProgressEvent('resume', offset, None, None, None, None))
+        else:
+            # the server ignored the range, start over
+            offset = 0
+        start = time.time()
+        def report_hook(bytes_so_far, chunk_size, total_size):
+            elapsed = time.time() - start
+            on_progress(ProgressEvent('download', bytes_so_far, total_size, None, None,
+                                      (bytes_so_far - offset) / elapsed if elapsed > 0 else None))
+        with open(partial, "ab" if offset > 0 else "wb") as f:
+            chunk_read_write(f, response, report_hook=report_hook, offset=offset)
+        response.close()
+
+    on_progress(ProgressEvent('verify', None, None, None, None, None))
+    repair_zip_trailer(partial)
+    digest = file_checksum(partial)
+    if checksum is not None and digest != checksum.lower():
+        os.remove(partial)
+        raise IOError("Checksum mismatch of %s: expected %s, got %s" % (url, checksum, digest))
+    if os.path.exists(archive):
+        os.remove(archive)
+    os.rename(partial, archive)
+    with open(archive + ".sha256", "w") as f:
+        f.write(digest + "\n")
+
+
+def file_checksum(path, chunk_size=1 << 20):
+    """
+    :return: the sha256 hex digest of the file, which is read in chunks
+    :rtype: str
+    """
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def __is_verified__(archive, checksum=None):
+    # an archive is verified if its checksum matches the expected one or the one
+    # recorded after its download
+    if not os.path.exists(archive):
+        return False
+    if checksum is None:
+        try:
+            with open(archive + ".sha256") as f:
+                checksum = f.read().strip()
+        except EnvironmentError:
+            return False
+    return file_checksum(archive) == checksum.lower()
+
+
+def repair_zip_trailer(path):
+    """
+    Handles the "invalid" zip format from clarin.si, whose archives have garbage
+    behind the end of the central directory. Only the tail of the file that can
+    contain this record is read, the garbage is cut off and the comment length is
+    set to 0, which tells zip applications to stop reading.
+
+    :return: True if the trailer was found
+    :rtype: bool
+    """
+    with open(path, "r+b") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        tail_start = max(0, size - EOCD_SIZE - EOCD_MAX_COMMENT)
+        f.seek(tail_start)
+        tail = f.read()
+        pos = tail.rfind(EOCD_SIGNATURE)  # reverse find: this string of bytes is the end of the zip's central directory.
+        if pos < 0:
+            return False
+        f.seek(tail_start + pos + 20)  # +20: see secion V.I in 'ZIP format' link above.
+        f.truncate()
+        f.write(b'\x00\x00')  # Zip file comment length: 0 byte length; tell zip applications to stop reading.
+    return True
+
+
+def console_report(event):
+    """
+    The default progress callback, which writes the events to the console.
+    """
+    if event.phase == 'download':
+        chunk_report(event.bytes_done, None, event.bytes_total)
+    elif event.phase == 'resume':
+        print("Resuming download at byte %d" % event.bytes_done)
+    elif event.phase == 'skip':
+        print("Verified archive found, skipping download")
+    elif event.phase == 'verify':
+        print("Download finished")
+    elif event.phase == 'extract':
+        if event.members_done == 0:
+            print("Extracting files...")
+        sys.stdout.write("Extracted %d of %d files\r" % (event.members_done, event.members_total))
+        if event.members_done == event.members_total:
+            sys.stdout.write('\n')
+    elif event.phase == 'done':
+        print("Done")
 
 
 def chunk_report(bytes_so_far, chunk_size, total_size):
+    if not total_size:
+        sys.stdout.write("Downloaded %d bytes\r" % bytes_so_far)
+        return
     percent = float(bytes_so_far) / total_size
     percent = round(percent * 100, 2)
     sys.stdout.write("Downloaded %d of %d bytes (%0.2f%%)\r" %
@@ -102,13 +362,14 @@ def chunk_report(bytes_so_far, chunk_size, total_size):
         sys.stdout.write('\n')
 
 
-def chunk_read_write(fileHandle, response, chunk_size=8192, report_hook=None):
+def chunk_read_write(fileHandle, response, chunk_size=8192, report_hook=None, offset=0):
     try:
-        total_size = response.info().getheader('Content-Length').strip()
-    except:
-        total_size = response.getheader('Content-Length').strip()
-    total_size = int(total_size)
-    bytes_so_far = 0
+        total_size = response.info().getheader('Content-Length')
+    except AttributeError:
+        total_size = response.getheader('Content-Length')
+    # the content length of a resumed download only covers the remaining bytes
+    total_size = offset + int(total_size.strip()) if total_size else None
+    bytes_so_far = offset
 
     while 1:
         chunk = response.read(chunk_size)
@@ -121,6 +382,9 @@ def chunk_read_write(fileHandle, response, chunk_size=8192, report_hook=None):
         if report_hook:
             report_hook(bytes_so_far, chunk_size, total_size)
 
+    if total_size is not None and bytes_so_far < total_size:
+        # the connection was closed early, the bytes written so far are kept for resuming
+        raise IOError("Download incomplete: received %d of %d bytes" % (bytes_so_far, total_size))
     return bytes_so_far
 
 
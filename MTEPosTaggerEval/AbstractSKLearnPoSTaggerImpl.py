@@ -28,7 +28,8 @@ class AbstractSKLearnPoSTaggerImpl(AbstractPoSTaggerImpl):
                       left1(),    suf_left1(),
                       right3(),   suf_right3(),
                       right2(),   suf_right2(),
-                      right1(),   suf_right1()]
+                      right1(),   suf_right1(),
+                      feat_around3(), feat_around2(), feat_around1()]
 
     def get_result(self, metric):
         if metric == 'accuracy':
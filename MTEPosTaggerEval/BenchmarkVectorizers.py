@@ -0,0 +1,152 @@
+#!/usr/bin/python
+# -*- coding: UTF-8 -*-
+"""This file benchmarks the vectorizers of the Scikit-Learn based tagger against each other. Every run trains and tests
+the tagger on one split of a corpus in a fresh process, so the peak memory (RSS) of the runs can be compared. For
+configuration please scroll down for the appropriate section.
+"""
+import csv
+import multiprocessing
+import resource
+from concurrent.futures import ProcessPoolExecutor
+from time import time
+
+from sklearn.feature_extraction import DictVectorizer, FeatureHasher
+from sklearn.linear_model import Perceptron
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.svm import LinearSVC
+
+from mte import MTECorpusReader
+from MTEPosTaggerEval import SKLearnVectorGenerators
+from MTEPosTaggers.MTESKTagger import MTESKTagger, ContextWindowVectorizer, ContextWindowHasher
+
+__author__ = "Alexander Böhm [jwacalex], Thomas Stieglmaier, Thomas Ziegler"
+__credits__ = ["Alexander Böhm [jwacalex]", "Thomas Stieglmaier", "Thomas Ziegler", "Behrang Qasemizadeh"]
+__license__ = "LGPL"
+
+
+def make_classifier(name):
+    if name == 'MultinomialNB':
+        return MultinomialNB()
+    elif name == 'LinearSVC':
+        return LinearSVC()
+    elif name == 'Perceptron':
+        return Perceptron()
+    raise Exception("unknown classifier %s" % (name,))
+
+
+def make_vectorizer(name, n_features, alternate_sign):
+    """
+    creates a vectorizer by name: 'dict' (DictVectorizer), 'dict-hashing' (FeatureHasher on the dictionaries),
+    'windows' (ContextWindowVectorizer) or 'windows-hashing' (ContextWindowHasher)
+    """
+    if name == 'dict':
+        return DictVectorizer()
+    elif name == 'dict-hashing':
+        return FeatureHasher(n_features=n_features, alternate_sign=alternate_sign)
+    elif name == 'windows':
+        return ContextWindowVectorizer()
+    elif name == 'windows-hashing':
+        return ContextWindowHasher(n_features=n_features, alternate_sign=alternate_sign)
+    raise Exception("unknown vectorizer %s" % (name,))
+
+
+def peak_rss():
+    # ru_maxrss is given in kilobytes on linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def run(corpus_root, language, config_option, classifier, vectorizer, n_features, n_folds):
+    """
+    trains the tagger on all but the first of n_folds slices of the corpus and tests it on the first one, this
+    is the task of a benchmark process.
+
+    :return: accuracy, training time, prediction time, peak RSS after loading the corpus and after the run in MB
+    :rtype: dict
+    """
+    tagged_sents = MTECorpusReader(root=corpus_root, fileids=language).compact_tagged_sents()
+    n_sents = len(tagged_sents)
+    test = tagged_sents.select(range(n_sents - 1, -1, -n_folds))
+    train = tagged_sents.select([k for k in range(n_sents) if (n_sents - 1 - k) % n_folds != 0])
+    loaded_rss = peak_rss()
+
+    # classifiers expecting non-negative features can not be trained on signed hashes
+    alternate_sign = classifier != 'MultinomialNB'
+
+    t = time()
+    tagger = MTESKTagger(tagged_sents=train, classifier=make_classifier(classifier),
+                         vectorizer=make_vectorizer(vectorizer, n_features, alternate_sign),
+                         context_window_generator=getattr(SKLearnVectorGenerators, config_option)())
+    training_time = time() - t
+
+    t = time()
+    accuracy = tagger.metrics(test, printout=False, oov=False)[0]
+    prediction_time = time() - t
+
+    return {'accuracy': accuracy, 'training_time': training_time, 'prediction_time': prediction_time,
+            'loaded_rss': loaded_rss, 'peak_rss': peak_rss()}
+
+
+if __name__ == "__main__":
+    # configuration of the benchmark
+
+    # file to store the results at
+    result_file = 'vectorizer_benchmark.csv'
+
+    # corpora to benchmark
+    languages = ['oana-en.xml', 'oana-cs.xml', 'oana-sl.xml']
+
+    # path to the multex-east corpus:
+    corpus_root = ''
+
+    # context windows to benchmark
+    config_options = ['around3', 'suf_around3', 'feat_around3']
+
+    # classifiers to benchmark
+    classifiers = ['MultinomialNB', 'LinearSVC']
+
+    # vectorizers to benchmark and the numbers of buckets of the hashing vectorizers
+    vectorizers = ['dict', 'dict-hashing', 'windows', 'windows-hashing']
+    hash_sizes = [2 ** 18, 2 ** 20]
+
+    # the corpus is split into n_folds slices, the first one is used for testing
+    n_folds = 10
+
+    result_writer = open(result_file, 'w')
+    fieldnames = ['corpus', 'config options', 'classifier', 'vectorizer', 'n_features', 'accuracy', 'training_time',
+                  'prediction_time', 'loaded_rss_mb', 'peak_rss_mb']
+    writer = csv.DictWriter(result_writer, fieldnames=fieldnames)
+    writer.writeheader()
+
+    for language in languages:
+        for config_option in config_options:
+            for classifier in classifiers:
+                for vectorizer in vectorizers:
+                    for n_features in (hash_sizes if vectorizer.endswith('hashing') else [None]):
+                        # every run gets a fresh process, so its peak memory is not hidden by earlier runs
+                        with ProcessPoolExecutor(max_workers=1,
+                                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+                            try:
+                                result = executor.submit(run, corpus_root, language, config_option, classifier,
+                                                         vectorizer, n_features, n_folds).result()
+                            except Exception as e:
+                                print("%s %s %s %s(%s) failed: %s" % (language, config_option, classifier,
+                                                                     vectorizer, n_features or '-', e))
+                                continue
+
+                        print("%s %s %s %s(%s): accuracy: %.4f | training: %.2fs | prediction: %.2fs | "
+                              "peak rss: %.0f MB (%.0f MB after loading)" % (language, config_option, classifier,
+                                                                            vectorizer, n_features or '-',
+                                                                            result['accuracy'],
+                                                                            result['training_time'],
+                                                                            result['prediction_time'],
+                                                                            result['peak_rss'],
+                                                                            result['loaded_rss']))
+
+                        writer.writerow({'corpus': language, 'config options': config_option,
+                                         'classifier': classifier, 'vectorizer': vectorizer,
+                                         'n_features': n_features or '', 'accuracy': result['accuracy'],
+                                         'training_time': result['training_time'],
+                                         'prediction_time': result['prediction_time'],
+                                         'loaded_rss_mb': result['loaded_rss'], 'peak_rss_mb': result['peak_rss']})
+
+                        result_writer.flush()
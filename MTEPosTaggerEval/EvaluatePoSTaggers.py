@@ -10,6 +10,7 @@ import numpy as np
 
 from mte import MTECorpusReader
 from mte import MTETagConverter
+from MTEPosTaggers.MTESKTagger import AbstractSKLearnVectorGenerator, VectorizedContextWindowGenerator
 
 __author__ = "Alexander Böhm [jwacalex], Thomas Stieglmaier, Thomas Ziegler"
 __credits__ = ["Alexander Böhm [jwacalex]", "Thomas Stieglmaier", "Thomas Ziegler", "Behrang Qasemizadeh"]
@@ -40,6 +41,11 @@ if __name__ == "__main__":
     # number of folds
     n_folds = 10
 
+    # vectorize the corpus once per tagset and kind of context window (the widest window, e.g. around3), the
+    # smaller windows are column subsets of its matrix and the scikit-learn taggers take the matrices of the
+    # folds as row slices instead of vectorizing every fold again
+    vectorize_once = True
+
     # number of workers (for thread pool executor)
     n_workers = 5
 
@@ -52,47 +58,56 @@ if __name__ == "__main__":
 
     for language in languages:
         loaded_corpus = MTECorpusReader(root=corpus_root, fileids=language)
-        tagged_sents = loaded_corpus.tagged_sents()
+        tagged_sents = loaded_corpus.compact_tagged_sents()
 
         for tagset in tagsets:
             if tagset == "universal":
-                working_sents = [[(word, MTETagConverter.msd_to_universal(tag)) for (word, tag) in sent] for sent in
-                                 tagged_sents]
+                working_sents = tagged_sents.project_tags(MTETagConverter.msd_to_universal)
 
             elif tagset == 'mte':
                 working_sents = tagged_sents
             else:
                 raise Exception("unknown tagset %s" % (tagset,))
 
+            # vectorized corpora of the tagset, shared by all scikit-learn taggers
+            vectorized = []
+
             for tagger in taggers:
                 tagger_impl = getattr(__import__(tagger), tagger)()
                 for config_coption in tagger_impl.config_options:
 
+                    fold_option = config_coption
+                    if (vectorize_once and isinstance(config_coption, AbstractSKLearnVectorGenerator) and
+                            config_coption.feature_kind is not None):
+                        covering = [v for v in vectorized if v.covers(config_coption)]
+                        if not covering:
+                            # the widest window of the tagger's options containing this one
+                            widest = max([c for c in tagger_impl.config_options
+                                          if isinstance(c, AbstractSKLearnVectorGenerator) and
+                                          c.feature_kind == config_coption.feature_kind and
+                                          set(c.context_window_positions) >=
+                                          set(config_coption.context_window_positions)],
+                                         key=lambda c: len(c.context_window_positions))
+                            covering = [VectorizedContextWindowGenerator(widest, working_sents)]
+                            vectorized.extend(covering)
+                        fold_option = covering[0].window(config_coption)
+
                     seq = range(0, n_folds)
                     assert isinstance(seq, collections.Iterable)
 
-                    w_corpus = list(working_sents)
-
-                    # devide the corpus in n similar sized slices
-                    chunks = [[] for i in seq]
-                    while len(w_corpus) != 0:
-                        for i in seq:
-                            if len(w_corpus) == 0:
-                                break
-                            else:
-                                chunks[i].append(w_corpus.pop())
+                    # devide the corpus in n similar sized slices, the sentences are dealt out from the end
+                    # of the corpus. the slices only hold sentence positions, train and test sets are
+                    # selections of the compact corpus sharing its token arrays
+                    n_sents = len(working_sents)
+                    chunks = [range(n_sents - 1 - i, -1, -n_folds) for i in seq]
 
                     runs = []
                     for i in seq:
-                        train = []
-                        for j in seq:
-                            if j != i:
-                                train = train + chunks[j]
-
-                        test = chunks[i]
+                        train = working_sents.select([k for j in seq if j != i for k in chunks[j]])
+                        test = working_sents.select(chunks[i])
 
                         run_impl = getattr(__import__(tagger), tagger)()
-                        runs.append(executor.submit(run_impl.evaluate, train, test, config_coption))
+                        runs.append(executor.submit(run_impl.evaluate, train, test, fold_option))
 
                     for metric in metrics:
                         results = [run.result().get_result(metric) for run in runs]
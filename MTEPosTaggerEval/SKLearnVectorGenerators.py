@@ -1,23 +1,49 @@
 # -*- coding: UTF-8 -*-
 """This File contains the different Vector Generators for the Scikit-Learn based classifiers.
 
- There are two generators, the PositionContextWindowVectorGenerator which takes the whole word and the
- SuffixContextWindowVectorGenerator takes the last two letters of each word. Both are position based they are
+ There are three generators, the PositionContextWindowVectorGenerator which takes the whole word, the
+ SuffixContextWindowVectorGenerator takes the last two letters of each word and the
+ WordFeatureContextWindowVectorGenerator takes the word, its suffixes and its shape. All are position based they are
  getting the position of the words, by the context_window_positions variables.
 """
-from MTEPosTaggers.MTESKTagger import AbstractSKLearnVectorGenerator
+import re
+
+from MTEPosTaggers.MTESKTagger import AbstractSKLearnVectorGenerator, ContextWindows, WordTypeFeatureCache
 
 __author__ = "Alexander Böhm [jwacalex], Thomas Stieglmaier, Thomas Ziegler"
 __credits__ = ["Alexander Böhm [jwacalex]", "Thomas Stieglmaier", "Thomas Ziegler", "Behrang Qasemizadeh"]
 __license__ = "LGPL"
 
 
+class suffix(object):
+    """
+    feature function returning the last n letters of a word.
+    """
+
+    def __init__(self, n):
+        self.n = n
+
+    def __call__(self, word):
+        return word[-self.n:]
+
+
+def word_shape(word):
+    """
+    the shape of a word: upper case letters are mapped to 'X', lower case letters to 'x' and digits to 'd', runs of
+    the same class are collapsed, e.g. 'McDonald's' gives 'XxXx'x' and '1984' gives 'd'.
+    """
+    shape = re.sub(r'[^\W\d_]', lambda m: 'X' if m.group().isupper() else 'x', word)
+    shape = re.sub(r'\d', 'd', shape)
+    return re.sub(r'(.)\1+', r'\1', shape)
+
+
 class PositionContextWindowVectorGenerator(AbstractSKLearnVectorGenerator):
     """"
     this class implements a position bases context window generator. it takes only the words indicated
     by the list context_window_positions to the context window.
     """
     context_window_positions = []
+    feature_kind = 'word'
 
     def __str__(self):
         return u"PConWin(%s)" % self.context_window_positions
@@ -48,6 +74,11 @@ class PositionContextWindowVectorGenerator(AbstractSKLearnVectorGenerator):
 
         return X, Y
 
+    def encode(self, tagged_sents, is_test=False):
+        X = ContextWindows.from_tagged_sents(tagged_sents, self.context_window_positions, is_test,
+                                             kind=self.feature_kind)
+        return X, X.labels()
+
 
 class baseline(PositionContextWindowVectorGenerator):
     context_window_positions = [0]
@@ -106,6 +137,12 @@ class SuffixContextWindowVectorGenerator(AbstractSKLearnVectorGenerator):
     are taken
     """
     context_window_positions = []
+    feature_kind = 'suffix'
+
+    def __init__(self):
+        AbstractSKLearnVectorGenerator.__init__(self)
+        # the suffixes are computed once per word type
+        self.cache = WordTypeFeatureCache([('word', self.feature_kind, suffix(2))])
 
     def __str__(self):
         return u"SConWin(%s)" % self.context_window_positions
@@ -136,6 +173,11 @@ class SuffixContextWindowVectorGenerator(AbstractSKLearnVectorGenerator):
 
         return X, Y
 
+    def encode(self, tagged_sents, is_test=False):
+        X = ContextWindows.from_tagged_sents(tagged_sents, self.context_window_positions, is_test, cache=self.cache,
+                                             with_words=False)
+        return X, X.labels()
+
 
 class suf_baseline(SuffixContextWindowVectorGenerator):
     context_window_positions = [0]
@@ -185,3 +227,74 @@ class suf_around2(SuffixContextWindowVectorGenerator):
 class suf_around1(SuffixContextWindowVectorGenerator):
     context_window_positions = [-1, 0, 1, ]
     __metaclass__ = SuffixContextWindowVectorGenerator
+
+
+class WordFeatureContextWindowVectorGenerator(AbstractSKLearnVectorGenerator):
+    """"
+    this class implements a position bases context window generator, which takes the word, its suffixes of the
+    lengths given by suffix_lengths and its shape (see word_shape) for every position of context_window_positions.
+    the features of a word type are computed only once, they are kept in the WordTypeFeatureCache of the generator,
+    which is shared by the workers evaluating the folds of a corpus with it.
+    """
+    context_window_positions = []
+    suffix_lengths = [1, 2, 3]
+    shape = True
+
+    def __init__(self):
+        AbstractSKLearnVectorGenerator.__init__(self)
+        features = [('suf%s' % n, 'suffix%s' % n, suffix(n)) for n in self.suffix_lengths]
+        if self.shape:
+            features.append(('shape', 'shape', word_shape))
+        self.cache = WordTypeFeatureCache(features)
+
+    def __str__(self):
+        return u"FConWin(%s)" % self.context_window_positions
+
+    @property
+    def feature_kind(self):
+        return '+'.join(['word'] + ['suffix%s' % n for n in self.suffix_lengths] + (['shape'] if self.shape else []))
+
+    def generate_vector(self, tagged_sents, is_test=False):
+        cache = self.cache
+        names = [name for (name, _, _) in cache.features]
+        features = cache.values(list(set(word for sentence in tagged_sents for (word, _) in sentence)))
+
+        X = []
+        Y = []
+        for sentence in tagged_sents:
+            for (position, _) in enumerate(sentence):
+                current_sent = {}
+                for offset in self.context_window_positions:
+                    if offset + position < 0 or offset + position > len(sentence) - 1:
+                        continue
+                    (word, tag) = sentence[position + offset]
+                    current_sent['word(%s)' % (offset)] = word
+                    for (name, value) in zip(names, features[word]):
+                        current_sent['%s(%s)' % (name, offset)] = value
+                    if not offset == 0 and not is_test:
+                        current_sent['pos(%s)' % (offset)] = tag
+                __, tag_at_pos = sentence[position]
+
+                X.append(current_sent)
+                Y.append(tag_at_pos)
+
+        return X, Y
+
+    def encode(self, tagged_sents, is_test=False):
+        X = ContextWindows.from_tagged_sents(tagged_sents, self.context_window_positions, is_test, cache=self.cache)
+        return X, X.labels()
+
+
+class feat_around1(WordFeatureContextWindowVectorGenerator):
+    context_window_positions = [-1, 0, 1]
+    __metaclass__ = WordFeatureContextWindowVectorGenerator
+
+
+class feat_around2(WordFeatureContextWindowVectorGenerator):
+    context_window_positions = [-2, -1, 0, 1, 2]
+    __metaclass__ = WordFeatureContextWindowVectorGenerator
+
+
+class feat_around3(WordFeatureContextWindowVectorGenerator):
+    context_window_positions = [-3, -2, -1, 0, 1, 2, 3]
+    __metaclass__ = WordFeatureContextWindowVectorGenerator
@@ -3,12 +3,10 @@
 """
 from time import time
 
-from sklearn.feature_extraction import DictVectorizer
-
 from sklearn.svm import LinearSVC
 
 from MTEPosTaggerEval.AbstractSKLearnPoSTaggerImpl import AbstractSKLearnPoSTaggerImpl
-from MTEPosTaggers.MTESKTagger import MTESKTagger
+from MTEPosTaggers.MTESKTagger import MTESKTagger, ContextWindowVectorizer
 
 __author__ = "Alexander Böhm [jwacalex], Thomas Stieglmaier, Thomas Ziegler"
 __credits__ = ["Alexander Böhm [jwacalex]", "Thomas Stieglmaier", "Thomas Ziegler", "Behrang Qasemizadeh"]
@@ -22,7 +20,7 @@ class skLinearSVC(AbstractSKLearnPoSTaggerImpl):
 
     def evaluate(self, sents_train, sents_test, config_option):
         t = time()
-        tagger = MTESKTagger(tagged_sents=sents_train, classifier=LinearSVC(), vectorizer=DictVectorizer(),
+        tagger = MTESKTagger(tagged_sents=sents_train, classifier=LinearSVC(), vectorizer=ContextWindowVectorizer(),
                              context_window_generator=config_option)
         self.training_time = time() - t
 
@@ -3,12 +3,10 @@
 """
 from time import time
 
-from sklearn.feature_extraction import DictVectorizer
-
 from sklearn.linear_model import Perceptron
 
 from MTEPosTaggerEval.AbstractSKLearnPoSTaggerImpl import AbstractSKLearnPoSTaggerImpl
-from MTEPosTaggers.MTESKTagger import MTESKTagger
+from MTEPosTaggers.MTESKTagger import MTESKTagger, ContextWindowVectorizer
 
 __author__ = "Alexander Böhm [jwacalex], Thomas Stieglmaier, Thomas Ziegler"
 __credits__ = ["Alexander Böhm [jwacalex]", "Thomas Stieglmaier", "Thomas Ziegler", "Behrang Qasemizadeh"]
@@ -22,7 +20,8 @@ class skPerceptron(AbstractSKLearnPoSTaggerImpl):
 
     def evaluate(self, sents_train, sents_test, config_option):
         t = time()
-        tagger = MTESKTagger(tagged_sents=sents_train, classifier=Perceptron(n_iter=50), vectorizer=DictVectorizer(),
+        tagger = MTESKTagger(tagged_sents=sents_train, classifier=Perceptron(n_iter=50),
+                             vectorizer=ContextWindowVectorizer(),
                              context_window_generator=config_option)
         self.training_time = time() - t
 
@@ -3,9 +3,7 @@
 """
 from time import time
 
-from collections import defaultdict
-from functools import reduce
-
+from mte import MTECorpusStatistics
 from MTEPosTaggerEval.AbstractPoSTaggerImpl import AbstractPoSTaggerImpl
 
 __author__ = "Alexander Böhm [jwacalex], Thomas Stieglmaier, Thomas Ziegler"
@@ -23,14 +21,9 @@ class tmpOOV(AbstractPoSTaggerImpl):
 
     def evaluate(self, sents_train, sents_test, config_option):
         t = time()
-        d = defaultdict(lambda: False)
-        for sent in sents_train:
-            for (word, tag) in sent:
-                d[word] = True
-
-        tokens = sum(sents_test, [])
-        oov = reduce(lambda a, b: a + 1 if not b in d else a, [w for (w, _) in tokens], 0)
-        self.oov = (oov * 100.0) / len(tokens)
+        train = MTECorpusStatistics.from_tagged_sents(sents_train)
+        test = MTECorpusStatistics.from_tagged_sents(sents_test)
+        self.oov = (test.oov_count(train.vocabulary()) * 100.0) / test.tagged_count
 
         self.training_time = time() - t
 
@@ -10,10 +10,9 @@ from nltk.metrics import *
 from nltk.tag import BrillTaggerTrainer, UnigramTagger
 from nltk.tbl.template import Template
 
-try:
-    from functools import reduce
-except ImportError:
-    "No python 3"
+from itertools import chain
+
+from mte import MTECorpusStatistics
 
 __author__ = "Alexander Böhm [jwacalex], Thomas Stieglmaier, Thomas Ziegler"
 __credits__ = ["Alexander Böhm [jwacalex]", "Thomas Stieglmaier", "Thomas Ziegler", "Behrang Qasemizadeh"]
@@ -31,8 +30,8 @@ class MTEBrillTagger:
         '''
         Construct a new MTEBrillTagger and train it with the sentences from tagged_sents.
 
-        :param tagged_sents: Tagged sentences to train the tagger.
-        :type tagged_sents: [[(word:str, tag:str)]]
+        :param tagged_sents: Tagged sentences to train the tagger, a CompactTaggedCorpus is used without copying it.
+        :type tagged_sents: [[(word:str, tag:str)]] or CompactTaggedCorpus
         :param anonProperNouns: Set 'True' to replace every proper noun with an anonymous string. Currently only for MTE tags.
         :type anonProperNouns: bool
         :param initialTagger: If None or unset, use UnigramTagger as initial tagger; use specified one else ('self._tagger = initialTagger')
@@ -129,8 +128,8 @@ class MTEBrillTagger:
         '''
 
         tagger_out = self._tagger.tag_sents(untag(sent) for sent in gold)
-        gold_tokens = sum(gold, [])
-        test_tokens = sum(tagger_out, [])
+        gold_tokens = list(chain.from_iterable(gold))
+        test_tokens = list(chain.from_iterable(tagger_out))
         gold_tokens_set = set(gold_tokens)
         test_tokens_set = set(test_tokens)
 
@@ -139,8 +138,8 @@ class MTEBrillTagger:
 
         # calculate out of vocabulary words
         if oov:
-            d = {word: True for (word, _) in reduce(lambda a, b: a + b, self._tagged_sents, [])}
-            aov = reduce(lambda a, b: a + 1 if not b in d else a, [w for (w, _) in gold_tokens], 0)
+            d = MTECorpusStatistics.from_tagged_sents(self._tagged_sents).vocabulary()
+            aov = sum(1 for (w, _) in gold_tokens if w not in d)
             aov = (aov * 100.0) / len(gold_tokens)
         else:
             aov = '-1'
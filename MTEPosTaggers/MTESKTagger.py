@@ -2,14 +2,21 @@
 """This File Contains the Scikit-Learn based Part of Speech Tagger with it's helper classes.
 """
 
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
+from functools import partial
+
+import numpy as np
 from nltk.metrics import *
-from sklearn.feature_extraction import DictVectorizer
+from scipy.sparse import csr_matrix, vstack
+from sklearn.feature_extraction import DictVectorizer, FeatureHasher
 from sklearn.naive_bayes import MultinomialNB
 
-try:
-    from functools import reduce
-except ImportError:
-    "No python 3"
+from itertools import chain
+
+from mte import CompactTaggedCorpus, MTECorpusStatistics
 
 __author__ = "Alexander Böhm [jwacalex], Thomas Stieglmaier, Thomas Ziegler"
 __credits__ = ["Alexander Böhm [jwacalex]", "Thomas Stieglmaier", "Thomas Ziegler", "Behrang Qasemizadeh"]
@@ -21,6 +28,8 @@ class AbstractSKLearnVectorGenerator():
     this is the abstract implementation of a a vector generator for scikit learn based taggers. For more information
     how to use it, please refer to the generate_vector-method.
     """
+    # kind of the value a word contributes to the features, e.g. 'word' or 'suffix'
+    feature_kind = None
 
     def __init__(self):
         """
@@ -103,6 +112,562 @@ class AbstractSKLearnVectorGenerator():
         """
         raise NotImplementedError("generate_vector must be implemented by child")
 
+    def encode(self, tagged_sents, is_test=False):
+        """
+        this function is the integer encoded counterpart of generate_vector. instead of one dictionary per word it
+        returns the context windows of all words as a ContextWindows object, which is turned into the same feature
+        matrix as the dictionaries by the ContextWindowVectorizer.
+
+        :param tagged_sents: sents to generate vector for
+        :type tagged_sents: List or CompactTaggedCorpus
+        :param is_test: indicates wheather the input should be vectorized for testing (stripping tags) or training
+        :type is_test: bool
+        :return: X and Y vector for the current sentences
+        :rtype: ContextWindows, List
+        """
+        raise NotImplementedError("encode must be implemented by child")
+
+
+class WordTypeFeatureCache(object):
+    """
+    Thread-safe cache of the features of word types. The features are computed by a list of functions (e.g. the
+    suffix or the shape of a word), their values are interned in one table per feature and every word type is mapped
+    to the ids of its values only once. A cache belongs to the generator that created it, the evaluation workers
+    using that generator share it. The tables only grow, so ids stay valid; the cache holds at most maxsize word
+    types, a lookup that would exceed it starts over with empty tables before it adds the new types.
+    """
+
+    def __init__(self, features, maxsize=2 ** 20):
+        """
+        :param features: the features as (name, kind, function) tuples, name is the name of the feature group as
+         used by generate_vector (e.g. 'suf3' for the features 'suf3(-1)') and kind the kind of its columns
+        :type features: List
+        :param maxsize: maximal number of cached word types
+        :type maxsize: int
+        """
+        self.features = features
+        self.maxsize = maxsize
+        self.__lock = threading.Lock()
+        self.__reset()
+
+    def __getstate__(self):
+        # the lock cannot be pickled, a copy of the cache (e.g. in a worker process) starts empty
+        return self.features, self.maxsize
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def __reset(self):
+        self.__tables = [[] for _ in self.features]
+        self.__value_ids = [{} for _ in self.features]
+        self.__types = {}
+
+    def __len__(self):
+        return len(self.__types)
+
+    def clear(self):
+        with self.__lock:
+            self.__reset()
+
+    def lookup(self, words):
+        """
+        :param words: distinct words
+        :type words: List
+        :return: the tables of the feature values and the ids of the values of every word, one column per feature
+        :rtype: (List, numpy.ndarray)
+        """
+        with self.__lock:
+            if len(self.__types) + sum(1 for word in words if word not in self.__types) > self.maxsize:
+                self.__reset()
+            types, tables, value_ids = self.__types, self.__tables, self.__value_ids
+            rows = []
+            for word in words:
+                row = types.get(word)
+                if row is None:
+                    row = []
+                    for ((_, _, feature), table, ids) in zip(self.features, tables, value_ids):
+                        value = feature(word)
+                        i = ids.get(value)
+                        if i is None:
+                            i = ids[value] = len(table)
+                            table.append(value)
+                        row.append(i)
+                    row = tuple(row)
+                    # more distinct words than maxsize are looked up, but not kept
+                    if len(types) < self.maxsize:
+                        types[word] = row
+                rows.append(row)
+            return list(tables), np.array(rows, dtype=np.int32).reshape(len(words), len(self.features))
+
+    def values(self, words):
+        """
+        :param words: distinct words
+        :type words: List
+        :return: the feature values of every word as a tuple
+        :rtype: dict
+        """
+        tables, ids = self.lookup(words)
+        return dict((word, tuple(table[i] for (table, i) in zip(tables, row))) for (word, row) in zip(words, ids))
+
+
+class ContextWindows(object):
+    """
+    The context windows of all words of a list of tagged sentences in integer encoded form. The features of the words
+    (e.g. the words themselves, their suffixes or shapes) and the tags are stored once in tables and every token is
+    represented by its ids, the window of a word is given by offsets relative to its position, which are only applied
+    within the sentence of the word. This is the X-Vector of the encode-method of the vector generators.
+    """
+
+    def __init__(self, fields, tags, tag_ids, lengths, positions, is_test=False):
+        """
+        :param fields: the features of the words as (name, kind, table, ids) tuples, ids is the index into table for
+         every token. the first field is the value of the word itself ('word(0)').
+        :type fields: List
+        :param tags: table of the distinct tags
+        :type tags: List
+        :param tag_ids: index into tags for every token
+        :type tag_ids: numpy.ndarray
+        :param lengths: length of every sentence, the tokens of the sentences are consecutive
+        :type lengths: numpy.ndarray
+        :param positions: relative positions of the context window
+        :type positions: List
+        :param is_test: if set, the window contains no tags
+        :type is_test: bool
+        """
+        self.fields = fields
+        self.values, self.value_ids = fields[0][2], fields[0][3]
+        self.tags = tags
+        self.tag_ids = tag_ids
+        self.positions = positions
+        self.is_test = is_test
+        # position of every token within its sentence and the length of that sentence
+        self.sent_lengths = np.repeat(lengths, lengths)
+        self.sent_index = np.arange(len(tag_ids)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+
+    @classmethod
+    def from_tagged_sents(cls, tagged_sents, positions, is_test=False, kind='word', cache=None, with_words=True):
+        """
+        encodes tagged sentences. a CompactTaggedCorpus is not decoded, its id arrays and tables are used directly.
+        the features of the cache are looked up once per distinct word and gathered for the tokens by their ids.
+
+        :param tagged_sents: sents to encode
+        :type tagged_sents: List or CompactTaggedCorpus
+        :param positions: relative positions of the context window
+        :type positions: List
+        :param is_test: if set, the window contains no tags
+        :type is_test: bool
+        :param kind: kind of the words
+        :type kind: String
+        :param cache: cache of further features of the words
+        :type cache: WordTypeFeatureCache
+        :param with_words: if not set, only the features of the cache are used
+        :type with_words: bool
+        :return: the encoded context windows
+        :rtype: ContextWindows
+        """
+        if isinstance(tagged_sents, CompactTaggedCorpus):
+            word_ids, tag_ids, lengths = tagged_sents.token_ids()
+            words, tags = tagged_sents.words(), tagged_sents.tags()
+        else:
+            word_table, tag_table = {}, {}
+            word_ids, tag_ids, lengths = array('i'), array('i'), array('i')
+            for sentence in tagged_sents:
+                lengths.append(len(sentence))
+                for (word, tag) in sentence:
+                    word_ids.append(word_table.setdefault(word, len(word_table)))
+                    tag_ids.append(tag_table.setdefault(tag, len(tag_table)))
+            words, tags = sorted(word_table, key=word_table.get), sorted(tag_table, key=tag_table.get)
+
+        word_ids, tag_ids = np.frombuffer(word_ids, dtype=np.int32), np.frombuffer(tag_ids, dtype=np.int32)
+        lengths = np.frombuffer(lengths, dtype=np.int32)
+        fields = [('word', kind, words, word_ids)] if with_words else []
+        if cache is not None:
+            tables, type_ids = cache.lookup(words)
+            for (k, (name, feature_kind, _)) in enumerate(cache.features):
+                fields.append((name, feature_kind, tables[k], type_ids[:, k][word_ids]))
+        return cls(fields, tags, tag_ids, lengths, positions, is_test)
+
+    def __len__(self):
+        return len(self.tag_ids)
+
+    def labels(self):
+        """
+        :return: the tag of every token, which is the Y-Vector
+        :rtype: numpy.ndarray
+        """
+        return np.array(self.tags, dtype=object)[self.tag_ids]
+
+    def center_values(self):
+        """
+        :return: the feature value of every token itself, the value of the 'word(0)' feature
+        :rtype: numpy.ndarray
+        """
+        return np.array(self.values, dtype=object)[self.value_ids]
+
+    def groups(self):
+        """
+        :return: the feature groups of the windows as (name, kind, offset, table, ids) tuples. name is the name of
+         the feature group as used by generate_vector, e.g. 'word(-1)', kind is the kind of the values or 'pos' for
+         tags. the value of a token's feature is the entry of table at ids[position of token + offset].
+        :rtype: List
+        """
+        groups = []
+        for offset in self.positions:
+            for (name, kind, table, ids) in self.fields:
+                groups.append(('%s(%s)' % (name, offset), kind, offset, table, ids))
+            if offset != 0 and not self.is_test:
+                groups.append(('pos(%s)' % offset, 'pos', offset, self.tags, self.tag_ids))
+        return groups
+
+    def sources(self, offset, start=0, stop=None):
+        """
+        :return: the positions of the tokens (from start to stop) whose window contains the token at the given
+         offset, i.e. it lies within their sentence
+        :rtype: numpy.ndarray
+        """
+        shifted = self.sent_index[start:stop] + offset
+        return np.flatnonzero((shifted >= 0) & (shifted < self.sent_lengths[start:stop])) + start
+
+
+class ContextWindowVectorizer(object):
+    """
+    Vectorizer for ContextWindows, which builds the same sparse feature matrix as a DictVectorizer does for the
+    dictionaries of generate_vector, with the same sorted feature names ('word(-1)=foo'). The features are never
+    materialized as dictionaries, the columns of a whole feature group are looked up by the ids of the values and
+    the matrix is assembled in CSR format directly. Every column is tagged with the kind ('word', 'suffix2', 'pos' ...)
+    and the window offset of its feature.
+    """
+    separator = '='
+
+    def __init__(self, dtype=np.float64):
+        self.dtype = dtype
+        self.feature_names_ = []
+        self.feature_kinds_ = np.array([], dtype=object)
+        self.feature_offsets_ = np.array([], dtype=np.intp)
+        self.vocabulary_ = {}
+        self.__group_columns = {}
+        self.__column_maps = {}
+        self.__columns = None
+
+    def fit(self, X, y=None):
+        """
+        learns the features occurring in the context windows. for rows of a vectorized corpus these are the columns
+        of its feature matrix that are used by the rows.
+
+        :param X: the context windows
+        :type X: ContextWindows or ContextWindowRows
+        :return: self
+        """
+        if isinstance(X, ContextWindowRows):
+            self.__columns = X.used_columns()
+            self.feature_names_ = [X.feature_names()[i] for i in self.__columns]
+            self.feature_kinds_ = X.vectorized.feature_kinds[self.__columns]
+            self.feature_offsets_ = X.vectorized.feature_offsets[self.__columns]
+            self.vocabulary_ = dict((f, i) for (i, f) in enumerate(self.feature_names_))
+            self.__group_columns = {}
+            self.__column_maps = {}
+            return self
+
+        self.__columns = None
+        features = []
+        for (name, kind, offset, table, ids) in X.groups():
+            used = np.flatnonzero(np.bincount(ids[X.sources(offset) + offset], minlength=len(table)))
+            features.extend(('%s%s%s' % (name, self.separator, table[i]), kind, offset) for i in used)
+        features.sort()
+        names = self.feature_names_ = [f for (f, _, _) in features]
+        self.feature_kinds_ = np.array([kind for (_, kind, _) in features], dtype=object)
+        self.feature_offsets_ = np.array([offset for (_, _, offset) in features], dtype=np.intp)
+        self.vocabulary_ = dict((f, i) for (i, f) in enumerate(names))
+
+        # column of every value per feature group, so unseen tables are mapped without formatting feature names
+        group_columns = {}
+        for (f, i) in self.vocabulary_.items():
+            name, value = f.split(self.separator, 1)
+            group_columns.setdefault(name, {})[value] = i
+        self.__group_columns = group_columns
+        self.__column_maps = {}
+        return self
+
+    def fit_transform(self, X, y=None):
+        return self.fit(X).transform(X)
+
+    def __column_map(self, name, table):
+        # maps the ids of a table to columns, -1 for values not seen by fit. the map is kept for the table, as the
+        # train and test sentences of a corpus usually share their tables
+        key = (name, id(table))
+        cached = self.__column_maps.get(key)
+        if cached is not None and cached[0] is table and len(cached[1]) == len(table):
+            return cached[1]
+        columns = self.__group_columns.get(name, {})
+        column_map = np.array([columns.get(value, -1) for value in table], dtype=np.intp)
+        self.__column_maps[key] = (table, column_map)
+        return column_map
+
+    def transform(self, X):
+        """
+        builds the feature matrix of the context windows, features not seen by fit are ignored
+
+        :param X: the context windows
+        :type X: ContextWindows or ContextWindowRows
+        :return: one row per token and one column per feature
+        :rtype: scipy.sparse.csr_matrix
+        """
+        if isinstance(X, ContextWindowRows) != (self.__columns is not None):
+            raise ValueError("rows of a vectorized corpus and context windows can not be mixed")
+        if isinstance(X, ContextWindowRows):
+            return X.matrix(self.__columns)
+
+        groups = X.groups()
+        columns = np.full((len(X), len(groups)), -1, dtype=np.intp)
+        for (k, (name, _, offset, table, ids)) in enumerate(groups):
+            sources = X.sources(offset)
+            columns[sources, k] = self.__column_map(name, table)[ids[sources + offset]]
+
+        present = columns >= 0
+        # 32 bit indices, some estimators (e.g. Perceptron) accept no others
+        indptr = np.zeros(len(X) + 1, dtype=np.int32)
+        np.cumsum(present.sum(axis=1), out=indptr[1:])
+        indices = columns[present].astype(np.int32)
+        matrix = csr_matrix((np.ones(len(indices), dtype=self.dtype), indices, indptr),
+                            shape=(len(X), len(self.feature_names_)))
+        matrix.sort_indices()
+        return matrix
+
+    def get_feature_names_out(self, input_features=None):
+        return np.array(self.feature_names_, dtype=object)
+
+
+class ContextWindowHasher(object):
+    """
+    Hashing vectorizer for ContextWindows. Every feature is hashed to one of n_features columns exactly like the
+    FeatureHasher of scikit-learn hashes the dictionaries of generate_vector, which gives the same matrices. No
+    vocabulary is learned, so the vectorizer needs no memory for one and the models have a fixed size. The hash of a
+    feature is computed once per distinct value of a feature group, the rows are vectorized in chunks, which are
+    distributed over n_jobs threads.
+    """
+
+    def __init__(self, n_features=2 ** 20, alternate_sign=True, dtype=np.float64, n_jobs=None, chunk_size=100000):
+        """
+        :param n_features: number of columns (hash buckets)
+        :type n_features: int
+        :param alternate_sign: if set, the sign of a feature is also taken from its hash, so collisions cancel out
+         on average. must not be set for classifiers expecting non-negative features like MultinomialNB.
+        :type alternate_sign: bool
+        :param n_jobs: number of threads the chunks are vectorized by (default is a single thread)
+        :type n_jobs: int
+        :param chunk_size: number of rows of a chunk
+        :type chunk_size: int
+        """
+        self.n_features = n_features
+        self.alternate_sign = alternate_sign
+        self.dtype = dtype
+        self.n_jobs = n_jobs
+        self.chunk_size = chunk_size
+        self.__hasher = FeatureHasher(n_features=n_features, input_type='string', alternate_sign=alternate_sign,
+                                      dtype=dtype)
+        self.__column_maps = {}
+
+    def fit(self, X, y=None):
+        return self
+
+    def fit_transform(self, X, y=None):
+        return self.transform(X)
+
+    def __column_map(self, name, table):
+        # hashes every value of a table, the columns and signs are kept for the table like in ContextWindowVectorizer
+        key = (name, id(table))
+        cached = self.__column_maps.get(key)
+        if cached is not None and cached[0] is table and len(cached[1][0]) == len(table):
+            return cached[1]
+        hashed = self.__hasher.transform(['%s=%s' % (name, value)] for value in table)
+        column_map = (hashed.indices.astype(np.intp), hashed.data)
+        self.__column_maps[key] = (table, column_map)
+        return column_map
+
+    def __transform_chunk(self, X, groups, column_maps, bounds):
+        start, stop = bounds
+        columns = np.zeros((stop - start, len(groups)), dtype=np.intp)
+        values = np.zeros((stop - start, len(groups)), dtype=self.dtype)
+        for (k, ((name, _, offset, table, ids), (column_map, sign_map))) in enumerate(zip(groups, column_maps)):
+            sources = X.sources(offset, start, stop)
+            value_ids = ids[sources + offset]
+            columns[sources - start, k] = column_map[value_ids]
+            values[sources - start, k] = sign_map[value_ids]
+
+        present = values != 0
+        indptr = np.zeros(stop - start + 1, dtype=np.int32)
+        np.cumsum(present.sum(axis=1), out=indptr[1:])
+        matrix = csr_matrix((values[present], columns[present].astype(np.int32), indptr),
+                            shape=(stop - start, self.n_features))
+        # features of a row hashed to the same column are added up
+        matrix.sum_duplicates()
+        return matrix
+
+    def transform(self, X):
+        """
+        builds the hashed feature matrix of the context windows
+
+        :param X: the context windows
+        :type X: ContextWindows
+        :return: one row per token and n_features columns
+        :rtype: scipy.sparse.csr_matrix
+        """
+        if isinstance(X, ContextWindowRows):
+            raise ValueError("rows of a vectorized corpus can only be transformed by a ContextWindowVectorizer")
+        groups = X.groups()
+        column_maps = [self.__column_map(name, table) for (name, _, _, table, _) in groups]
+        chunks = [(start, min(start + self.chunk_size, len(X))) for start in range(0, len(X), self.chunk_size)]
+        transform_chunk = partial(self.__transform_chunk, X, groups, column_maps)
+        if len(chunks) <= 1:
+            return transform_chunk((0, len(X)))
+        if self.n_jobs is not None and self.n_jobs > 1:
+            with ThreadPoolExecutor(max_workers=self.n_jobs) as executor:
+                return vstack(list(executor.map(transform_chunk, chunks)), format='csr')
+        return vstack([transform_chunk(c) for c in chunks], format='csr')
+
+
+class VectorizedContextWindowGenerator(AbstractSKLearnVectorGenerator):
+    """
+    Wraps a vector generator and vectorizes a whole CompactTaggedCorpus with it once. The encode-method of this
+    generator only selects the rows of the given sentences, which have to be a selection or slice of that corpus,
+    e.g. the train and test sets of the folds of a cross validation. Together with a ContextWindowVectorizer the
+    matrices of a fold are equal to those of the wrapped generator, as the vectorizer masks all columns of features
+    that do not occur in the training rows.
+
+    As the feature columns are tagged with their kind and offset, the matrix of a smaller window of the same kind
+    is a subset of the columns (e.g. left1 of around3), which is selected by the window-method.
+    """
+
+    def __init__(self, context_window_generator, tagged_sents):
+        """
+        :param context_window_generator: the generator the corpus is vectorized with
+        :type context_window_generator: AbstractSKLearnVectorGenerator
+        :param tagged_sents: the corpus
+        :type tagged_sents: CompactTaggedCorpus
+        """
+        windows, labels = context_window_generator.encode(tagged_sents)
+        vectorizer = ContextWindowVectorizer()
+        self.matrix = vectorizer.fit_transform(windows)
+        self.feature_names = vectorizer.feature_names_
+        self.feature_kinds = vectorizer.feature_kinds_
+        self.feature_offsets = vectorizer.feature_offsets_
+        # the test matrices contain no tag features
+        self.test_columns = self.feature_kinds != 'pos'
+        self.labels = labels
+        self.center_values = windows.center_values()
+        self.kind = context_window_generator.feature_kind
+        self.positions = list(windows.positions)
+
+        self.__context_window_generator = context_window_generator
+        self.__words, self.__tags = tagged_sents.words(), tagged_sents.tags()
+        # row of every token by its position in the token arrays of the corpus
+        positions = np.frombuffer(tagged_sents.token_positions(), dtype=np.int32)
+        self.__rows = np.full(positions.max() + 1 if len(positions) > 0 else 0, -1, dtype=np.intp)
+        self.__rows[positions] = np.arange(len(positions))
+
+    def __str__(self):
+        return str(self.__context_window_generator)
+
+    def covers(self, context_window_generator):
+        """
+        :return: whether the window of the generator is part of this window and has the same kind
+        :rtype: bool
+        """
+        return (context_window_generator.feature_kind == self.kind and
+                set(context_window_generator.context_window_positions) <= set(self.positions))
+
+    def window(self, context_window_generator):
+        """
+        derives the vectorized corpus of a smaller window without vectorizing the corpus again, it shares all data
+        with this one except for the matrix, which only keeps the columns of the offsets of the smaller window.
+
+        :param context_window_generator: generator of a window covered by this one
+        :type context_window_generator: AbstractSKLearnVectorGenerator
+        :return: the vectorized corpus of the generator
+        :rtype: VectorizedContextWindowGenerator
+        """
+        if not self.covers(context_window_generator):
+            raise ValueError("%s is not part of %s" % (context_window_generator, self))
+        columns = np.flatnonzero(np.isin(self.feature_offsets, context_window_generator.context_window_positions))
+        derived = copy(self)
+        derived.__context_window_generator = context_window_generator
+        derived.positions = list(context_window_generator.context_window_positions)
+        if len(columns) < self.matrix.shape[1]:
+            derived.matrix = self.matrix[:, columns]
+            derived.feature_names = [self.feature_names[i] for i in columns]
+            derived.feature_kinds = self.feature_kinds[columns]
+            derived.feature_offsets = self.feature_offsets[columns]
+            derived.test_columns = self.test_columns[columns]
+        return derived
+
+    def generate_vector(self, tagged_sents, is_test=False):
+        return self.__context_window_generator.generate_vector(tagged_sents, is_test)
+
+    def encode(self, tagged_sents, is_test=False):
+        if (not isinstance(tagged_sents, CompactTaggedCorpus) or tagged_sents.words() is not self.__words or
+                tagged_sents.tags() is not self.__tags):
+            raise ValueError("the sentences are not part of the vectorized corpus")
+        positions = np.frombuffer(tagged_sents.token_positions(), dtype=np.int32)
+        if len(positions) > 0 and positions.max() >= len(self.__rows):
+            raise ValueError("the sentences are not part of the vectorized corpus")
+        rows = self.__rows[positions]
+        if (rows < 0).any():
+            raise ValueError("the sentences are not part of the vectorized corpus")
+        X = ContextWindowRows(self, rows, is_test)
+        return X, self.labels[rows]
+
+
+class ContextWindowRows(object):
+    """
+    The rows of the tokens of some sentences in the feature matrix of a VectorizedContextWindowGenerator. This is the
+    X-Vector of its encode-method.
+    """
+
+    def __init__(self, vectorized, rows, is_test=False):
+        self.vectorized = vectorized
+        self.rows = rows
+        self.is_test = is_test
+        self.__matrix = None
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __row_matrix(self):
+        if self.__matrix is None:
+            self.__matrix = self.vectorized.matrix[self.rows]
+        return self.__matrix
+
+    def feature_names(self):
+        return self.vectorized.feature_names
+
+    def center_values(self):
+        """
+        :return: the feature value of every token itself, the value of the 'word(0)' feature
+        :rtype: numpy.ndarray
+        """
+        return self.vectorized.center_values[self.rows]
+
+    def used_columns(self):
+        """
+        :return: the sorted columns of the features that occur in the rows
+        :rtype: numpy.ndarray
+        """
+        matrix = self.__row_matrix()
+        return np.flatnonzero(np.bincount(matrix.indices, minlength=matrix.shape[1]))
+
+    def matrix(self, columns):
+        """
+        :param columns: the sorted columns to keep
+        :type columns: numpy.ndarray
+        :return: the feature matrix of the rows restricted to the given columns, for testing without tag features
+        :rtype: scipy.sparse.csr_matrix
+        """
+        matrix = self.__row_matrix()[:, columns]
+        if self.is_test:
+            matrix.data *= self.vectorized.test_columns[columns][matrix.indices]
+            matrix.eliminate_zeros()
+        return matrix
+
 
 class MTESKTagger:
     '''
@@ -115,13 +680,13 @@ class MTESKTagger:
         '''
         Construct a new MTESKTagger and train it with the sentences from tagged_sents.
 
-        :param tagged_sents: Tagged sentences to train the tagger.
-        :type tagged_sents: [[(word:str, tag:str)]]
+        :param tagged_sents: Tagged sentences to train the tagger, a CompactTaggedCorpus is used without copying it.
+        :type tagged_sents: [[(word:str, tag:str)]] or CompactTaggedCorpus
         :param anonProperNouns: Set 'True' to replace every proper noun with an anonymous string. Currently only for MTE tags.
         :type anonProperNouns: bool
         :param classifier: scikit-learn classifier to use for part of speech tagging. Classifier must be able to perform multiclass classification.
         :type classifier: BaseEstimator
-        :param vectorizer: vectorizer to perform vectorizsation of
+        :param vectorizer: vectorizer to perform vectorizsation of, a ContextWindowVectorizer or ContextWindowHasher takes the integer encoded context windows instead of dictionaries. Use a hashing vectorizer (ContextWindowHasher or FeatureHasher) to limit the memory of large feature sets.
         :type vectorizer: BaseEstimator
         :param context_window_generator: Context Window Generator which will get the current sentence to handle
         :type context_window_generator: AbstractSKLearnVectorGenerator
@@ -171,6 +736,8 @@ class MTESKTagger:
         assert isinstance(context_window_generator,
                           AbstractSKLearnVectorGenerator), "context_window_generator is not an instance of " \
                                                            "AbstractSKLearnVectorGenerator"
+        if isinstance(self.__vectorizer, (ContextWindowVectorizer, ContextWindowHasher)):
+            return context_window_generator.encode(tagged_sents, is_test)
         return context_window_generator.generate_vector(tagged_sents, is_test)
 
     def evaluate(self, gold):
@@ -194,7 +761,7 @@ class MTESKTagger:
         this function converts a scikit learn output of a classifer into a NLTK compatible one.
 
         :param X_test: X-Vector of the dataset to test with.
-        :type X_test: List
+        :type X_test: List or ContextWindows
         :param Y_test: List of gold standard values to test the classifier with.
         :type Y_test: List
         :param predicted: List of predicted values.
@@ -202,15 +769,16 @@ class MTESKTagger:
         :return: Tuple of Sets. First Set is gold standard, second one is the current result.
         :rtype (Set,Set)
         """
-        X_test = list(X_test)
+        if isinstance(X_test, (ContextWindows, ContextWindowRows)):
+            words = list(X_test.center_values())
+        else:
+            words = [x['word(0)'] for x in X_test]
         Y_test = list(Y_test)
         Y_predicted = list(predicted)
 
         gold = set()
         result = set()
-        for x, tag_gold, tag_predicted in zip(X_test, Y_test, Y_predicted):
-            word = x['word(0)']
-
+        for word, tag_gold, tag_predicted in zip(words, Y_test, Y_predicted):
             gold.add((word, tag_gold))
             result.add((word, tag_predicted))
 
@@ -237,7 +805,7 @@ class MTESKTagger:
 
         gold_tokens_set, test_tokens_set = self.__mkSet(X_test, Y_test, predicted)
 
-        gold_tokens = sum(gold, [])
+        gold_tokens = list(chain.from_iterable(gold))
         test_tokens = list(test_tokens_set)
         gold_tags = [t for (_, t) in gold_tokens]
         test_tags = [t for (_, t) in test_tokens]
@@ -245,8 +813,8 @@ class MTESKTagger:
 
         # calculate out of vocabulary words
         if oov:
-            d = {word: True for (word, _) in reduce(lambda a, b: a + b, self.__tagged_sents, [])}
-            aov = reduce(lambda a, b: a + 1 if not b in d else a, [w for (w, _) in gold_tokens], 0)
+            d = MTECorpusStatistics.from_tagged_sents(self.__tagged_sents).vocabulary()
+            aov = sum(1 for (w, _) in gold_tokens if w not in d)
             aov = (aov * 100.0) / len(gold_tokens)
         else:
             aov = '-1'
@@ -1,10 +1,35 @@
 """
 A reader for corpora whose documents are in MTE format.
 """
+import asyncio
+import gzip
+import hashlib
+import heapq
+import io
+import mmap
 import os
-from functools import reduce
-from nltk import compat
+import pickle
+import struct
+import sys
+import threading
+import zipfile
+from array import array
+from bisect import bisect_right
+from collections import Counter, namedtuple, OrderedDict
+from types import MappingProxyType
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
 from nltk.corpus.reader import concat, TaggedCorpusReader
+from nltk.corpus.reader.util import ConcatenatedCorpusView
+from nltk.data import ZipFilePathPointer
+from nltk.util import AbstractLazySequence
+
+# nltk.compat dropped string_types with python 2 support
+try:
+    from nltk.compat import string_types
+except ImportError:
+    string_types = (str,)
 
 lxmlAvailable = False
 try:
@@ -18,124 +43,2061 @@ except ImportError:
         import xml.etree.ElementTree as etree
 import re
 
-def xpath(root, path, ns):
-    if lxmlAvailable:
-        return root.xpath(path, namespaces=ns)
-    else:
-        return root.findall(path, ns)
+numpyAvailable = False
+try:
+    import numpy
+    numpyAvailable = True
+except ImportError:
+    pass
+
+lzmaAvailable = False
+try:
+    import lzma
+    lzmaAvailable = True
+except ImportError:
+    pass
+
+def xpath(root, path, ns):
+    if lxmlAvailable:
+        return root.xpath(path, namespaces=ns)
+    else:
+        return root.findall(path, ns)
+
+
+# a member of a zip archive is addressed by the path of the archive followed by
+# the name of the member, e.g. mte_teip5.zip/MTE1984-ana/oana-en.xml
+_archive_member = re.compile(r'^(.*?\.zip)/(.+)$')
+
+def _open_source(file_path):
+    """
+    Opens a TEI file for streaming, the file may be a member of a zip archive
+    or compressed with gzip or xz. Compressed content is decompressed while it
+    is read, nothing is extracted to disk.
+    """
+    member = _archive_member.match(file_path)
+    if member is not None:
+        with zipfile.ZipFile(member.group(1)) as archive:
+            # the opened member keeps the archive file open until it is closed
+            return archive.open(member.group(2))
+    if file_path.endswith('.gz'):
+        return gzip.open(file_path, 'rb')
+    if file_path.endswith('.xz'):
+        if not lzmaAvailable:
+            raise IOError("Reading xz compressed files requires the lzma module")
+        return lzma.open(file_path, 'rb')
+    return open(file_path, 'rb')
+
+def _is_conllu(file_path):
+    return re.sub(r'\.(gz|xz)$', '', file_path).endswith('.conllu')
+
+def write_conllu(items, stream):
+    """
+    Writes the items of MTEFileReader._iterparse() in the CoNLL-U format, one
+    token per line with the columns ID, FORM, LEMMA, UPOS, XPOS, FEATS, HEAD,
+    DEPREL, DEPS and MISC, where XPOS is the msd tag and UPOS its Universal
+    Dependencies tag (see MTETagConverter.msd_to_upos). Punctuation marks have
+    neither lemma nor msd ('_') and the UPOS PUNCT. Every
+    sentence is preceded by a '# sent_id' comment and every paragraph by a
+    '# newpar' comment, sentences outside of any paragraph by '# endpar'.
+
+    A missing word form (an empty <w/>) or lemma is written as '_'. As '_' is
+    also a valid word form and lemma, such a literal underscore is marked by
+    LiteralForm=Yes or LiteralLemma=Yes in the MISC column, so reading the file
+    back yields the same words and lemmas.
+
+    :param items: The (xml_id, tokens) and (xml_id, None) items of a file
+    :param stream: A text stream the lines are written to
+    """
+    para = []
+
+    def write_sent(sent_id, sent):
+        lines = [u'# sent_id = %s\n' % sent_id]
+        for (i, (word, ana, lemma)) in enumerate(sent, 1):
+            misc = [u'LiteralForm=Yes'] if word == u'_' else []
+            if ana is None:
+                lines.append(u'%d\t%s\t_\tPUNCT\t_\t_\t_\t_\t_\t%s\n' % (
+                    i, u'_' if word is None else word, u'|'.join(misc) or u'_'))
+            else:
+                if lemma == u'_':
+                    misc.append(u'LiteralLemma=Yes')
+                lines.append(u'%d\t%s\t%s\t%s\t%s\t_\t_\t_\t_\t%s\n' % (
+                    i, u'_' if word is None else word, u'_' if lemma is None else lemma,
+                    MTETagConverter.msd_to_upos(ana), ana, u'|'.join(misc) or u'_'))
+        lines.append(u'\n')
+        stream.write(u''.join(lines))
+
+    # the sentences of a paragraph are held back until its end, as its id is
+    # only known there but is written in front of them
+    for (xml_id, sent) in items:
+        if sent is not None:
+            para.append((xml_id or u'', sent))
+            continue
+        stream.write(u'# newpar id = %s\n' % xml_id if xml_id else u'# newpar\n')
+        for (sent_id, s) in para:
+            write_sent(sent_id, s)
+        para = []
+    if para:
+        stream.write(u'# endpar\n')
+        for (sent_id, s) in para:
+            write_sent(sent_id, s)
+
+def _source_stat(file_path):
+    """
+    :return: the size and modification time of a TEI file and a function computing
+             its content hash, the stored size and crc are used for archive members
+    """
+    member = _archive_member.match(file_path)
+    if member is None:
+        stat = os.stat(file_path)
+        def content_hash():
+            sha1 = hashlib.sha1()
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    sha1.update(chunk)
+            return sha1.digest()
+        return stat.st_size, stat.st_mtime_ns, content_hash
+    with zipfile.ZipFile(member.group(1)) as archive:
+        info = archive.getinfo(member.group(2))
+    mtime = os.stat(member.group(1)).st_mtime_ns
+    key = ('%s:%d:%d' % (info.filename, info.CRC, info.file_size)).encode('utf8')
+    return info.file_size, mtime, lambda: hashlib.sha1(key).digest()
+
+
+class MTEFileReader:
+    """
+    Class for loading the content of the multext-east corpus. It
+    parses the xml files and does some tag-filtering depending on the
+    given method parameters.
+    """
+    ns = {'tei': 'http://www.tei-c.org/ns/1.0', 'xml': 'http://www.w3.org/XML/1998/namespace'}
+    tag_ns = '{http://www.tei-c.org/ns/1.0}'
+    xml_ns = '{http://www.w3.org/XML/1998/namespace}'
+
+    # byte patterns of the scan splitting a file for parallel parsing: the start of
+    # a <p> element and any start or end tag (comments and instructions excluded)
+    _p_start = re.compile(br'<p[\s>/]')
+    _p_tag = re.compile(br'<(/?)p[\s>/]')
+    _body_start = re.compile(br'<body[\s>]')
+    _any_tag = re.compile(br'<(/?)([^\s>/!?]+)[^>]*?(/?)>')
+
+    # bounds of the size of the chunks a file is split into for parallel parsing
+    min_chunk_size = 1 << 20
+    max_chunk_size = 16 << 20
+
+    def __init__(self, file_path, workers=None):
+        """
+        :param file_path: The path of the file
+        :param workers: Number of worker processes a large file is parsed with, see _iterparse()
+        """
+        self.__file_path = file_path
+        self.__workers = workers
+        self.__document = None
+
+    def document(self):
+        """
+        Returns the content of the file as MTEDocument. It is created by a single
+        traversal of the file on first use and all list based methods are
+        projections of it, the iter_* methods stream the file instead.
+
+        :rtype: MTEDocument
+        """
+        if self.__document is None:
+            self.__document = MTEDocument.compile(self.__file_path, self.__workers)
+        return self.__document
+
+    def __parse(self):
+        return MTEFileReader._iterparse(self.__file_path, self.__workers)
+
+    @classmethod
+    def _iterparse(self, file_path, workers=None):
+        """
+        Streams the given file using iterparse. For every <s> element a tuple
+        (xml_id, tokens) is yielded, where tokens is a list of (word, ana, lemma)
+        tuples, punctuation marks (<c>) have no ana and lemma and carry None
+        instead. The end of every <p> element is signaled by yielding
+        (xml_id, None). Processed elements are cleared and detached from the
+        tree, so the memory usage depends on the size of a sentence and not on
+        the size of the file. The file may also be a zip archive member or a
+        gzip or xz compressed file, see _open_source().
+
+        With more than one worker a large uncompressed file is split into chunks
+        at paragraph boundaries, which are parsed by a pool of processes, see
+        _split_chunks(). The result is the same as that of a serial parse, if a
+        chunk cannot be parsed on its own the rest of the file is parsed serially.
+
+        Files exported to CoNLL-U (.conllu) are read by _iterparse_conllu() instead.
+        """
+        if _is_conllu(file_path):
+            for item in self._iterparse_conllu(file_path):
+                yield item
+            return
+        if workers is not None and workers > 1:
+            chunks = self._split_chunks(file_path, workers)
+            if chunks is not None:
+                for item in self._iterparse_chunks(file_path, chunks, workers):
+                    yield item
+                return
+
+        for item in self._iterparse_serial(file_path):
+            yield item
+
+    @classmethod
+    def _iterparse_serial(self, file_path):
+        source = _open_source(file_path)
+        try:
+            for item in self._parse_events(etree.iterparse(source, events=('start', 'end'))):
+                yield item
+        finally:
+            source.close()
+
+    @classmethod
+    def _parse_events(self, events):
+        # turns the start and end events of a parser into the items of _iterparse(),
+        # only the content of ./text/body is read, like the paragraphs of the teiHeader
+        # everything outside of it is skipped
+        p_tag, s_tag = self.tag_ns + "p", self.tag_ns + "s"
+        w_tag, c_tag = self.tag_ns + "w", self.tag_ns + "c"
+        text_tag, body_tag = self.tag_ns + "text", self.tag_ns + "body"
+        id_attrib = self.xml_ns + "id"
+        parents = []
+        sent = None
+        body = None
+        for event, elem in events:
+            if event == 'start':
+                if body is None:
+                    if elem.tag == body_tag and len(parents) == 2 and parents[1].tag == text_tag:
+                        body = elem
+                elif elem.tag == s_tag:
+                    sent = []
+                parents.append(elem)
+                continue
+
+            parents.pop()
+            if body is None:
+                continue
+            if elem is body:
+                body = None
+            elif elem.tag == w_tag or elem.tag == c_tag:
+                if sent is not None:
+                    sent.append((elem.text, elem.get('ana'), elem.get('lemma')))
+            elif elem.tag == s_tag:
+                yield elem.get(id_attrib), sent
+                sent = None
+            elif elem.tag == p_tag:
+                yield elem.get(id_attrib), None
+            else:
+                continue
+
+            if sent is None:
+                elem.clear()
+                if parents:
+                    parents[-1].remove(elem)
+
+    @classmethod
+    def _iterparse_conllu(self, file_path):
+        """
+        Reads a file written by write_conllu() and yields the same items as the
+        xml parser. The lines are only split at tabs, which is much faster than
+        parsing xml. Paragraphs start at '# newpar' comments and end at the next
+        one, at '# endpar' or at the end of the file. The msd tags are read from
+        the XPOS column, the UPOS column is not needed, as the universal tags are
+        derived from the msd tags exactly like for the xml files. A '_' in the
+        FORM or LEMMA column is read as a missing word or lemma, unless the MISC
+        column marks it as literal.
+        """
+        source = io.TextIOWrapper(_open_source(file_path), encoding='utf8')
+        try:
+            sent, sent_id, para = None, u'', None
+            for line in source:
+                if line[0] == '#':
+                    if line.startswith('# sent_id ='):
+                        sent, sent_id = [] if sent is None else sent, line[11:].strip()
+                    elif line.startswith('# newpar') or line.startswith('# endpar'):
+                        if para is not None:
+                            yield para, None
+                        if line.startswith('# newpar id ='):
+                            para = line[13:].strip()
+                        else:
+                            para = u'' if line.startswith('# newpar') else None
+                elif line == '\n':
+                    if sent is not None:
+                        yield sent_id, sent
+                    sent, sent_id = None, u''
+                else:
+                    columns = line.rstrip('\n').split('\t')
+                    misc = columns[9].split('|') if len(columns) > 9 else ()
+                    word = None if columns[1] == '_' and 'LiteralForm=Yes' not in misc else columns[1]
+                    ana = None if columns[4] == '_' else columns[4]
+                    lemma = columns[2]
+                    if ana is None or (lemma == '_' and 'LiteralLemma=Yes' not in misc):
+                        lemma = None
+                    if sent is None:
+                        sent = []
+                    sent.append((word, ana, lemma))
+            if sent is not None:
+                yield sent_id, sent
+            if para is not None:
+                yield para, None
+        finally:
+            source.close()
+
+    @classmethod
+    def _split_chunks(self, file_path, workers):
+        """
+        Splits a file into chunks for parallel parsing by a scan of its bytes. The
+        chunks end behind the </p> tag closing a paragraph, paragraphs nested in it
+        (e.g. in a <note>) are counted, the content of the paragraphs is skipped and
+        only the tags between them are tracked. So the start tags of the elements
+        that are open at the beginning of a chunk are known, they are put in front
+        of it together with the xml declaration, which makes every chunk parsable
+        on its own with the namespace declarations of the file. The paragraphs in
+        front of the <body> (those of the teiHeader) are no cut points.
+
+        :return: a list of (start, end, prefix) tuples or None if the file cannot or
+                 need not be split, as it is compressed, small or has no <p> elements
+        :rtype: list(tuple(int, int, bytes))
+        """
+        if _archive_member.match(file_path) or file_path.endswith(('.gz', '.xz')) or _is_conllu(file_path):
+            return None
+        size = os.path.getsize(file_path)
+        chunk_size = min(max(size // (workers * 4), self.min_chunk_size), self.max_chunk_size)
+        if size < 2 * chunk_size:
+            return None
+
+        with open(file_path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                declaration = data[:data.find(b'?>') + 2] if data[:5] == b'<?xml' else b''
+                body = self._body_start.search(data)
+                if body is None:
+                    return None
+                chunks, stack = [], []
+                chunk_start, chunk_prefix, pos = 0, b'', 0
+                while True:
+                    p = self._p_start.search(data, max(pos, body.start()))
+                    for tag in self._any_tag.finditer(data, pos, p.start() if p else size):
+                        if tag.group(1):
+                            if stack:
+                                stack.pop()
+                        elif not tag.group(3):
+                            stack.append(tag.group(0))
+                    if p is None:
+                        break
+                    tag_end = data.find(b'>', p.start())
+                    if data[tag_end - 1:tag_end] == b'/':
+                        pos = tag_end + 1
+                    else:
+                        pos = self._p_end(data, tag_end)
+                        if pos is None:
+                            return None
+                    if pos - chunk_start >= chunk_size and size - pos >= chunk_size // 2:
+                        chunks.append((chunk_start, pos, chunk_prefix))
+                        chunk_start, chunk_prefix = pos, declaration + b''.join(stack)
+            finally:
+                data.close()
+        chunks.append((chunk_start, size, chunk_prefix))
+        return chunks if len(chunks) > 1 else None
+
+    @classmethod
+    def _p_end(self, data, pos):
+        # the position behind the </p> closing the paragraph whose start tag ends at pos
+        depth = 1
+        for tag in self._p_tag.finditer(data, pos):
+            tag_end = data.find(b'>', tag.start())
+            if tag.group(1):
+                depth -= 1
+                if depth == 0:
+                    return tag_end + 1
+            elif data[tag_end - 1:tag_end] != b'/':
+                depth += 1
+        return None
+
+    @classmethod
+    def _iterparse_chunks(self, file_path, chunks, workers):
+        # parses the chunks in a process pool and yields their items in order, only
+        # a few more chunks than there are workers are parsed ahead of the consumer.
+        # if a chunk cannot be parsed, the items behind the ones yielded so far are
+        # taken from a serial parse, which also reports real syntax errors.
+        executor = ProcessPoolExecutor(max_workers=workers)
+        pending = []
+        done = 0
+        try:
+            chunks = iter(chunks)
+            for chunk in islice(chunks, workers + 1):
+                pending.append(executor.submit(_parse_chunk, file_path, *chunk))
+            while pending:
+                try:
+                    items = pending.pop(0).result()
+                except MTEChunkError:
+                    break
+                for chunk in islice(chunks, 1):
+                    pending.append(executor.submit(_parse_chunk, file_path, *chunk))
+                for item in items:
+                    done += 1
+                    yield item
+            else:
+                return
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown()
+        for item in islice(self._iterparse_serial(file_path), done, None):
+            yield item
+
+    @classmethod
+    def _iter_tagged_words(self, sent, tags=None):
+        if tags is None:
+            return [(w, ana) for (w, ana, _) in sent if ana is not None]
+        return [(w, ana) for (w, ana, _) in sent if ana is not None and tags.match(ana)]
+
+    @classmethod
+    def _compile_tags(self, tags):
+        if tags is None or tags == "":
+            return None
+        return re.compile('^' + re.sub("-",".",tags) + '.*$')
+
+    def iter_words(self):
+        """
+        Generator version of words(), the file is streamed instead of parsed as a whole.
+        """
+        for (_, sent) in self.__parse():
+            if sent is not None:
+                for (w, _, _) in sent:
+                    yield w
+
+    def iter_sents(self):
+        """
+        Generator version of sents(), the file is streamed instead of parsed as a whole.
+        """
+        for (_, sent) in self.__parse():
+            if sent is not None:
+                yield [w for (w, _, _) in sent]
+
+    def iter_tagged_sents(self, tags=""):
+        """
+        Generator version of tagged_sents(), the file is streamed instead of parsed as a whole.
+        """
+        tags = MTEFileReader._compile_tags(tags)
+        for (_, sent) in self.__parse():
+            if sent is not None:
+                tagged = MTEFileReader._iter_tagged_words(sent, tags)
+                if len(tagged) > 0:
+                    yield tagged
+
+    def iter_paras(self):
+        """
+        Generator version of paras(), the file is streamed instead of parsed as a whole.
+        Only a single paragraph is held in memory at a time.
+        """
+        para = []
+        for (_, sent) in self.__parse():
+            if sent is None:
+                yield para
+                para = []
+            else:
+                para.append([w for (w, _, _) in sent])
+
+    def iter_lemma_words(self):
+        """
+        Generator version of lemma_words(), the file is streamed instead of parsed as a whole.
+        """
+        for (_, sent) in self.__parse():
+            if sent is not None:
+                for (w, ana, lemma) in sent:
+                    if ana is not None:
+                        yield (w, lemma)
+
+    def iter_tagged_words(self, tags=""):
+        """
+        Generator version of tagged_words(), the file is streamed instead of parsed as a whole.
+        """
+        tags = MTEFileReader._compile_tags(tags)
+        for (_, sent) in self.__parse():
+            if sent is not None:
+                for tagged in MTEFileReader._iter_tagged_words(sent, tags):
+                    yield tagged
+
+    def iter_lemma_sents(self):
+        """
+        Generator version of lemma_sents(), the file is streamed instead of parsed as a whole.
+        """
+        for (_, sent) in self.__parse():
+            if sent is not None:
+                yield [(w, lemma) for (w, ana, lemma) in sent if ana is not None]
+
+    def iter_lemma_paras(self):
+        """
+        Generator version of lemma_paras(), the file is streamed instead of parsed as a whole.
+        Only a single paragraph is held in memory at a time.
+        """
+        para = []
+        for (_, sent) in self.__parse():
+            if sent is None:
+                yield para
+                para = []
+            else:
+                para.append([(w, lemma) for (w, ana, lemma) in sent if ana is not None])
+
+    def iter_sent_ids(self):
+        """
+        Streams the xml:ids of the sentences (<s>), sentences without one are skipped.
+        """
+        for (xml_id, sent) in self.__parse():
+            if sent is not None and xml_id:
+                yield xml_id
+
+    def iter_tagged_sents_with_ids(self):
+        """
+        Streams the sentences that have an xml:id as (xml_id, tagged sentence) tuples,
+        a sentence without words is yielded as an empty list, like by_id() returns it.
+        """
+        for (xml_id, sent) in self.__parse():
+            if sent is not None and xml_id:
+                yield xml_id, MTEFileReader._iter_tagged_words(sent)
+
+    def iter_tagged_paras(self, tags=""):
+        """
+        Generator version of tagged_paras(), the file is streamed instead of parsed as a whole.
+        Only a single paragraph is held in memory at a time.
+        """
+        tags = MTEFileReader._compile_tags(tags)
+        para = []
+        for (_, sent) in self.__parse():
+            if sent is None:
+                if len(para) > 0:
+                    yield para
+                para = []
+            else:
+                tagged = MTEFileReader._iter_tagged_words(sent, tags)
+                if len(tagged) > 0:
+                    para.append(tagged)
+
+    def words(self):
+        return list(self.document().iter_words())
+
+    def sents(self):
+        return list(self.document().iter_sents())
+
+    def paras(self):
+        return list(self.document().iter_paras())
+
+    def lemma_words(self):
+        return list(self.document().iter_lemma_words())
+
+    def tagged_words(self, tags=""):
+        return list(self.document().iter_tagged_words(tags))
+
+    def lemma_sents(self):
+        return list(self.document().iter_lemma_sents())
+
+    def tagged_sents(self, tags=""):
+        return list(self.document().iter_tagged_sents(tags))
+
+    def lemma_paras(self):
+        return list(self.document().iter_lemma_paras())
+
+    def tagged_paras(self, tags=""):
+        return list(self.document().iter_tagged_paras(tags))
+
+class MTETagConverter:
+    """
+    Class for converting msd tags to universal tags and for decoding msd tags
+    into their attributes. All conversions are memoized per distinct tag.
+    """
+
+    mapping_msd_universal = {
+        'A': 'ADJ', 'S': 'ADP', 'R': 'ADV', 'C': 'CONJ',
+        'D': 'DET', 'N': 'NOUN', 'M': 'NUM', 'Q': 'PRT',
+        'P': 'PRON', 'V': 'VERB', '.': '.', '-': 'X'}
+
+    # Universal Dependencies UPOS of the msd categories, refined by the type of nouns,
+    # verbs and conjunctions (category, type) where UD distinguishes them
+    mapping_msd_upos = {
+        'A': 'ADJ', 'S': 'ADP', 'R': 'ADV', 'C': 'CCONJ', 'D': 'DET', 'T': 'DET',
+        'N': 'NOUN', 'M': 'NUM', 'Q': 'PART', 'P': 'PRON', 'V': 'VERB', 'I': 'INTJ',
+        'Y': 'X', 'X': 'X', '-': 'X',
+        ('N', 'p'): 'PROPN', ('V', 'a'): 'AUX', ('C', 's'): 'SCONJ'}
+
+    _gender = ('Gender', {'m': 'masculine', 'f': 'feminine', 'n': 'neuter', 'c': 'common'})
+    _number = ('Number', {'s': 'singular', 'p': 'plural', 'd': 'dual', 't': 'count', 'l': 'collective'})
+    _case = ('Case', {'n': 'nominative', 'g': 'genitive', 'd': 'dative', 'a': 'accusative', 'v': 'vocative',
+                      'l': 'locative', 'i': 'instrumental', 'o': 'oblique', 'e': 'essive', 'x': 'translative',
+                      'b': 'abessive', 'c': 'comitative', 't': 'terminative', '1': 'illative', '2': 'inessive',
+                      '3': 'elative', '4': 'allative', '5': 'adessive', '6': 'ablative'})
+    _person = ('Person', {'1': 'first', '2': 'second', '3': 'third'})
+    _degree = ('Degree', {'p': 'positive', 'c': 'comparative', 's': 'superlative'})
+    _definiteness = ('Definiteness', {'n': 'no', 'y': 'yes', 'f': 'full-art', 's': 'short-art'})
+    _clitic = ('Clitic', {'n': 'no', 'y': 'yes'})
+    _animate = ('Animate', {'n': 'no', 'y': 'yes'})
+    _formation = ('Formation', {'s': 'simple', 'c': 'compound'})
+
+    # The categories of the MULTEXT-East (v4) msd specification. Every category maps to its name
+    # and a template of the attributes following the category letter, each attribute given by its
+    # name and the names of its values. The category names hold for all languages, the order of the
+    # attributes does not (see msd_language_specifications).
+    msd_specification = {
+        'N': ('Noun', [('Type', {'c': 'common', 'p': 'proper'}), _gender, _number, _case,
+                       _definiteness, _clitic, _animate]),
+        'V': ('Verb', [('Type', {'m': 'main', 'a': 'auxiliary', 'o': 'modal', 'c': 'copula', 'b': 'base'}),
+                       ('VForm', {'i': 'indicative', 's': 'subjunctive', 'm': 'imperative', 'c': 'conditional',
+                                  'n': 'infinitive', 'p': 'participle', 'g': 'gerund', 'u': 'supine',
+                                  't': 'transgressive', 'q': 'quotative'}),
+                       ('Tense', {'p': 'present', 'i': 'imperfect', 'f': 'future', 's': 'past',
+                                  'l': 'pluperfect', 'a': 'aorist'}),
+                       _person, _number, _gender,
+                       ('Voice', {'a': 'active', 'p': 'passive'}),
+                       ('Negative', {'n': 'no', 'y': 'yes'}), _definiteness, _clitic, _case, _animate]),
+        'A': ('Adjective', [('Type', {'f': 'qualificative', 's': 'possessive', 'o': 'ordinal'}), _degree,
+                            _gender, _number, _case, _definiteness, _clitic, _animate]),
+        'P': ('Pronoun', [('Type', {'p': 'personal', 'd': 'demonstrative', 'i': 'indefinite', 's': 'possessive',
+                                    'q': 'interrogative', 'r': 'relative', 'x': 'reflexive', 'z': 'negative',
+                                    'g': 'general', 'e': 'exclamative', 'h': 'emphatic'}),
+                          _person, _gender, _number, _case,
+                          ('Owner_Number', _number[1]), ('Owner_Gender', _gender[1]), _clitic]),
+        'D': ('Determiner', [('Type', {'d': 'demonstrative', 'i': 'indefinite', 's': 'possessive',
+                                       'q': 'interrogative', 'r': 'relative', 'z': 'negative', 'g': 'general'}),
+                             _person, _gender, _number, _case,
+                             ('Owner_Number', _number[1]), ('Owner_Gender', _gender[1]), _clitic]),
+        'T': ('Article', [('Type', {'f': 'definite', 'i': 'indefinite', 's': 'possessive', 'd': 'demonstrative'}),
+                          _gender, _number, _case, _clitic]),
+        'R': ('Adverb', [('Type', {'g': 'general', 'p': 'participle', 'm': 'modifier', 's': 'specifier',
+                                   'c': 'clitic'}), _degree, _clitic, _number, _person]),
+        'S': ('Adposition', [('Type', {'p': 'preposition', 't': 'postposition', 'c': 'circumposition'}),
+                             _formation, _case, _clitic, _gender, _number]),
+        'C': ('Conjunction', [('Type', {'c': 'coordinating', 's': 'subordinating'}), _formation,
+                              ('Coord_Type', {'s': 'simple', 'r': 'repetit', 'c': 'correlat', 'n': 'sentence',
+                                              'w': 'words', 'i': 'initial', 'z': 'non-initial'}),
+                              ('Sub_Type', {'z': 'negative', 'p': 'positive'}), _clitic, _number, _person]),
+        'M': ('Numeral', [('Form', {'d': 'digit', 'r': 'roman', 'l': 'letter'}),
+                          ('Type', {'c': 'cardinal', 'o': 'ordinal', 'f': 'fractional', 'm': 'multiple',
+                                    's': 'special', 'l': 'collect'}),
+                          _gender, _number, _case, _definiteness, _clitic, _animate]),
+        'Q': ('Particle', [('Type', {'z': 'negative', 'q': 'interrogative', 'o': 'modal', 'r': 'affirmative',
+                                     'c': 'coordinating', 's': 'subordinating'}), _formation, _clitic]),
+        'I': ('Interjection', [('Type', {'s': 'simple', 'c': 'compound'})]),
+        'Y': ('Abbreviation', [('Syntactic_Type', {'n': 'nominal', 'r': 'adverbial'}), _gender, _number, _case,
+                               _definiteness]),
+        'X': ('Residual', [('Type', {'f': 'foreign', 't': 'typo', 'p': 'program'})]),
+    }
+
+    # Attribute tables per language, language code -> category -> (name, attributes). None are shipped:
+    # the languages of MULTEXT-East order the positions of a category differently (position 5 of a
+    # Slovene or Czech noun is Animate, of a Romanian one Definiteness), so the positions of
+    # msd_specification are only a template for these tables and are not applied to any language.
+    msd_language_specifications = {}
+
+    _universal_cache = {}
+    _upos_cache = {}
+    _attribute_cache = {}
+    _truncation_cache = {}
+
+    @staticmethod
+    def msd_to_universal(tag):
+        """
+        This function converts the annotation from the Multex-East to the universal tagset
+        as described in Chapter 5 of the NLTK-Book
+
+        Unknown Tags will be mapped to X. Punctuation marks are not supported in MSD tags, so
+        """
+        try:
+            return MTETagConverter._universal_cache[tag]
+        except KeyError:
+            pass
+        indicator = tag[0] if not tag[0] == "#" else tag[1]
+
+        if not indicator in MTETagConverter.mapping_msd_universal:
+            indicator = '-'
+
+        universal = MTETagConverter._universal_cache[tag] = MTETagConverter.mapping_msd_universal[indicator]
+        return universal
+
+    @staticmethod
+    def msd_to_upos(tag):
+        """
+        This function converts the annotation from the Multex-East to the UPOS tags of
+        Universal Dependencies, which are used in CoNLL-U files. Unlike the universal
+        tagset of NLTK it has PROPN, AUX, CCONJ, SCONJ, PART and INTJ.
+
+        Unknown Tags will be mapped to X, punctuation marks have no msd tag and are PUNCT.
+        """
+        try:
+            return MTETagConverter._upos_cache[tag]
+        except KeyError:
+            pass
+        msd = tag[1:] if tag[:1] == "#" else tag
+        mapping = MTETagConverter.mapping_msd_upos
+        upos = mapping.get((msd[:1], msd[1:2]), mapping.get(msd[:1], mapping['-']))
+        MTETagConverter._upos_cache[tag] = upos
+        return upos
+
+    @staticmethod
+    def msd_to_attributes(tag, language=None):
+        """
+        Decodes an msd tag into its attributes. The category is named after the
+        MULTEXT-East specification, the positions following it are only named if an
+        attribute table is registered for the language in msd_language_specifications,
+        e.g. '#Ncmsn' becomes {'Category': 'Noun', 'Type': 'common', 'Gender': 'masculine',
+        'Number': 'singular', 'Case': 'nominative'}. No tables are shipped, as the
+        positions differ between the languages, so without one the positions are
+        kept as Position1, Position2, ... with their value codes, e.g. {'Category':
+        'Noun', 'Position1': 'c', 'Position2': 'm', 'Position3': 's', 'Position4': 'n'}.
+        Positions marked as not applicable ('-') are left out and unknown value codes
+        are kept as they are. The decoded attributes are shared between calls, so they
+        are returned as a read-only mapping.
+
+        :param tag: The msd tag, with or without the leading '#'
+        :param language: The language code of the tag (e.g. 'en'), selects the
+                         attribute table registered for the language
+        :rtype: Mapping(str, str)
+        """
+        key = (tag, language)
+        try:
+            return MTETagConverter._attribute_cache[key]
+        except KeyError:
+            pass
+        msd = tag[1:] if tag.startswith('#') else tag
+        attributes = {}
+        if msd:
+            specification = MTETagConverter.msd_language_specifications.get(language, {})
+            name, positions = specification.get(msd[0]) or \
+                (MTETagConverter.msd_specification.get(msd[0], (msd[0],))[0], [])
+            attributes['Category'] = name
+            for (position, code) in enumerate(msd[1:]):
+                if code == '-':
+                    continue
+                if position < len(positions):
+                    attribute, values = positions[position]
+                    attributes[attribute] = values.get(code, code)
+                else:
+                    attributes['Position%d' % (position + 1)] = code
+        attributes = MTETagConverter._attribute_cache[key] = MappingProxyType(attributes)
+        return attributes
+
+    @staticmethod
+    def msd_truncate(tag, positions):
+        """
+        Reduces an msd tag to its category and the given number of attribute
+        positions following it, trailing positions marked as not applicable ('-')
+        are dropped, e.g. msd_truncate('#Ds3-sm', 2) is '#Ds3'.
+
+        :param tag: The msd tag, with or without the leading '#'
+        :param positions: The number of attribute positions that are kept
+        :rtype: str
+        """
+        key = (tag, positions)
+        try:
+            return MTETagConverter._truncation_cache[key]
+        except KeyError:
+            pass
+        prefix = 2 if tag.startswith('#') else 1
+        truncated = MTETagConverter._truncation_cache[key] = tag[:prefix + positions].rstrip('-')
+        return truncated
+
+    @staticmethod
+    def tagset_conversion(tagset):
+        """
+        Resolves the name of a tagset to the function converting msd tags into it.
+        Supported are "msd" (no conversion), "universal" and "msd:k", which is the
+        msd tag truncated to its first k attribute positions.
+
+        :param tagset: The name of the tagset
+        :return: the conversion function, None for "msd"
+        :raises ValueError: if the tagset is unknown
+        """
+        if tagset == "msd":
+            return None
+        elif tagset == "universal":
+            return MTETagConverter.msd_to_universal
+        elif tagset.startswith("msd:") and tagset[4:].isdigit():
+            return partial(MTETagConverter.msd_truncate, positions=int(tagset[4:]))
+        raise ValueError("Unknown tagset %s" % tagset)
+
+    @staticmethod
+    def tag_mapping(tags, conversion=None):
+        """
+        Converts a table of distinct tags into a mapping table, every tag is converted
+        exactly once, no matter how often it occurs in a corpus.
+
+        :param tags: The table of distinct tags
+        :type tags: list(str)
+        :param conversion: Function converting a single tag (default is msd_to_universal)
+        :return: the table of distinct converted tags and for every tag of the given
+                 table the id of its conversion in the new table
+        :rtype: (list(str), array(int))
+        """
+        conversion = MTETagConverter.msd_to_universal if conversion is None else conversion
+        table = {}
+        mapping = array('i', [table.setdefault(conversion(tag), len(table)) for tag in tags])
+        return sorted(table, key=table.get), mapping
+
+    @staticmethod
+    def convert_tag_ids(tags, tag_ids, conversion=None):
+        """
+        Converts an id encoded tag array in bulk. Each distinct tag of the table
+        is converted only once, the ids are then translated by a single lookup in
+        the resulting mapping table, which is vectorized if numpy is available.
+
+        :param tags: The table of distinct tags the ids refer to
+        :type tags: list(str)
+        :param tag_ids: The ids of the tags
+        :type tag_ids: sequence(int)
+        :param conversion: Function converting a single tag (default is msd_to_universal)
+        :return: the table of distinct converted tags and the converted ids referring to it
+        :rtype: (list(str), array(int))
+        """
+        table, mapping = MTETagConverter.tag_mapping(tags, conversion)
+        if numpyAvailable:
+            converted = array('i', numpy.frombuffer(mapping, dtype=numpy.intc)[
+                numpy.asarray(tag_ids, dtype=numpy.intp)].tobytes())
+        else:
+            converted = array('i', [mapping[i] for i in tag_ids])
+        return table, converted
+
+
+MTEConcordanceLine = namedtuple('MTEConcordanceLine', ['fileid', 'sent_id', 'position', 'left', 'keyword', 'right'])
+
+
+class MTETokenIndex(object):
+    """
+    Positional inverted index over the word forms, lemmas and msd tags of an
+    MTEDocument. For every field the token positions are grouped by the id of
+    their value in the document's string table (CSR layout): the positions of
+    the tokens with id i are positions[offsets[i]:offsets[i + 1]] in ascending
+    order. Punctuation marks are only indexed by their word form.
+
+    The index is saved next to the cache file of its document and memory-mapped
+    when it is loaded again; it records size and modification time of the cache
+    file and is only used as long as they still match.
+    """
+    _magic = b'MTEI'
+    _version = 1
+    # magic, version, byte order, size and mtime of the cache file, number of tokens and
+    # the number of types and positions of the word, lemma and msd field
+    _header = struct.Struct('<4sHHQQQQQQQQQ')
+
+    WORD, LEMMA, MSD = range(3)
+
+    def __init__(self, fields):
+        """
+        :param fields: (offsets, positions) of the word, lemma and msd field
+        """
+        self._fields = fields
+
+    @classmethod
+    def build(cls, document):
+        """
+        Builds the index of a document with a counting sort of every field.
+        """
+        return cls([cls._invert(ids, len(table)) for (ids, table) in
+                    ((document._word_ids, document._words), (document._lemma_ids, document._lemmas),
+                     (document._msd_ids, document._msds))])
+
+    @staticmethod
+    def _invert(ids, n_types):
+        if numpyAvailable:
+            ids = numpy.frombuffer(ids, dtype=numpy.int32)
+            counts = numpy.bincount(ids[ids >= 0], minlength=n_types)
+            offsets = numpy.zeros(n_types + 1, dtype=numpy.int32)
+            offsets[1:] = numpy.cumsum(counts)
+            # a stable sort keeps the positions of each id ascending, the -1 ids come first
+            order = numpy.argsort(ids, kind='stable').astype(numpy.int32)
+            return array('i', offsets.tobytes()), array('i', order[len(ids) - offsets[-1]:].tobytes())
+
+        offsets = array('i', bytes(4 * (n_types + 1)))
+        for i in ids:
+            if i >= 0:
+                offsets[i + 1] += 1
+        for i in range(n_types):
+            offsets[i + 1] += offsets[i]
+        fill = array('i', offsets[:-1])
+        positions = array('i', bytes(4 * offsets[-1]))
+        for (t, i) in enumerate(ids):
+            if i >= 0:
+                positions[fill[i]] = t
+                fill[i] += 1
+        return offsets, positions
+
+    @staticmethod
+    def _stamp(cache_path):
+        stat = os.stat(cache_path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def save(self, index_path, stamp, n_tokens):
+        """
+        Writes the index to a binary file.
+
+        :param stamp: (size, mtime) of the cache file of the indexed document
+        """
+        size, mtime = stamp
+        header = self._header.pack(self._magic, self._version, sys.byteorder == 'little', size, mtime, n_tokens,
+                                   *[n for (offsets, positions) in self._fields
+                                     for n in (len(offsets) - 1, len(positions))])
+        tmp_path = '%s.%d.tmp' % (index_path, os.getpid())
+        with open(tmp_path, 'wb') as f:
+            f.write(header)
+            for (offsets, positions) in self._fields:
+                f.write(offsets.tobytes())
+                f.write(positions.tobytes())
+        os.replace(tmp_path, index_path)
+
+    @classmethod
+    def load(cls, index_path, stamp, n_tokens):
+        """
+        Memory-maps an index file written by save(). A ValueError is raised if the
+        index file is invalid or does not belong to the current cache file.
+        """
+        with open(index_path, 'rb') as f:
+            try:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, mmap.error):
+                raise ValueError("Empty index file %s" % index_path)
+        if len(buf) < cls._header.size:
+            raise ValueError("Truncated index file %s" % index_path)
+        magic, version, little, size, mtime, tokens, *counts = cls._header.unpack_from(buf)
+        if magic != cls._magic or version != cls._version or bool(little) != (sys.byteorder == 'little'):
+            raise ValueError("Incompatible index file %s" % index_path)
+        if (size, mtime) != tuple(stamp) or tokens != n_tokens:
+            raise ValueError("Stale index file %s" % index_path)
+        if len(buf) != cls._header.size + 4 * (sum(counts) + 3):
+            raise ValueError("Truncated index file %s" % index_path)
+
+        view = memoryview(buf)
+        pos = cls._header.size
+        fields = []
+        for (n_types, n_positions) in zip(counts[::2], counts[1::2]):
+            offsets = view[pos:pos + 4 * (n_types + 1)].cast('i')
+            pos += 4 * (n_types + 1)
+            fields.append((offsets, view[pos:pos + 4 * n_positions].cast('i')))
+            pos += 4 * n_positions
+        return cls(fields)
+
+    def positions(self, field, i):
+        """
+        :param field: MTETokenIndex.WORD, LEMMA or MSD
+        :param i: the id of a value of the field
+        :return: the sorted positions of all tokens with this value
+        :rtype: array(int) or memoryview
+        """
+        offsets, positions = self._fields[field]
+        return positions[offsets[i]:offsets[i + 1]]
+
+    def count(self, field, i):
+        """
+        :return: the number of tokens with the value i of the field
+        :rtype: int
+        """
+        offsets = self._fields[field][0]
+        return offsets[i + 1] - offsets[i]
+
+    def nbytes(self):
+        """
+        :return: the size of the index in bytes
+        :rtype: int
+        """
+        return sum(4 * (len(offsets) + len(positions)) for (offsets, positions) in self._fields)
+
+
+def _decode(table, i):
+    # the entry of a string table for an id of an MTEDocument, -1 stands for a missing value
+    return table[i] if i >= 0 else None
+
+
+class MTEDocument(object):
+    """
+    Compact representation of the content of a single MTE file. Words, lemmas and
+    msd tags are stored once in string tables and every token references them by
+    integer ids, sentences and paragraphs are stored as offset arrays together
+    with their xml:ids, so single sentences can be decoded directly. Missing values
+    have the id -1 and are decoded as None: punctuation marks have neither lemma
+    nor msd tag, a <w> may lack its lemma and an empty <w/> has no word form.
+
+    A document can be saved to a binary cache file, which is memory-mapped when
+    it is loaded again. The cache file records size, modification time and sha1
+    hash of the xml file it was compiled from and is only used as long as they
+    still match. The iter_* methods behave exactly like those of MTEFileReader.
+    """
+    _magic = b'MTEC'
+    _version = 2
+    # magic, version, byte order, file size, file mtime, file sha1, number of tokens, sentences,
+    # paragraphs and the sizes of the string tables (words, lemmas, msds, sentence ids, paragraph ids)
+    _header = struct.Struct('<4sHHQQ20sQQQQQQQQ')
+
+    def __init__(self, words, lemmas, msds, word_ids, lemma_ids, msd_ids, sent_offsets, para_offsets,
+                 sent_ids=None, para_ids=None):
+        self._words = words
+        self._lemmas = lemmas
+        self._msds = msds
+        self._word_ids = word_ids
+        self._lemma_ids = lemma_ids
+        self._msd_ids = msd_ids
+        self._sent_offsets = sent_offsets
+        self._para_offsets = para_offsets
+        # xml:ids of the sentences and paragraphs, empty strings for elements without id
+        self._sent_ids = sent_ids if sent_ids is not None else [u''] * (len(sent_offsets) - 1)
+        self._para_ids = para_ids if para_ids is not None else [u''] * (len(para_offsets) - 1)
+        # the path of the cache file the document was saved to or loaded from, if any
+        self._cache_path = None
+        # the following indexes are built on demand: the positional token index, word and lemma
+        # -> id, compiled tag patterns, xml:id -> element, ordinals of the sentences and
+        # paragraphs containing words
+        self._token_index = None
+        self._value_ids = [None, None]
+        self._patterns = {}
+        self._id_index = None
+        self._tagged_sent_ordinals = None
+        self._tagged_para_ordinals = None
+
+    @classmethod
+    def compile(cls, file_path, workers=None):
+        """
+        Creates the document for the given xml file in a single streaming pass,
+        a large file is parsed by the given number of worker processes.
+        """
+        tables = ({}, {}, {})
+        ids = (array('i'), array('i'), array('i'))
+        sent_offsets, para_offsets = array('i', [0]), array('i', [0])
+        sent_ids, para_ids = [], []
+
+        for (xml_id, sent) in MTEFileReader._iterparse(file_path, workers):
+            if sent is None:
+                para_offsets.append(len(sent_offsets) - 1)
+                para_ids.append(xml_id or u'')
+                continue
+            for token in sent:
+                for value, table, id_array in zip(token, tables, ids):
+                    id_array.append(-1 if value is None else table.setdefault(value, len(table)))
+            sent_offsets.append(len(ids[0]))
+            sent_ids.append(xml_id or u'')
+
+        # tokens are (word, ana, lemma) tuples
+        words, msds, lemmas = [sorted(table, key=table.get) for table in tables]
+        return cls(words, lemmas, msds, ids[0], ids[2], ids[1], sent_offsets, para_offsets, sent_ids, para_ids)
+
+    @classmethod
+    def cached(cls, file_path, cache_path, workers=None):
+        """
+        Loads the document of the given xml file from cache_path, the document
+        is compiled and the cache file is (re)written if it is missing or stale.
+        """
+        if os.path.exists(cache_path):
+            try:
+                return cls.load(cache_path, file_path)
+            except ValueError:
+                pass
+        stamp = cls._stamp(file_path)
+        document = cls.compile(file_path, workers)
+        document.save(cache_path, stamp)
+        return document
+
+    @staticmethod
+    def _stamp(file_path, with_hash=True):
+        size, mtime, content_hash = _source_stat(file_path)
+        return size, mtime, content_hash() if with_hash else None
+
+    def save(self, cache_path, stamp):
+        """
+        Writes the document to a binary cache file.
+
+        :param stamp: (size, mtime, sha1) of the xml file the document was compiled from
+        """
+        # every entry of a string table is terminated by a null byte, tables are padded to 4 bytes
+        tables = [u''.join(v + u'\x00' for v in t).encode('utf8') for t in
+                  (self._words, self._lemmas, self._msds, self._sent_ids, self._para_ids)]
+        size, mtime, sha1 = stamp
+        header = self._header.pack(self._magic, self._version, sys.byteorder == 'little', size, mtime, sha1,
+                                   len(self._word_ids), self.sent_count(), self.para_count(),
+                                   *[len(t) for t in tables])
+        tables = [t + b'\x00' * (-len(t) % 4) for t in tables]
+
+        directory = os.path.dirname(cache_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        tmp_path = '%s.%d.tmp' % (cache_path, os.getpid())
+        with open(tmp_path, 'wb') as f:
+            f.write(header)
+            f.write(b''.join(tables))
+            for a in (self._word_ids, self._lemma_ids, self._msd_ids, self._sent_offsets, self._para_offsets):
+                f.write(a.tobytes())
+        os.replace(tmp_path, cache_path)
+        self._cache_path = cache_path
+
+    @classmethod
+    def load(cls, cache_path, file_path):
+        """
+        Memory-maps a cache file written by save(). A ValueError is raised if
+        the cache file is invalid or does not belong to the current content of
+        the xml file.
+        """
+        with open(cache_path, 'rb') as f:
+            try:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, mmap.error):
+                raise ValueError("Empty cache file %s" % cache_path)
+        if len(buf) < cls._header.size:
+            raise ValueError("Truncated cache file %s" % cache_path)
+        (magic, version, little, size, mtime, sha1,
+         n_tokens, n_sents, n_paras, *table_sizes) = cls._header.unpack_from(buf)
+        if magic != cls._magic or version != cls._version or bool(little) != (sys.byteorder == 'little'):
+            raise ValueError("Incompatible cache file %s" % cache_path)
+        current = cls._stamp(file_path, with_hash=False)
+        if current[0] != size or (current[1] != mtime and cls._stamp(file_path)[2] != sha1):
+            raise ValueError("Stale cache file %s" % cache_path)
+        padded_sizes = [t + (-t % 4) for t in table_sizes]
+        if len(buf) != cls._header.size + sum(padded_sizes) + 4 * (3 * n_tokens + n_sents + n_paras + 2):
+            raise ValueError("Truncated cache file %s" % cache_path)
+
+        view = memoryview(buf)
+        pos = cls._header.size
+        tables = []
+        for (table_size, padded_size) in zip(table_sizes, padded_sizes):
+            tables.append(bytes(view[pos:pos + table_size]).decode('utf8').split(u'\x00')[:-1])
+            pos += padded_size
+        arrays = []
+        for n in (n_tokens, n_tokens, n_tokens, n_sents + 1, n_paras + 1):
+            arrays.append(view[pos:pos + 4 * n].cast('i'))
+            pos += 4 * n
+        words, lemmas, msds, sent_ids, para_ids = tables
+        document = cls(words, lemmas, msds, *arrays, sent_ids=sent_ids, para_ids=para_ids)
+        document._cache_path = cache_path
+        return document
+
+    def __reduce__(self):
+        # memory-mapped arrays are copied, so documents can be sent to worker processes,
+        # the token index is not sent but loaded again from the cache file
+        arrays = [a if isinstance(a, array) else array('i', a.tobytes()) for a in
+                  (self._word_ids, self._lemma_ids, self._msd_ids, self._sent_offsets, self._para_offsets)]
+        return MTEDocument, ((self._words, self._lemmas, self._msds) + tuple(arrays) +
+                             (self._sent_ids, self._para_ids)), {'_cache_path': self._cache_path}
+
+    def __len__(self):
+        return len(self._word_ids)
+
+    def token(self, i):
+        """
+        :return: the i-th token of the document as (word, lemma, ana, is_punctuation),
+                 lemma and ana are None for punctuation marks, missing values are None
+        :rtype: tuple(str, str, str, bool)
+        """
+        word = _decode(self._words, self._word_ids[i])
+        if self._msd_ids[i] < 0:
+            return word, None, None, True
+        return word, _decode(self._lemmas, self._lemma_ids[i]), self._msds[self._msd_ids[i]], False
+
+    def is_punctuation(self, i):
+        """
+        :return: whether the i-th token is a punctuation mark (<c>) instead of a word (<w>)
+        :rtype: bool
+        """
+        return self._msd_ids[i] < 0
+
+    def sent_count(self):
+        return len(self._sent_offsets) - 1
+
+    def para_count(self):
+        return len(self._para_offsets) - 1
+
+    def sent_bounds(self, i):
+        """
+        :return: the token range (start, stop) of the i-th sentence
+        :rtype: tuple(int, int)
+        """
+        return self._sent_offsets[i], self._sent_offsets[i + 1]
+
+    def para_bounds(self, i):
+        """
+        :return: the sentence range (start, stop) of the i-th paragraph
+        :rtype: tuple(int, int)
+        """
+        return self._para_offsets[i], self._para_offsets[i + 1]
+
+    def nbytes(self):
+        """
+        :return: the approximate memory size of the document in bytes
+        :rtype: int
+        """
+        size = sum(len(a) * 4 for a in (self._word_ids, self._lemma_ids, self._msd_ids,
+                                        self._sent_offsets, self._para_offsets))
+        if self._token_index is not None:
+            size += self._token_index.nbytes()
+        return size + sum(sys.getsizeof(v) for t in (self._words, self._lemmas, self._msds,
+                                                     self._sent_ids, self._para_ids) for v in t)
+
+    def sent_id(self, i):
+        """
+        :return: the xml:id of the i-th sentence (<s>), an empty string if it has none
+        :rtype: str
+        """
+        return self._sent_ids[i]
+
+    def para_id(self, i):
+        """
+        :return: the xml:id of the i-th paragraph (<p>), an empty string if it has none
+        :rtype: str
+        """
+        return self._para_ids[i]
+
+    def locate(self, xml_id):
+        """
+        Looks up a sentence or paragraph by its xml:id, a KeyError is raised if
+        the document contains no such element.
+
+        :return: ('s', ordinal) for a sentence or ('p', ordinal) for a paragraph
+        :rtype: tuple(str, int)
+        """
+        if self._id_index is None:
+            index = dict((xml_id, ('p', i)) for (i, xml_id) in enumerate(self._para_ids) if xml_id)
+            index.update((xml_id, ('s', i)) for (i, xml_id) in enumerate(self._sent_ids) if xml_id)
+            self._id_index = index
+        return self._id_index[xml_id]
+
+    def _tagged_ordinals(self):
+        # tagged_sents() and tagged_paras() skip sentences without words and paragraphs
+        # without such sentences, these arrays map their positions to ordinals of <s> and <p>
+        if self._tagged_sent_ordinals is None and numpyAvailable:
+            # a sentence is tagged if the prefix count of words grows within its bounds
+            words = numpy.zeros(len(self) + 1, dtype=numpy.int64)
+            numpy.cumsum(numpy.frombuffer(self._msd_ids, dtype=numpy.int32) >= 0, out=words[1:])
+            sent_offsets = numpy.frombuffer(self._sent_offsets, dtype=numpy.int32)
+            tagged = words[sent_offsets[1:]] > words[sent_offsets[:-1]]
+            sents = numpy.zeros(len(tagged) + 1, dtype=numpy.int64)
+            numpy.cumsum(tagged, out=sents[1:])
+            para_offsets = numpy.frombuffer(self._para_offsets, dtype=numpy.int32)
+            self._tagged_para_ordinals = array('i', numpy.flatnonzero(
+                sents[para_offsets[1:]] > sents[para_offsets[:-1]]).astype(numpy.int32).tobytes())
+            self._tagged_sent_ordinals = array('i', numpy.flatnonzero(tagged).astype(numpy.int32).tobytes())
+        elif self._tagged_sent_ordinals is None:
+            msd_ids = self._msd_ids
+            tagged = [any(msd_ids[t] >= 0 for t in self._sent_tokens(i)) for i in range(self.sent_count())]
+            self._tagged_para_ordinals = array('i', [i for i in range(self.para_count())
+                                                     if any(tagged[s] for s in self._para_sents(i))])
+            self._tagged_sent_ordinals = array('i', [i for i in range(self.sent_count()) if tagged[i]])
+        return self._tagged_sent_ordinals, self._tagged_para_ordinals
+
+    def _tagged_para(self, i):
+        return [t for t in [self._tagged_sent(s, None) for s in self._para_sents(i)] if len(t) > 0]
+
+    def tagged_sent(self, i):
+        """
+        :return: the i-th item of iter_tagged_sents(), only this sentence is decoded
+        :rtype: list(tuple(str, str))
+        """
+        return self._tagged_sent(self._tagged_ordinals()[0][i], None)
+
+    def tagged_sents_slice(self, start, stop):
+        """
+        :return: the items start to stop of iter_tagged_sents(), only these sentences are decoded
+        :rtype: list(list(tuple(str, str)))
+        """
+        return [self._tagged_sent(i, None) for i in self._tagged_ordinals()[0][start:stop]]
+
+    def tagged_para(self, i):
+        """
+        :return: the i-th item of iter_tagged_paras(), only this paragraph is decoded
+        :rtype: list(list(tuple(str, str)))
+        """
+        return self._tagged_para(self._tagged_ordinals()[1][i])
+
+    def by_id(self, xml_id):
+        """
+        :return: the tagged sentence or paragraph with the given xml:id, a paragraph
+                 does not contain sentences without words. A KeyError is raised if
+                 the document contains no such element.
+        :rtype: list(tuple(str, str)) or list(list(tuple(str, str)))
+        """
+        kind, i = self.locate(xml_id)
+        if kind == 's':
+            return self._tagged_sent(i, None)
+        return self._tagged_para(i)
+
+    def _matching_msds(self, tags):
+        # the msd tag pattern is checked once per distinct tag instead of once per token
+        if tags is None or tags == "":
+            return None
+        matching = self._patterns.get(tags)
+        if matching is None:
+            pattern = MTEFileReader._compile_tags(tags)
+            matching = self._patterns[tags] = frozenset(i for (i, msd) in enumerate(self._msds)
+                                                        if pattern.match(msd))
+        return matching
+
+    def token_index(self):
+        """
+        Returns the positional index of the words, lemmas and msd tags of the
+        document. It is built on first use; for a document saved to or loaded
+        from a cache file it is persisted next to it (cache_path + '.idx') and
+        memory-mapped by later calls.
+
+        :rtype: MTETokenIndex
+        """
+        if self._token_index is None:
+            index = None
+            if self._cache_path is not None:
+                index_path = self._cache_path + '.idx'
+                stamp = MTETokenIndex._stamp(self._cache_path)
+                if os.path.exists(index_path):
+                    try:
+                        index = MTETokenIndex.load(index_path, stamp, len(self))
+                    except ValueError:
+                        pass
+                if index is None:
+                    index = MTETokenIndex.build(self)
+                    index.save(index_path, stamp, len(self))
+            self._token_index = index if index is not None else MTETokenIndex.build(self)
+        return self._token_index
+
+    def _value_id(self, field, value):
+        # the id of a word form or lemma in its string table, or None if the document does not contain it
+        ids = self._value_ids[field]
+        if ids is None:
+            table = self._words if field == MTETokenIndex.WORD else self._lemmas
+            ids = self._value_ids[field] = dict((v, i) for (i, v) in enumerate(table))
+        return ids.get(value)
+
+    def msd_positions(self, msd):
+        """
+        :param msd: A distinct msd tag of the document
+        :return: the sorted positions of all tokens tagged with msd
+        :rtype: array(int) or memoryview
+        """
+        try:
+            return self.token_index().positions(MTETokenIndex.MSD, self._msds.index(msd))
+        except ValueError:
+            return array('i')
+
+    def _matching_positions(self, matching):
+        index = self.token_index()
+        return heapq.merge(*[index.positions(MTETokenIndex.MSD, m) for m in sorted(matching)])
+
+    def query(self, word=None, lemma=None, tags=None):
+        """
+        Finds the tokens matching all of the given constraints. Only the positions
+        of the most selective constraint are visited, the others are checked
+        against the ids of these tokens.
+
+        :param word: A word form or a list of alternative word forms
+        :param lemma: A lemma or a list of alternative lemmas
+        :param tags: A msd tag pattern like the tags of tagged_words(), e.g. '#Nc' or '#V.m'
+        :return: the sorted positions of the matching tokens
+        :rtype: list(int)
+        """
+        constraints = []
+        for (field, values) in ((MTETokenIndex.WORD, word), (MTETokenIndex.LEMMA, lemma)):
+            if values is not None:
+                if isinstance(values, string_types):
+                    values = [values]
+                ids = [self._value_id(field, v) for v in values]
+                constraints.append((field, frozenset(i for i in ids if i is not None)))
+        matching = self._matching_msds(tags)
+        if matching is not None:
+            constraints.append((MTETokenIndex.MSD, matching))
+        if not constraints:
+            raise ValueError("No query constraint specified")
+
+        index = self.token_index()
+        field, ids = min(constraints, key=lambda c: sum(index.count(c[0], i) for i in c[1]))
+        if len(ids) == 1:
+            candidates = index.positions(field, next(iter(ids)))
+        else:
+            candidates = heapq.merge(*[index.positions(field, i) for i in sorted(ids)])
+        checks = [((self._word_ids, self._lemma_ids, self._msd_ids)[f], s) for (f, s) in constraints if f != field]
+        return [t for t in candidates if all(field_ids[t] in s for (field_ids, s) in checks)]
+
+    def concordance(self, word=None, lemma=None, tags=None, context=5, fileid=None):
+        """
+        Yields a keyword in context line for every token found by query(). The
+        context is limited to the sentence of the keyword, punctuation marks in
+        it are tagged with None.
+
+        :param context: The maximal number of tokens left and right of the keyword
+        :param fileid: The fileid the lines are labeled with
+        :rtype: iter(MTEConcordanceLine)
+        """
+        words, lemmas, msds = self._words, self._lemmas, self._msds
+        word_ids, lemma_ids, msd_ids = self._word_ids, self._lemma_ids, self._msd_ids
+        offsets = self._sent_offsets
+
+        def tagged(start, stop):
+            return [(_decode(words, word_ids[t]), _decode(msds, msd_ids[t])) for t in range(start, stop)]
+
+        current = 0
+        for t in self.query(word, lemma, tags):
+            current = bisect_right(offsets, t, current) - 1
+            start, stop = offsets[current], offsets[current + 1]
+            if msd_ids[t] >= 0:
+                keyword = (_decode(words, word_ids[t]), _decode(lemmas, lemma_ids[t]), msds[msd_ids[t]])
+            else:
+                keyword = (_decode(words, word_ids[t]), None, None)
+            yield MTEConcordanceLine(fileid, self._sent_ids[current], t, tagged(max(start, t - context), t),
+                                     keyword, tagged(t + 1, min(stop, t + 1 + context)))
+
+    def _iter_matching_sents(self, matching):
+        # groups the positions of all matching tokens by sentence, so only the
+        # matches are visited instead of every token of the document
+        words, msds, word_ids, msd_ids = self._words, self._msds, self._word_ids, self._msd_ids
+        offsets = self._sent_offsets
+        sent, current = None, 0
+        for t in self._matching_positions(matching):
+            if sent is None or t >= offsets[current + 1]:
+                if sent is not None:
+                    yield current, sent
+                sent, current = [], bisect_right(offsets, t, current) - 1
+            sent.append((_decode(words, word_ids[t]), msds[msd_ids[t]]))
+        if sent is not None:
+            yield current, sent
+
+    def _sent_tokens(self, i):
+        return range(*self.sent_bounds(i))
+
+    def _tagged_sent(self, i, matching):
+        words, msds, word_ids, msd_ids = self._words, self._msds, self._word_ids, self._msd_ids
+        return [(_decode(words, word_ids[t]), msds[msd_ids[t]]) for t in self._sent_tokens(i)
+                if msd_ids[t] >= 0 and (matching is None or msd_ids[t] in matching)]
+
+    def _lemma_sent(self, i):
+        words, lemmas, word_ids, lemma_ids = self._words, self._lemmas, self._word_ids, self._lemma_ids
+        return [(_decode(words, word_ids[t]), _decode(lemmas, lemma_ids[t])) for t in self._sent_tokens(i)
+                if self._msd_ids[t] >= 0]
+
+    def _sent(self, i):
+        words, word_ids = self._words, self._word_ids
+        return [_decode(words, word_ids[t]) for t in self._sent_tokens(i)]
+
+    def _para_sents(self, i):
+        return range(*self.para_bounds(i))
+
+    def iter_words(self):
+        words = self._words
+        for w in self._word_ids:
+            yield _decode(words, w)
+
+    def iter_sents(self):
+        for i in range(self.sent_count()):
+            yield self._sent(i)
+
+    def iter_paras(self):
+        for i in range(self.para_count()):
+            yield [self._sent(s) for s in self._para_sents(i)]
+
+    def iter_lemma_words(self):
+        for i in range(self.sent_count()):
+            for lemma_word in self._lemma_sent(i):
+                yield lemma_word
+
+    def iter_tagged_words(self, tags=""):
+        matching = self._matching_msds(tags)
+        if matching is not None:
+            words, msds, word_ids, msd_ids = self._words, self._msds, self._word_ids, self._msd_ids
+            for t in self._matching_positions(matching):
+                yield (_decode(words, word_ids[t]), msds[msd_ids[t]])
+            return
+        for i in range(self.sent_count()):
+            for tagged in self._tagged_sent(i, None):
+                yield tagged
+
+    def iter_lemma_sents(self):
+        for i in range(self.sent_count()):
+            yield self._lemma_sent(i)
+
+    def iter_tagged_sents(self, tags=""):
+        matching = self._matching_msds(tags)
+        if matching is not None:
+            for (_, sent) in self._iter_matching_sents(matching):
+                yield sent
+            return
+        for i in range(self.sent_count()):
+            tagged = self._tagged_sent(i, matching)
+            if len(tagged) > 0:
+                yield tagged
+
+    def iter_sent_ids(self):
+        for xml_id in self._sent_ids:
+            if xml_id:
+                yield xml_id
+
+    def iter_tagged_sents_with_ids(self):
+        for i in range(self.sent_count()):
+            if self._sent_ids[i]:
+                yield self._sent_ids[i], self._tagged_sent(i, None)
+
+    def iter_lemma_paras(self):
+        for i in range(self.para_count()):
+            yield [self._lemma_sent(s) for s in self._para_sents(i)]
+
+    def iter_tagged_paras(self, tags=""):
+        matching = self._matching_msds(tags)
+        if matching is not None:
+            para, current = None, 0
+            for (i, sent) in self._iter_matching_sents(matching):
+                if para is None or i >= self._para_offsets[current + 1]:
+                    if para is not None:
+                        yield para
+                    para, current = [], bisect_right(self._para_offsets, i, current) - 1
+                    if current >= self.para_count():
+                        # sentences behind the last paragraph do not belong to any paragraph
+                        para = None
+                        break
+                para.append(sent)
+            if para is not None:
+                yield para
+            return
+        for i in range(self.para_count()):
+            para = self._tagged_para(i)
+            if len(para) > 0:
+                yield para
+
+
+class MTEChunkError(ValueError):
+    """
+    A chunk of a file that is split up for parallel parsing is not well-formed on its own.
+    """
+
+
+def _parse_chunk(file_path, start, end, prefix, piece_size=1 << 20):
+    """
+    Parses the bytes start to end of a file, which are preceded by prefix, see
+    MTEFileReader._split_chunks(). This is the task executed by the worker
+    processes of the parallel parser, it returns the items of the chunk. A syntax
+    error is raised as MTEChunkError, as the errors of lxml cannot be pickled.
+    """
+    try:
+        return _parse_chunk_events(file_path, start, end, prefix, piece_size)
+    except (etree.XMLSyntaxError if lxmlAvailable else etree.ParseError) as e:
+        # the line and column are counted from the start of the prefixed chunk
+        raise MTEChunkError("%s: the chunk at byte %d cannot be parsed on its own: %s" % (file_path, start, e))
+
+
+def _parse_chunk_events(file_path, start, end, prefix, piece_size):
+    parser = etree.XMLPullParser(events=('start', 'end'))
+    parser.feed(prefix)
+
+    def events():
+        with open(file_path, 'rb') as f:
+            f.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                piece = f.read(min(piece_size, remaining))
+                if not piece:
+                    break
+                remaining -= len(piece)
+                parser.feed(piece)
+                for event in parser.read_events():
+                    yield event
+
+    return list(MTEFileReader._parse_events(events()))
+
+
+def _next_batch(items, size):
+    """
+    Reads the next batch of items from a generator, this is the task executed by
+    the executor of the async methods of MTECorpusReader.
+    """
+    return list(islice(items, size))
+
+
+def _load_document(path, cache_path=None, workers=None):
+    """
+    Loads a single MTEDocument, this is the task executed by the worker processes
+    of the parallel loader.
+    """
+    if cache_path is None:
+        return MTEDocument.compile(path, workers)
+    return MTEDocument.cached(path, cache_path, workers)
+
+
+MTECacheInfo = namedtuple('MTECacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'maxbytes',
+                                           'currsize', 'currbytes'])
+
+
+class MTEDocumentCache(object):
+    """
+    Thread-safe LRU cache of MTEDocuments keyed by fileid. It is bounded by the
+    number of documents, by their approximate size in bytes or by both; a document
+    that alone exceeds maxbytes is not kept at all.
+    """
+
+    def __init__(self, maxsize=None, maxbytes=None):
+        """
+        :param maxsize: maximal number of cached documents, None for no limit
+        :param maxbytes: maximal approximate size of all cached documents, None for no limit
+        """
+        self._maxsize = maxsize
+        self._maxbytes = maxbytes
+        self._documents = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = self._misses = self._evictions = 0
+
+    def get(self, fileid, load):
+        """
+        Returns the cached document for fileid, on a miss it is created by calling load().
+        """
+        with self._lock:
+            entry = self._documents.get(fileid)
+            if entry is not None:
+                self._documents.move_to_end(fileid)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+
+        # loading is done without holding the lock, so other files can be served meanwhile
+        document = load()
+        size = document.nbytes()
+        with self._lock:
+            if fileid in self._documents:
+                self._bytes -= self._documents.pop(fileid)[1]
+            self._documents[fileid] = (document, size)
+            self._bytes += size
+            while self._documents and ((self._maxsize is not None and len(self._documents) > self._maxsize) or
+                                       (self._maxbytes is not None and self._bytes > self._maxbytes)):
+                self._bytes -= self._documents.popitem(last=False)[1][1]
+                self._evictions += 1
+        return document
+
+    def __contains__(self, fileid):
+        with self._lock:
+            return fileid in self._documents
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+            self._bytes = 0
+            self._hits = self._misses = self._evictions = 0
+
+    def info(self):
+        """
+        :return: hit, miss and eviction counters as well as the bounds and the current size of the cache
+        :rtype: MTECacheInfo
+        """
+        with self._lock:
+            return MTECacheInfo(self._hits, self._misses, self._evictions, self._maxsize, self._maxbytes,
+                                len(self._documents), self._bytes)
+
+
+class MTECorpusStatistics(object):
+    """
+    Basic statistics of tagged text, which are computed in a single pass: the
+    number of tokens (punctuation included), tagged words, sentences and
+    paragraphs, the frequencies of the word types and of the msd tags and the
+    ambiguity class of every word, which is the sorted tuple of the tags it
+    occurs with. The statistics of a file can be persisted in a sidecar file, so
+    they are computed only once.
+    """
+
+    _magic = b'MTES'
+    _version = 1
+
+    def __init__(self, token_count, tagged_count, sent_count, para_count, word_freq, tag_freq, ambiguity):
+        self.token_count = token_count
+        self.tagged_count = tagged_count
+        self.sent_count = sent_count
+        self.para_count = para_count
+        self.word_freq = word_freq
+        self.tag_freq = tag_freq
+        self.ambiguity = ambiguity
+
+    @classmethod
+    def _from_pairs(cls, pairs, token_count, sent_count, para_count):
+        # derives all frequencies from the counts of the distinct (word, tag) pairs
+        word_freq, tag_freq, ambiguity = Counter(), Counter(), {}
+        for ((word, tag), n) in pairs.items():
+            word_freq[word] += n
+            tag_freq[tag] += n
+            ambiguity.setdefault(word, []).append(tag)
+        ambiguity = dict((word, tuple(sorted(tags))) for (word, tags) in ambiguity.items())
+        return cls(token_count, sum(pairs.values()), sent_count, para_count, dict(word_freq), dict(tag_freq),
+                   ambiguity)
+
+    @classmethod
+    def compute(cls, file_path, workers=None):
+        """
+        Computes the statistics of an xml file in a single streaming pass, a large
+        file is parsed by the given number of worker processes.
+        """
+        pairs = Counter()
+        token_count = sent_count = para_count = 0
+        for (_, sent) in MTEFileReader._iterparse(file_path, workers):
+            if sent is None:
+                para_count += 1
+                continue
+            sent_count += 1
+            token_count += len(sent)
+            pairs.update((w, ana) for (w, ana, _) in sent if ana is not None)
+        return cls._from_pairs(pairs, token_count, sent_count, para_count)
+
+    @classmethod
+    def from_tagged_sents(cls, tagged_sents):
+        """
+        Computes the statistics of tagged sentences, e.g. of the training part of a
+        corpus. A CompactTaggedCorpus computes them from its ids instead. There are
+        no paragraphs and no punctuation marks, so para_count is 0 and token_count
+        equals tagged_count.
+
+        :param tagged_sents: Tagged sentences
+        :type tagged_sents: [[(word:str, tag:str)]] or CompactTaggedCorpus
+        :rtype: MTECorpusStatistics
+        """
+        if isinstance(tagged_sents, CompactTaggedCorpus):
+            return tagged_sents.statistics()
+        pairs = Counter()
+        sent_count = 0
+        for sent in tagged_sents:
+            sent_count += 1
+            pairs.update(sent)
+        return cls._from_pairs(pairs, sum(pairs.values()), sent_count, 0)
+
+    @classmethod
+    def merge(cls, statistics):
+        """
+        :param statistics: The statistics of several files
+        :return: the statistics of the files taken together
+        :rtype: MTECorpusStatistics
+        """
+        statistics = list(statistics)
+        if len(statistics) == 1:
+            return statistics[0]
+        word_freq, tag_freq, ambiguity = Counter(), Counter(), {}
+        for stats in statistics:
+            word_freq.update(stats.word_freq)
+            tag_freq.update(stats.tag_freq)
+            for (word, tags) in stats.ambiguity.items():
+                ambiguity[word] = tuple(sorted(set(ambiguity.get(word, ())) | set(tags)))
+        return cls(sum(s.token_count for s in statistics), sum(s.tagged_count for s in statistics),
+                   sum(s.sent_count for s in statistics), sum(s.para_count for s in statistics),
+                   dict(word_freq), dict(tag_freq), ambiguity)
+
+    @classmethod
+    def cached(cls, file_path, stats_path, workers=None):
+        """
+        Loads the statistics of the given xml file from stats_path, they are computed
+        and the sidecar file is (re)written if it is missing or stale. A sidecar that
+        cannot be written, e.g. in a read-only corpus directory, is skipped.
+        """
+        if os.path.exists(stats_path):
+            try:
+                return cls.load(stats_path, file_path)
+            except ValueError:
+                pass
+        stamp = MTEDocument._stamp(file_path)
+        statistics = cls.compute(file_path, workers)
+        try:
+            statistics.save(stats_path, stamp)
+        except EnvironmentError:
+            pass
+        return statistics
+
+    def save(self, stats_path, stamp):
+        """
+        Writes the statistics to a sidecar file.
+
+        :param stats_path: The path of the sidecar file
+        :param stamp: The stamp of the xml file as returned by MTEDocument._stamp
+        """
+        directory = os.path.dirname(stats_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        tmp_path = '%s.%d.tmp' % (stats_path, os.getpid())
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((self._magic, self._version, stamp, self.__dict__), f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, stats_path)
+
+    @classmethod
+    def load(cls, stats_path, file_path):
+        """
+        Loads a sidecar file written by save(). A ValueError is raised if the file
+        is invalid or does not belong to the current content of file_path.
+        """
+        try:
+            with open(stats_path, 'rb') as f:
+                magic, version, (size, mtime, sha1), state = pickle.load(f)
+        except Exception:
+            raise ValueError("Invalid statistics file %s" % stats_path)
+        if magic != cls._magic or version != cls._version:
+            raise ValueError("Invalid statistics file %s" % stats_path)
+        current = MTEDocument._stamp(file_path, with_hash=False)
+        if current[0] != size or (current[1] != mtime and MTEDocument._stamp(file_path)[2] != sha1):
+            raise ValueError("Stale statistics file %s" % stats_path)
+        statistics = cls.__new__(cls)
+        statistics.__dict__.update(state)
+        return statistics
+
+    def vocabulary(self):
+        """
+        :return: the distinct words
+        :rtype: set-like view of str
+        """
+        return self.word_freq.keys()
 
+    def oov_count(self, vocabulary):
+        """
+        :param vocabulary: The known words, e.g. the vocabulary() of the training data
+        :return: the number of tagged words that are not part of the vocabulary
+        :rtype: int
+        """
+        return sum(n for (word, n) in self.word_freq.items() if word not in vocabulary)
 
-class MTEFileReader:
+    def ambiguous_words(self):
+        """
+        :return: the words that occur with more than one tag
+        :rtype: list(str)
+        """
+        return [word for (word, tags) in self.ambiguity.items() if len(tags) > 1]
+
+    def __repr__(self):
+        return '<MTECorpusStatistics: %d tokens, %d sentences, %d paragraphs, %d word types, %d tags>' % (
+            self.token_count, self.sent_count, self.para_count, len(self.word_freq), len(self.tag_freq))
+
+
+class CompactTaggedCorpus(AbstractLazySequence):
     """
-    Class for loading the content of the multext-east corpus. It
-    parses the xml files and does some tag-filtering depending on the
-    given method parameters.
+    Memory efficient representation of tagged sentences. Words and tags are interned
+    in two tables, the tokens are stored as two integer arrays of word and tag ids
+    and every sentence is a range of these arrays given by its start and end offset.
+    The corpus behaves like a list of sentences, which are lists of (word, tag)
+    tuples. Slices and selections of sentences share the tables and token arrays
+    instead of copying them.
+
+    A corpus can also be a projection into another tagset. Such a corpus shares
+    all arrays with the corpus it is projected from and only adds a mapping table
+    from the original tag ids to the ids of the converted tags, which is applied
+    when the sentences are accessed.
     """
-    ns = {'tei': 'http://www.tei-c.org/ns/1.0', 'xml': 'http://www.w3.org/XML/1998/namespace'}
-    tag_ns = '{http://www.tei-c.org/ns/1.0}'
-    xml_ns = '{http://www.w3.org/XML/1998/namespace}'
 
-    def __init__(self, file_path):
-        tree = etree.parse(file_path)
-        self.__root = xpath(tree.getroot(), './tei:text/tei:body', self.ns)[0]
+    def __init__(self, words, tags, word_ids, tag_ids, starts, ends, tag_map=None):
+        self._words = words
+        self._tags = tags
+        self._word_ids = word_ids
+        self._tag_ids = tag_ids
+        self._starts = starts
+        self._ends = ends
+        self._tag_map = tag_map
 
     @classmethod
-    def _words(self, text_root):
-        return [w.text for w in xpath(text_root, './/*', self.ns) if
-                w.tag == self.tag_ns + "w" or w.tag == self.tag_ns + "c"]
+    def from_tagged_sents(cls, tagged_sents):
+        """
+        Creates a compact corpus from any iterable of tagged sentences, the sentences
+        are consumed one by one, so they do not have to be held in memory.
 
-    @classmethod
-    def _sents(self, text_root):
-        return [MTEFileReader._words(s) for s in xpath(text_root, './/tei:s', self.ns)]
+        :param tagged_sents: Tagged sentences
+        :type tagged_sents: [[(word:str, tag:str)]]
+        :rtype: CompactTaggedCorpus
+        """
+        word_table, tag_table = {}, {}
+        word_ids, tag_ids, starts, ends = array('i'), array('i'), array('i'), array('i')
+        for sent in tagged_sents:
+            starts.append(len(word_ids))
+            for (word, tag) in sent:
+                word_ids.append(word_table.setdefault(word, len(word_table)))
+                tag_ids.append(tag_table.setdefault(tag, len(tag_table)))
+            ends.append(len(word_ids))
+        return cls(sorted(word_table, key=word_table.get), sorted(tag_table, key=tag_table.get),
+                   word_ids, tag_ids, starts, ends)
 
-    @classmethod
-    def _paras(self, text_root):
-        return [MTEFileReader._sents(p) for p in xpath(text_root, './/tei:p', self.ns)]
+    def __len__(self):
+        return len(self._starts)
 
-    @classmethod
-    def _lemma_words(self, text_root):
-        return [(w.text, w.attrib['lemma']) for w in xpath(text_root, './/tei:w', self.ns)]
+    def _sent(self, i):
+        words, tags, word_ids, tag_ids = self._words, self._tags, self._word_ids, self._tag_ids
+        if self._tag_map is not None:
+            tag_map = self._tag_map
+            return [(words[word_ids[t]], tags[tag_map[tag_ids[t]]]) for t in range(self._starts[i], self._ends[i])]
+        return [(words[word_ids[t]], tags[tag_ids[t]]) for t in range(self._starts[i], self._ends[i])]
 
-    @classmethod
-    def _tagged_words(self, text_root, tags=""):
-        if tags is None or tags == "":
-            return [(w.text, w.attrib['ana']) for w in xpath(text_root, './/tei:w', self.ns)]
+    def iterate_from(self, start):
+        for i in range(max(0, start), len(self)):
+            yield self._sent(i)
 
-        else:
-            tags = re.compile('^' + re.sub("-",".",tags) + '.*$')
-            return [(w.text, w.attrib['ana']) for w in xpath(text_root, './/tei:w', self.ns)
-                                              if tags.match(w.attrib['ana'])]
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+            if step != 1:
+                return self.select(range(start, stop, step))
+            return self.__class__(self._words, self._tags, self._word_ids, self._tag_ids,
+                                  memoryview(self._starts)[start:stop], memoryview(self._ends)[start:stop],
+                                  self._tag_map)
+        return self._sent(i)
 
-    @classmethod
-    def _lemma_sents(self, text_root):
-        return [MTEFileReader._lemma_words(s) for s in xpath(text_root, './/tei:s', self.ns)]
+    def select(self, indices):
+        """
+        :param indices: The positions of the sentences that should be selected, in the order given
+        :return: a corpus of the selected sentences, only their offsets are copied
+        :rtype: CompactTaggedCorpus
+        """
+        starts, ends = self._starts, self._ends
+        return self.__class__(self._words, self._tags, self._word_ids, self._tag_ids,
+                              array('i', [starts[i] for i in indices]), array('i', [ends[i] for i in indices]),
+                              self._tag_map)
 
-    @classmethod
-    def _tagged_sents(self, text_root, tags=""):
-        # double list comprehension to remove empty sentences in case there is a sentence only containing punctuation marks
-        return [t for t in [MTEFileReader._tagged_words(s, tags) for s in xpath(text_root, './/tei:s', self.ns)] if len(t) > 0]
+    def project_tags(self, conversion=None):
+        """
+        Creates a view of the corpus in another tagset. Only the table of distinct
+        tags is converted, the words, the token arrays and the sentence offsets are
+        shared with this corpus, so the view costs no more memory than the mapping
+        table. The tags are converted when the sentences are accessed.
 
-    @classmethod
-    def _lemma_paras(self, text_root):
-        return [MTEFileReader._lemma_sents(p) for p in xpath(text_root, './/tei:p', self.ns)]
+        :param conversion: Function converting a single tag (default is MTETagConverter.msd_to_universal)
+        :rtype: CompactTaggedCorpus
+        """
+        tags, tag_map = MTETagConverter.tag_mapping(self._tags, conversion)
+        if self._tag_map is not None:
+            tag_map = array('i', [tag_map[i] for i in self._tag_map])
+        return self.__class__(self._words, tags, self._word_ids, self._tag_ids, self._starts, self._ends, tag_map)
 
-    @classmethod
-    def _tagged_paras(self, text_root, tags=""):
-        return [t for t in [MTEFileReader._tagged_sents(p, tags) for p in xpath(text_root, './/tei:p', self.ns)] if len(t) > 0]
+    def convert_tags(self, conversion=None):
+        """
+        Converts the tags of the corpus in bulk with MTETagConverter.convert_tag_ids,
+        the words and the sentence offsets are shared with the new corpus. Unlike
+        project_tags() the tag ids are copied, so the original ids can be dropped.
 
+        :param conversion: Function converting a single tag (default is MTETagConverter.msd_to_universal)
+        :rtype: CompactTaggedCorpus
+        """
+        if self._tag_map is not None:
+            tag_ids = array('i', [self._tag_map[i] for i in self._tag_ids])
+        else:
+            tag_ids = self._tag_ids
+        tags, tag_ids = MTETagConverter.convert_tag_ids(self._tags, tag_ids, conversion)
+        return self.__class__(self._words, tags, self._word_ids, tag_ids, self._starts, self._ends)
 
     def words(self):
-        return MTEFileReader._words(self.__root)
+        """
+        :return: the table of distinct words, which may contain words of sentences
+                 that are not part of this slice or selection
+        :rtype: list(str)
+        """
+        return self._words
 
-    def sents(self):
-        return MTEFileReader._sents(self.__root)
+    def tags(self):
+        """
+        :return: the table of distinct tags, which may contain tags of sentences
+                 that are not part of this slice or selection
+        :rtype: list(str)
+        """
+        return self._tags
 
-    def paras(self):
-        return MTEFileReader._paras(self.__root)
+    def token_count(self):
+        return sum(e - s for (s, e) in zip(self._starts, self._ends))
 
-    def lemma_words(self):
-        return MTEFileReader._lemma_words(self.__root)
+    def token_positions(self):
+        """
+        :return: the positions of the tokens of all sentences in the token arrays, which
+                 are shared by all slices, selections and tag projections of a corpus
+        :rtype: array(int)
+        """
+        starts, ends = self._starts, self._ends
+        if numpyAvailable:
+            starts = numpy.frombuffer(starts, dtype=numpy.int32)
+            lengths = numpy.frombuffer(ends, dtype=numpy.int32) - starts
+            # the positions of the tokens of every sentence are consecutive
+            index = numpy.arange(lengths.sum()) + numpy.repeat(starts - numpy.cumsum(lengths) + lengths, lengths)
+            return array('i', index.astype(numpy.int32).tobytes())
+        return array('i', [t for (s, e) in zip(starts, ends) for t in range(s, e)])
 
-    def tagged_words(self, tags=""):
-        return MTEFileReader._tagged_words(self.__root, tags)
+    def token_ids(self):
+        """
+        :return: the word and tag ids of the tokens of all sentences in their order and
+                 the length of every sentence, the ids refer to words() and tags()
+        :rtype: tuple(array(int), array(int), array(int))
+        """
+        index = self.token_positions()
+        if numpyAvailable:
+            index = numpy.frombuffer(index, dtype=numpy.int32)
+            word_ids = numpy.frombuffer(self._word_ids, dtype=numpy.int32)[index]
+            tag_ids = numpy.frombuffer(self._tag_ids, dtype=numpy.int32)[index]
+            if self._tag_map is not None:
+                tag_ids = numpy.asarray(self._tag_map, dtype=numpy.int32)[tag_ids]
+            lengths = (numpy.frombuffer(self._ends, dtype=numpy.int32) -
+                       numpy.frombuffer(self._starts, dtype=numpy.int32))
+            return (array('i', word_ids.tobytes()), array('i', tag_ids.tobytes()),
+                    array('i', lengths.tobytes()))
 
-    def lemma_sents(self):
-        return MTEFileReader._lemma_sents(self.__root)
+        tag_ids = array('i', [self._tag_ids[t] for t in index])
+        if self._tag_map is not None:
+            tag_ids = array('i', [self._tag_map[i] for i in tag_ids])
+        return (array('i', [self._word_ids[t] for t in index]), tag_ids,
+                array('i', [e - s for (s, e) in zip(self._starts, self._ends)]))
 
-    def tagged_sents(self, tags=""):
-        return MTEFileReader._tagged_sents(self.__root)
+    def statistics(self):
+        """
+        Computes the MTECorpusStatistics of the sentences of this corpus, the
+        (word, tag) pairs are counted by their ids and only the distinct pairs
+        are resolved to strings.
 
-    def lemma_paras(self):
-        return MTEFileReader._lemma_paras(self.__root)
+        :rtype: MTECorpusStatistics
+        """
+        word_ids, tag_ids = self._word_ids, self._tag_ids
+        id_pairs = Counter((word_ids[t], tag_ids[t]) for (s, e) in zip(self._starts, self._ends)
+                           for t in range(s, e))
+        words, tags, tag_map = self._words, self._tags, self._tag_map
+        pairs = Counter()
+        for ((w, t), n) in id_pairs.items():
+            pairs[(words[w], tags[t if tag_map is None else tag_map[t]])] += n
+        return MTECorpusStatistics._from_pairs(pairs, sum(pairs.values()), len(self), 0)
 
-    def tagged_paras(self, tags=""):
-        return MTEFileReader._tagged_paras(self.__root)
+    def nbytes(self):
+        """
+        :return: the approximate memory size of the corpus in bytes, shared tables and arrays included
+        :rtype: int
+        """
+        arrays = (self._word_ids, self._tag_ids, self._starts, self._ends, self._tag_map or ())
+        size = sum(len(a) * 4 for a in arrays)
+        return size + sum(sys.getsizeof(v) for t in (self._words, self._tags) for v in t)
 
-class MTETagConverter:
+    def __reduce__(self):
+        arrays = [a if isinstance(a, array) else array('i', a.tobytes()) for a in
+                  (self._word_ids, self._tag_ids, self._starts, self._ends)]
+        return self.__class__, (self._words, self._tags) + tuple(arrays) + (self._tag_map,)
+
+
+class MTECorpusView(AbstractLazySequence):
     """
-    Class for converting msd tags to universal tags, more conversion
-    options are currently not implemented.
+    Lazy view of the content of a single MTE file. The items are produced by one
+    of the streaming iter_* methods of MTEFileReader, so the file is not parsed
+    before its items are touched. The view supports len(), indexing and slicing,
+    a suspended iteration is kept, so sequential accesses continue parsing where
+    the previous one stopped instead of starting over.
     """
 
-    mapping_msd_universal = {
-        'A': 'ADJ', 'S': 'ADP', 'R': 'ADV', 'C': 'CONJ',
-        'D': 'DET', 'N': 'NOUN', 'M': 'NUM', 'Q': 'PRT',
-        'P': 'PRON', 'V': 'VERB', '.': '.', '-': 'X'}
-
-    @staticmethod
-    def msd_to_universal(tag):
+    def __init__(self, fileid, iterator, convert=None):
         """
-        This function converts the annotation from the Multex-East to the universal tagset
-        as described in Chapter 5 of the NLTK-Book
-
-        Unknown Tags will be mapped to X. Punctuation marks are not supported in MSD tags, so
+        :param fileid: The path of the file this view belongs to
+        :param iterator: A function returning a new generator over the items of the file
+        :param convert: An optional function that is applied to every item
         """
-        indicator = tag[0] if not tag[0] == "#" else tag[1]
+        self._fileid = fileid
+        self._iterator = iterator
+        self._convert = convert
+        self._len = None
+        self._cursor = None
 
-        if not indicator in MTETagConverter.mapping_msd_universal:
-            indicator = '-'
+    def __len__(self):
+        if self._len is None:
+            for _ in self.iterate_from(self._cursor[0] if self._cursor else 0):
+                pass
+        return self._len
+
+    def iterate_from(self, start):
+        cursor, self._cursor = self._cursor, None
+        if cursor is None or cursor[0] > start:
+            cursor = (0, self._iterator())
+        pos, items = cursor
+        try:
+            for item in items:
+                pos += 1
+                if pos > start:
+                    yield item if self._convert is None else self._convert(item)
+            self._len = pos
+            pos = None
+        finally:
+            # remember where the iteration stopped, so it can be resumed
+            if pos is not None:
+                self._cursor = (pos, items)
+
+    def close(self):
+        """
+        Drops a suspended iteration, which closes the underlying file.
+        """
+        self._cursor = None
 
-        return MTETagConverter.mapping_msd_universal[indicator]
 
 class MTECorpusReader(TaggedCorpusReader):
     """
@@ -144,7 +2106,9 @@ class MTECorpusReader(TaggedCorpusReader):
     scheme. These tags can be converted to the Universal tagset
     """
 
-    def __init__(self, root=None, fileids=None, encoding='utf8'):
+    def __init__(self, root=None, fileids=None, encoding='utf8', cache_dir=None,
+                 document_cache_size=0, document_cache_bytes=None, workers=None, executor=None,
+                 parse_workers=None):
         """
         Construct a new MTECorpusreader for a set of documents
         located at the given root directory.  Example usage:
@@ -153,18 +2117,56 @@ class MTECorpusReader(TaggedCorpusReader):
             >>> reader = MTECorpusReader(root, 'oana-*.xml', 'utf8') # doctest: +SKIP
 
         :param root: The root directory for this corpus. (default points to location in multext config file)
+                     It can also be the zip archive of the corpus (e.g. 'mte_teip5.zip' or
+                     'mte_teip5.zip/MTE1984-ana/') or a single gzip or xz compressed TEI file,
+                     their content is decompressed while it is parsed.
         :param fileids: A list or regexp specifying the fileids in this corpus. (default is oana-en.xml)
+                        Files inside the root directory may be compressed (e.g. oana-en.xml.gz).
         :param enconding: The encoding of the given files (default is utf8)
+        :param cache_dir: Directory for binary parse caches of the xml files. Each file is
+                          compiled once into a cache file, which is memory-mapped on later
+                          reads instead of parsing the xml again. (default is no caching)
+        :param document_cache_size: Number of parsed documents that are kept in memory and shared
+                                    by all accessors, None for no limit. (default is 0, every
+                                    access streams the file again)
+        :param document_cache_bytes: Approximate memory limit of the kept documents in bytes,
+                                     can be combined with document_cache_size. (default is no limit)
+        :param workers: Number of worker processes used to parse several files in parallel.
+                        Accessors spanning more than one file then load all of them up front.
+                        (default is None, files are parsed serially on access)
+        :param executor: The thread based executor the async methods parse the files in
+                         (default is a thread pool created on first use)
+        :param parse_workers: Number of worker processes a single large file is split up
+                              and parsed with. Files that are loaded by the workers of
+                              the parallel loader are parsed serially.
+                              (default is None, every file is parsed by a single process)
         """
+        if isinstance(root, string_types) and root.endswith(('.gz', '.xz')) and os.path.isfile(root):
+            # a single compressed file is read as the only file of its directory
+            root, fileids = os.path.split(os.path.abspath(root))[0], [os.path.basename(root)]
         TaggedCorpusReader.__init__(self, root, fileids, encoding)
+        self._cache_dir = cache_dir
+        self._workers = workers
+        self._executor = executor
+        self._parse_workers = parse_workers
+        self._document_cache = None
+        if document_cache_size != 0:
+            self._document_cache = MTEDocumentCache(document_cache_size, document_cache_bytes)
+        # without a document cache the document of the last file accessed by the random access
+        # methods is kept here, so repeated lookups in a file do not load it again while a search
+        # over several files holds only one of them at a time
+        self._lookup_cache = MTEDocumentCache(1)
+        # the statistics of the files, if there is no cache directory to persist them in
+        self._statistics = {}
 
     def __fileids(self, fileids):
         if fileids is None: fileids = self._fileids
-        elif isinstance(fileids, compat.string_types): fileids = [fileids]
+        elif isinstance(fileids, string_types): fileids = [fileids]
         # filter wrong userinput
-        fileids = filter(lambda x : x in self._fileids, fileids)
+        fileids = list(filter(lambda x : x in self._fileids, fileids))
         # filter multext-east sourcefiles that are not compatible to the teip5 specification
-        fileids = filter(lambda x : x not in ["oana-bg.xml", "oana-mk.xml"], fileids)
+        fileids = list(filter(lambda x : re.sub(r'\.(gz|xz)$', '', os.path.basename(x))
+                                         not in ["oana-bg.xml", "oana-mk.xml"], fileids))
         if not fileids:
             print("No valid multext-east file specified")
         return fileids
@@ -185,13 +2187,235 @@ class MTECorpusReader(TaggedCorpusReader):
         """
         return concat([self.open(f).read() for f in self.__fileids(fileids)])
 
+    def _document_source(self, fileid):
+        """
+        Returns the object the items of the given file are read from. That is an
+        MTEDocument if a cache directory or the in-memory document cache is
+        configured, or else a streaming MTEFileReader. Both provide the same
+        iter_* methods.
+        """
+        if self._document_cache is not None:
+            return self._document_cache.get(fileid, partial(self._load_document, fileid))
+        if self._cache_dir is None:
+            return MTEFileReader(self.__source_path(fileid), self._parse_workers)
+        return self._load_document(fileid)
+
+    def __source_path(self, fileid):
+        # the path of the file, members of a zip archive are addressed as archive.zip/member
+        if isinstance(self._root, ZipFilePathPointer):
+            pointer = self._root.join(fileid)
+            return '%s/%s' % (pointer.zipfile.filename, pointer.entry)
+        return os.path.join(self._root, fileid)
+
+    def __document_paths(self, fileid):
+        if self._cache_dir is None:
+            return self.__source_path(fileid), None
+        return self.__source_path(fileid), os.path.join(self._cache_dir, fileid + '.cache')
+
+    def _load_document(self, fileid):
+        return _load_document(*self.__document_paths(fileid), workers=self._parse_workers)
+
+    def documents(self, fileids=None, workers=None):
+        """
+        Loads the given file(s) as MTEDocuments. If more than one file has to be
+        parsed they are distributed over a pool of worker processes, otherwise
+        they are loaded serially. Documents already held by the document cache
+        are not parsed again and loaded documents are added to it.
+
+        :param fileids: A list specifying the fileids that should be used.
+        :param workers: Number of worker processes (default is the value given to the constructor)
+        :return: the documents in the order of the fileids
+        :rtype: list(MTEDocument)
+        """
+        fileids = self.__fileids(fileids)
+        workers = self._workers if workers is None else workers
+        cache = self._document_cache
+        missing = [f for f in fileids if cache is None or f not in cache]
+
+        loaded = {}
+        if workers is not None and workers > 1 and len(missing) > 1:
+            paths = [self.__document_paths(f) for f in missing]
+            with ProcessPoolExecutor(max_workers=min(workers, len(missing))) as executor:
+                loaded = dict(zip(missing, executor.map(_load_document, *zip(*paths))))
+
+        if cache is None:
+            return [loaded[f] if f in loaded else self._load_document(f) for f in fileids]
+        return [cache.get(f, partial(loaded.get, f) if f in loaded else partial(self._load_document, f))
+                for f in fileids]
+
+    def __statistics(self, fileid):
+        # the sidecar is stored in the cache directory, without one the corpus directory
+        # is left untouched and the statistics are only kept by this reader
+        if self._cache_dir is not None:
+            return MTECorpusStatistics.cached(self.__source_path(fileid),
+                                              os.path.join(self._cache_dir, fileid + '.stats'), self._parse_workers)
+        statistics = self._statistics.get(fileid)
+        if statistics is None:
+            statistics = self._statistics[fileid] = MTECorpusStatistics.compute(self.__source_path(fileid),
+                                                                                self._parse_workers)
+        return statistics
+
+    def statistics(self, fileids=None):
+        """
+        Returns the token, sentence and paragraph counts, the word type and msd tag
+        frequencies and the ambiguity classes of the given file(s). They are computed
+        in a single pass over each file and kept in memory, with a cache directory
+        they are persisted in a sidecar file (fileid.stats) there and later calls,
+        also of other readers, only load it.
+
+	    :param fileids: A list specifying the fileids that should be used.
+        :return: the statistics of the file(s) taken together
+        :rtype: MTECorpusStatistics
+        """
+        fileids = self.__fileids(fileids)
+        return MTECorpusStatistics.merge(self.__statistics(f) for f in fileids)
+
+    def concordance(self, word=None, lemma=None, tags=None, context=5, fileids=None, tagset="msd", limit=None):
+        """
+        Finds all tokens matching the given word forms, lemmas and msd tag pattern
+        and returns them together with their context. The queries are answered by
+        the positional index of each file (see MTEDocument.token_index()), which is
+        persisted in the cache directory if one is configured. The files are loaded
+        lazily and kept like those of tagged_sent(), so later queries only take
+        milliseconds.
+
+            >>> reader.concordance(lemma='house', tags='#Nc', context=3) # doctest: +SKIP
+
+        :param word: A word form or a list of alternative word forms
+        :param lemma: A lemma or a list of alternative lemmas
+        :param tags: A msd tag pattern, e.g. '#Nc' or '#V.m'. It always refers to msd tags.
+        :param context: The maximal number of tokens left and right of the keyword within its sentence
+	    :param fileids: A list specifying the fileids that should be used.
+        :param tagset: The tagset of the returned tags (default is msd)
+        :param limit: The maximal number of returned lines (default is no limit)
+        :return: the (fileid, sent_id, position, left, keyword, right) lines in the order of the
+                 files and positions, keyword is (word, lemma, tag), left and right are lists of
+                 (word, tag) and punctuation marks are tagged with None
+        :rtype: list(MTEConcordanceLine)
+        """
+        conversion = self.__conversion(tagset)
+        if conversion is False:
+            return []
+        fileids = self.__fileids(fileids)
+
+        def convert(tokens):
+            return [(w, None if t is None else conversion(t)) for (w, t) in tokens]
+
+        # the files are loaded one by one, so no file is loaded once the limit is reached
+        lines = []
+        for fileid in fileids:
+            if limit is not None and len(lines) >= limit:
+                break
+            document = self.__document(fileid)
+            remaining = None if limit is None else limit - len(lines)
+            for line in islice(document.concordance(word, lemma, tags, context, fileid), remaining):
+                if conversion is not None:
+                    w, l, t = line.keyword
+                    line = line._replace(left=convert(line.left), right=convert(line.right),
+                                         keyword=(w, l, None if t is None else conversion(t)))
+                lines.append(line)
+        return lines
+
+    def export_conllu(self, target_dir, fileids=None):
+        """
+        Exports the given file(s) to the CoNLL-U format, see write_conllu(). The
+        exported files keep all words, lemmas, msd tags, sentences, paragraphs and
+        xml:ids and can be read by MTEConllCorpusReader with the same methods as
+        this reader, which is several times faster than parsing the xml files.
+
+        :param target_dir: The directory the files are written to
+	    :param fileids: A list specifying the fileids that should be used.
+        :return: the paths of the written files, e.g. oana-en.conllu for oana-en.xml
+        :rtype: list(str)
+        """
+        paths = []
+        for fileid in self.__fileids(fileids):
+            path = os.path.join(target_dir, re.sub(r'\.xml(\.gz|\.xz)?$', '', fileid) + '.conllu')
+            directory = os.path.dirname(path)
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+            tmp_path = '%s.%d.tmp' % (path, os.getpid())
+            with io.open(tmp_path, 'w', encoding='utf8', newline='\n') as stream:
+                write_conllu(MTEFileReader._iterparse(self.__source_path(fileid), self._parse_workers), stream)
+            os.replace(tmp_path, path)
+            paths.append(path)
+        return paths
+
+    def cache_info(self):
+        """
+        :return: the statistics of the in-memory document cache, or None if it is disabled
+        :rtype: MTECacheInfo
+        """
+        if self._document_cache is None:
+            return None
+        return self._document_cache.info()
+
+    def cache_clear(self):
+        """
+        Drops all documents of the in-memory document cache and resets its statistics.
+        The document kept for random access is dropped as well.
+        """
+        if self._document_cache is not None:
+            self._document_cache.clear()
+        self._lookup_cache.clear()
+
+    def __document(self, fileid):
+        # the document of a single file for the random access methods, it is loaded only once
+        if len(self.__fileids([fileid])) == 0:
+            raise ValueError("Unknown fileid %s" % fileid)
+        cache = self._document_cache if self._document_cache is not None else self._lookup_cache
+        return cache.get(fileid, partial(self._load_document, fileid))
+
+    def __iterate(self, fileid, iterator):
+        return iterator(self._document_source(fileid))
+
+    def __views(self, fileids, iterator, convert=None):
+        fileids = self.__fileids(fileids)
+        if self._workers is not None and self._workers > 1 and len(fileids) > 1:
+            views = [MTECorpusView(f, partial(iterator, d), convert)
+                     for (f, d) in zip(fileids, self.documents(fileids))]
+        else:
+            views = [MTECorpusView(f, partial(self.__iterate, f, iterator), convert) for f in fileids]
+        if len(views) == 0:
+            return []
+        elif len(views) == 1:
+            return views[0]
+        return ConcatenatedCorpusView(views)
+
+    @staticmethod
+    def __conversion(tagset):
+        # returns the tag conversion of the tagset, or False if the tagset is unknown
+        try:
+            return MTETagConverter.tagset_conversion(tagset)
+        except ValueError:
+            print("Unknown tagset specified.")
+            return False
+
+    @staticmethod
+    def __convert_word(conversion, wt):
+        return (wt[0], conversion(wt[1]))
+
+    @staticmethod
+    def __convert_sent(conversion, s):
+        return [(w, conversion(t)) for (w, t) in s]
+
+    @staticmethod
+    def __convert_para(conversion, p):
+        return [[(w, conversion(t)) for (w, t) in s] for s in p]
+
+    def __tagged_views(self, fileids, tagset, iterator, convert):
+        conversion = MTECorpusReader.__conversion(tagset)
+        if conversion is False:
+            return None
+        return self.__views(fileids, iterator, None if conversion is None else partial(convert, conversion))
+
     def words(self, fileids=None):
         """
 	    :param fileids: A list specifying the fileids that should be used.
         :return: the given file(s) as a list of words and punctuation symbols.
         :rtype: list(str)
         """
-        return  reduce(lambda a, b : a + b ,[MTEFileReader(os.path.join(self._root, f)).words() for f in self.__fileids(fileids)], [])
+        return self.__views(fileids, lambda r: r.iter_words())
 
     def sents(self, fileids=None):
         """
@@ -200,7 +2424,7 @@ class MTECorpusReader(TaggedCorpusReader):
                  each encoded as a list of word strings
         :rtype: list(list(str))
         """
-        return  reduce(lambda a, b : a + b ,[MTEFileReader(os.path.join(self._root, f)).sents() for f in self.__fileids(fileids)], [])
+        return self.__views(fileids, lambda r: r.iter_sents())
 
     def paras(self, fileids=None):
         """
@@ -209,7 +2433,7 @@ class MTECorpusReader(TaggedCorpusReader):
                  of sentences, which are in turn encoded as lists of word string
         :rtype: list(list(list(str)))
         """
-        return  reduce(lambda a, b : a + b ,[MTEFileReader(os.path.join(self._root, f)).paras() for f in self.__fileids(fileids)], [])
+        return self.__views(fileids, lambda r: r.iter_paras())
 
     def lemma_words(self, fileids=None):
         """
@@ -218,26 +2442,22 @@ class MTECorpusReader(TaggedCorpusReader):
                  and punctuation symbols, encoded as tuples (word, lemma)
         :rtype: list(tuple(str,str))
         """
-        return  reduce(lambda a, b : a + b ,[MTEFileReader(os.path.join(self._root, f)).lemma_words() for f in self.__fileids(fileids)], [])
+        return self.__views(fileids, lambda r: r.iter_lemma_words())
 
     def tagged_words(self, fileids=None, tagset="msd", tags=None):
         """
 	    :param fileids: A list specifying the fileids that should be used.
         :param tagset: The tagset that should be used in the returned object,
-                       either "universal" or "msd", "msd" is the default
+                       either "universal", "msd" or "msd:k" for msd tags truncated
+                       to their first k attribute positions, "msd" is the default
         :param tags: An MSD Tag that is used to filter all parts of the used corpus
                      that are not more precise or at least equal to the given tag
         :return: the given file(s) as a list of tagged words and punctuation symbols
                  encoded as tuples (word, tag)
         :rtype: list(tuple(str, str))
         """
-        words = reduce(lambda a, b : a + b ,[MTEFileReader(os.path.join(self._root, f)).tagged_words(tags=tags) for f in self.__fileids(fileids)], [])
-        if tagset == "universal":
-            return map(lambda wt : (wt[0], MTETagConverter.msd_to_universal(wt[1])), words)
-        elif tagset == "msd":
-            return words
-        else:
-            print("Unknown tagset specified.")
+        return self.__tagged_views(fileids, tagset, lambda r: r.iter_tagged_words(tags=tags),
+                                   MTECorpusReader.__convert_word)
 
     def lemma_sents(self, fileids=None):
         """
@@ -247,27 +2467,40 @@ class MTECorpusReader(TaggedCorpusReader):
                  lemma (word, lemma)
         :rtype: list(list(tuple(str, str)))
         """
-        return  reduce(lambda a, b : a + b ,[MTEFileReader(os.path.join(self._root, f)).lemma_sents() for f in self.__fileids(fileids)], [])
+        return self.__views(fileids, lambda r: r.iter_lemma_sents())
 
 
     def tagged_sents(self, fileids=None, tagset="msd", tags=None):
         """
 	    :param fileids: A list specifying the fileids that should be used.
         :param tagset: The tagset that should be used in the returned object,
-                       either "universal" or "msd", "msd" is the default
+                       either "universal", "msd" or "msd:k" for msd tags truncated
+                       to their first k attribute positions, "msd" is the default
         :param tags: An MSD Tag that is used to filter all parts of the used corpus
                      that are not more precise or at least equal to the given tag
         :return: the given file(s) as a list of sentences or utterances, each
                  each encoded as a list of (word,tag) tuples
         :rtype: list(list(tuple(str, str)))
         """
-        sents = reduce(lambda a, b : a + b, [MTEFileReader(os.path.join(self._root, f)).tagged_sents(tags=tags) for f in self.__fileids(fileids)], [])
-        if tagset == "universal":
-            return map(lambda s : map (lambda wt : (wt[0], MTETagConverter.msd_to_universal(wt[1])), s), sents)
-        elif tagset == "msd":
-            return sents
-        else:
-            print("Unknown tagset specified.")
+        return self.__tagged_views(fileids, tagset, lambda r: r.iter_tagged_sents(tags=tags),
+                                   MTECorpusReader.__convert_sent)
+
+    def compact_tagged_sents(self, fileids=None, tagset="msd", tags=None):
+        """
+	    :param fileids: A list specifying the fileids that should be used.
+        :param tagset: The tagset that should be used in the returned object,
+                       either "universal", "msd" or "msd:k" for msd tags truncated
+                       to their first k attribute positions, "msd" is the default
+        :param tags: An MSD Tag that is used to filter all parts of the used corpus
+                     that are not more precise or at least equal to the given tag
+        :return: the same sentences as tagged_sents(), stored as a CompactTaggedCorpus
+        :rtype: CompactTaggedCorpus
+        """
+        conversion = MTECorpusReader.__conversion(tagset)
+        if conversion is False:
+            return None
+        sents = CompactTaggedCorpus.from_tagged_sents(self.tagged_sents(fileids, "msd", tags))
+        return sents if conversion is None else sents.project_tags(conversion)
 
     def lemma_paras(self, fileids=None):
         """
@@ -277,13 +2510,14 @@ class MTECorpusReader(TaggedCorpusReader):
                  tuples of the word and the corresponding lemma (word, lemma)
         :rtype: list(List(List(tuple(str, str))))
         """
-        return reduce(lambda a, b : a + b ,[MTEFileReader(os.path.join(self._root, f)).lemma_paras() for f in self.__fileids(fileids)], [])
+        return self.__views(fileids, lambda r: r.iter_lemma_paras())
 
     def tagged_paras(self, fileids=None, tagset="msd", tags=None):
         """
 	    :param fileids: A list specifying the fileids that should be used.
         :param tagset: The tagset that should be used in the returned object,
-                       either "universal" or "msd", "msd" is the default
+                       either "universal", "msd" or "msd:k" for msd tags truncated
+                       to their first k attribute positions, "msd" is the default
         :param tags: An MSD Tag that is used to filter all parts of the used corpus
                      that are not more precise or at least equal to the given tag
         :return: the given file(s) as a list of paragraphs, each encoded as a
@@ -291,10 +2525,325 @@ class MTECorpusReader(TaggedCorpusReader):
                  of (word,tag) tuples
         :rtype: list(list(list(tuple(str, str))))
         """
-        paras = reduce(lambda a, b : a + b, [MTEFileReader(os.path.join(self._root, f)).tagged_paras(tags=tags) for f in self.__fileids(fileids)], [])
-        if tagset == "universal":
-            return map(lambda p : map(lambda s : map (lambda wt : (wt[0], MTETagConverter.msd_to_universal(wt[0])), s), p), paras)
-        elif tagset == "msd":
-            return paras
-        else:
-            print("Unknown tagset specified.")
+        return self.__tagged_views(fileids, tagset, lambda r: r.iter_tagged_paras(tags=tags),
+                                   MTECorpusReader.__convert_para)
+
+    def tagged_sent(self, fileid, i, tagset="msd"):
+        """
+        Random access to a single sentence, only the requested sentence is decoded
+        from the document of the file instead of materializing all sentences.
+
+        :param fileid: The fileid of the file that contains the sentence
+        :param i: The position of the sentence in tagged_sents(fileid)
+        :param tagset: The tagset that should be used in the returned object,
+                       either "universal", "msd" or "msd:k" for msd tags truncated
+                       to their first k attribute positions, "msd" is the default
+        :return: the sentence encoded as a list of (word,tag) tuples
+        :rtype: list(tuple(str, str))
+        """
+        conversion = MTECorpusReader.__conversion(tagset)
+        if conversion is False:
+            return None
+        sent = self.__document(fileid).tagged_sent(i)
+        return sent if conversion is None else MTECorpusReader.__convert_sent(conversion, sent)
+
+    def tagged_sents_slice(self, fileid, start, stop, tagset="msd"):
+        """
+        Random access to a range of sentences, only the requested sentences are decoded.
+
+        :param fileid: The fileid of the file that contains the sentences
+        :param start: The position of the first sentence in tagged_sents(fileid)
+        :param stop: The position behind the last sentence in tagged_sents(fileid)
+        :param tagset: The tagset that should be used in the returned object,
+                       either "universal", "msd" or "msd:k" for msd tags truncated
+                       to their first k attribute positions, "msd" is the default
+        :return: the sentences each encoded as a list of (word,tag) tuples
+        :rtype: list(list(tuple(str, str)))
+        """
+        conversion = MTECorpusReader.__conversion(tagset)
+        if conversion is False:
+            return None
+        sents = self.__document(fileid).tagged_sents_slice(start, stop)
+        return sents if conversion is None else [MTECorpusReader.__convert_sent(conversion, s) for s in sents]
+
+    def tagged_para(self, fileid, i, tagset="msd"):
+        """
+        Random access to a single paragraph, only the requested paragraph is decoded.
+
+        :param fileid: The fileid of the file that contains the paragraph
+        :param i: The position of the paragraph in tagged_paras(fileid)
+        :param tagset: The tagset that should be used in the returned object,
+                       either "universal", "msd" or "msd:k" for msd tags truncated
+                       to their first k attribute positions, "msd" is the default
+        :return: the paragraph encoded as a list of sentences, which are in turn
+                 encoded as a list of (word,tag) tuples
+        :rtype: list(list(tuple(str, str)))
+        """
+        conversion = MTECorpusReader.__conversion(tagset)
+        if conversion is False:
+            return None
+        para = self.__document(fileid).tagged_para(i)
+        return para if conversion is None else MTECorpusReader.__convert_para(conversion, para)
+
+    def by_id(self, xml_id, fileids=None, tagset="msd"):
+        """
+        Looks up a sentence or paragraph by its TEI xml:id. A KeyError is raised
+        if none of the files contains such an element.
+
+        :param xml_id: The xml:id of an <s> or <p> element
+        :param fileids: A list specifying the fileids that should be searched.
+        :param tagset: The tagset that should be used in the returned object,
+                       either "universal", "msd" or "msd:k" for msd tags truncated
+                       to their first k attribute positions, "msd" is the default
+        :return: a sentence as list of (word,tag) tuples or a paragraph as list of such sentences
+        :rtype: list(tuple(str, str)) or list(list(tuple(str, str)))
+        """
+        conversion = MTECorpusReader.__conversion(tagset)
+        if conversion is False:
+            return None
+        # the files are loaded one by one until the element is found
+        for fileid in self.__fileids(fileids):
+            document = self.__document(fileid)
+            try:
+                kind, _ = document.locate(xml_id)
+            except KeyError:
+                continue
+            item = document.by_id(xml_id)
+            if conversion is None:
+                return item
+            return (MTECorpusReader.__convert_sent if kind == 's' else MTECorpusReader.__convert_para)(conversion, item)
+        raise KeyError(xml_id)
+
+    @staticmethod
+    def alignment_key(xml_id):
+        """
+        The default key used to align sentences of different languages. The xml:ids
+        of the translations only differ in their language specific prefix, e.g.
+        Oen.1.2.3.4 and Ocs.1.2.3.4, so the part behind the first dot is used.
+        """
+        return xml_id.split('.', 1)[1] if '.' in xml_id else xml_id
+
+    def aligned_tagged_sents(self, fileids=None, tagset="msd", key=None, complete=False):
+        """
+        Streams the sentences of several translations aligned by their xml:ids. The
+        first file is the pivot, for every one of its sentences a tuple with the
+        tagged sentence of each file is generated, None stands for a sentence that
+        has no counterpart in that file. The files are read side by side: a first
+        pass collects the alignment keys of every file, the second one walks the
+        sentences of all files together. Only sentences that are read ahead of
+        their counterpart in the pivot are held in memory, which are few as the
+        translations mostly keep the order of the original.
+
+        :param fileids: A list specifying the fileids that should be aligned, the first one is the pivot.
+        :param tagset: The tagset that should be used in the returned object,
+                       either "universal", "msd" or "msd:k" for msd tags truncated
+                       to their first k attribute positions, "msd" is the default
+        :param key: A function mapping an xml:id to the key the sentences are aligned
+                    by (default is alignment_key)
+        :param complete: Set 'True' to skip tuples with missing alignments
+        :return: a generator of tuples of tagged sentences, each encoded as a list of
+                 (word,tag) tuples or None
+        :rtype: iter(tuple(list(tuple(str, str))))
+        """
+        conversion = MTECorpusReader.__conversion(tagset)
+        if conversion is False:
+            return None
+        key = MTECorpusReader.alignment_key if key is None else key
+        return self.__aligned_tagged_sents(self.__fileids(fileids), conversion, key, complete)
+
+    def __aligned_tagged_sents(self, fileids, conversion, key, complete):
+        if len(fileids) == 0:
+            return
+        sources = [self._document_source(f) for f in fileids]
+        pivot_keys = set(key(xml_id) for xml_id in sources[0].iter_sent_ids())
+        # the keys of the other files that are still to be matched, sentences of keys
+        # the pivot does not contain are never held
+        remaining = [set(k for k in map(key, source.iter_sent_ids()) if k in pivot_keys) for source in sources[1:]]
+        streams = [source.iter_tagged_sents_with_ids() for source in sources[1:]]
+        ahead = [{} for _ in streams]
+
+        for (xml_id, sent) in sources[0].iter_tagged_sents_with_ids():
+            k = key(xml_id)
+            aligned = [sent]
+            for (stream, keys, buffered) in zip(streams, remaining, ahead):
+                if k not in keys:
+                    aligned.append(None)
+                    continue
+                keys.discard(k)
+                other = buffered.pop(k, None)
+                while other is None:
+                    other_id, other_sent = next(stream)
+                    other_key = key(other_id)
+                    if other_key == k:
+                        other = other_sent
+                    elif other_key in keys:
+                        buffered[other_key] = other_sent
+                aligned.append(other)
+            if complete and None in aligned:
+                continue
+            if conversion is not None:
+                aligned = [None if s is None else MTECorpusReader.__convert_sent(conversion, s) for s in aligned]
+            yield tuple(aligned)
+
+    def __async_executor(self, executor):
+        if executor is not None:
+            return executor
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor()
+        return self._executor
+
+    async def __aiterate(self, fileids, iterator, convert, executor, batch_size):
+        # The items are read in batches, while one batch is consumed the next one is
+        # prefetched. No more is read until the consumer asks for it, so at most two
+        # batches are held. The batches of a file are read by a thread of its own, as
+        # an lxml parser must not be resumed by another thread than the one that
+        # started it. If the consumer stops or is cancelled the generator is closed
+        # by that thread once a running batch is finished, which closes the file.
+        executor = self.__async_executor(executor)
+        for fileid in self.__fileids(fileids):
+            items = await asyncio.wrap_future(executor.submit(self.__iterate, fileid, iterator))
+            reader = ThreadPoolExecutor(max_workers=1)
+            pending = reader.submit(_next_batch, items, batch_size)
+            try:
+                while True:
+                    batch = await asyncio.wrap_future(pending)
+                    if not batch:
+                        break
+                    pending = reader.submit(_next_batch, items, batch_size)
+                    for item in batch:
+                        yield item if convert is None else convert(item)
+            finally:
+                reader.submit(items.close)
+                reader.shutdown(wait=False)
+
+    def __atagged(self, fileids, tagset, iterator, convert, executor, batch_size):
+        conversion = MTECorpusReader.__conversion(tagset)
+        if conversion is False:
+            return None
+        return self.__aiterate(fileids, iterator, None if conversion is None else partial(convert, conversion),
+                               executor, batch_size)
+
+    def aiter_words(self, fileids=None, executor=None, batch_size=1024):
+        """
+        Async version of words(), the files are parsed in an executor and the words
+        are streamed back in batches of batch_size.
+
+	    :param fileids: A list specifying the fileids that should be used.
+        :param executor: A thread based executor which opens the files (default is the executor of the reader)
+        :param batch_size: Number of items read ahead at once
+        :rtype: async iterator of str
+        """
+        return self.__aiterate(fileids, lambda r: r.iter_words(), None, executor, batch_size)
+
+    def aiter_sents(self, fileids=None, executor=None, batch_size=64):
+        """
+        Async version of sents(), see aiter_words().
+
+        :rtype: async iterator of list(str)
+        """
+        return self.__aiterate(fileids, lambda r: r.iter_sents(), None, executor, batch_size)
+
+    def aiter_paras(self, fileids=None, executor=None, batch_size=16):
+        """
+        Async version of paras(), see aiter_words().
+
+        :rtype: async iterator of list(list(str))
+        """
+        return self.__aiterate(fileids, lambda r: r.iter_paras(), None, executor, batch_size)
+
+    def aiter_tagged_words(self, fileids=None, tagset="msd", tags=None, executor=None, batch_size=1024):
+        """
+        Async version of tagged_words(), see aiter_words().
+
+        :rtype: async iterator of tuple(str, str)
+        """
+        return self.__atagged(fileids, tagset, lambda r: r.iter_tagged_words(tags=tags),
+                              MTECorpusReader.__convert_word, executor, batch_size)
+
+    def aiter_tagged_sents(self, fileids=None, tagset="msd", tags=None, executor=None, batch_size=64):
+        """
+        Async version of tagged_sents(), see aiter_words().
+
+        :rtype: async iterator of list(tuple(str, str))
+        """
+        return self.__atagged(fileids, tagset, lambda r: r.iter_tagged_sents(tags=tags),
+                              MTECorpusReader.__convert_sent, executor, batch_size)
+
+    def aiter_tagged_paras(self, fileids=None, tagset="msd", tags=None, executor=None, batch_size=16):
+        """
+        Async version of tagged_paras(), see aiter_words().
+
+        :rtype: async iterator of list(list(tuple(str, str)))
+        """
+        return self.__atagged(fileids, tagset, lambda r: r.iter_tagged_paras(tags=tags),
+                              MTECorpusReader.__convert_para, executor, batch_size)
+
+    async def awords(self, fileids=None, executor=None):
+        """
+        Coroutine returning the list of words(), the files are parsed in an executor,
+        so the event loop is not blocked. Cancelling it stops the parsing.
+
+        :rtype: list(str)
+        """
+        return [w async for w in self.aiter_words(fileids, executor)]
+
+    async def asents(self, fileids=None, executor=None):
+        """
+        Coroutine returning the list of sents(), see awords().
+
+        :rtype: list(list(str))
+        """
+        return [s async for s in self.aiter_sents(fileids, executor)]
+
+    async def aparas(self, fileids=None, executor=None):
+        """
+        Coroutine returning the list of paras(), see awords().
+
+        :rtype: list(list(list(str)))
+        """
+        return [p async for p in self.aiter_paras(fileids, executor)]
+
+    async def atagged_words(self, fileids=None, tagset="msd", tags=None, executor=None):
+        """
+        Coroutine returning the list of tagged_words(), see awords().
+
+        :rtype: list(tuple(str, str))
+        """
+        items = self.aiter_tagged_words(fileids, tagset, tags, executor)
+        return None if items is None else [w async for w in items]
+
+    async def atagged_sents(self, fileids=None, tagset="msd", tags=None, executor=None):
+        """
+        Coroutine returning the list of tagged_sents(), see awords().
+
+        :rtype: list(list(tuple(str, str)))
+        """
+        items = self.aiter_tagged_sents(fileids, tagset, tags, executor)
+        return None if items is None else [s async for s in items]
+
+    async def atagged_paras(self, fileids=None, tagset="msd", tags=None, executor=None):
+        """
+        Coroutine returning the list of tagged_paras(), see awords().
+
+        :rtype: list(list(list(tuple(str, str))))
+        """
+        items = self.aiter_tagged_paras(fileids, tagset, tags, executor)
+        return None if items is None else [p async for p in items]
+
+
+class MTEConllCorpusReader(MTECorpusReader):
+    """
+    Reader for MULTEXT-East files exported to CoNLL-U by MTECorpusReader.export_conllu().
+    It provides the same methods as MTECorpusReader (words, tagged_sents, lemma_sents,
+    tagged_paras, ...) and supports the same caches and options, only the files are
+    read by a line based parser instead of an xml parser.
+    """
+
+    def __init__(self, root=None, fileids=r'.*\.conllu(\.gz|\.xz)?', encoding='utf8', **kwargs):
+        """
+        :param root: The directory (or zip archive) containing the exported files
+        :param fileids: A list or regexp specifying the fileids in this corpus. (default is all .conllu files)
+        :param enconding: The encoding of the given files (default is utf8)
+        :param kwargs: The further options of MTECorpusReader
+        """
+        MTECorpusReader.__init__(self, root, fileids, encoding, **kwargs)
@@ -0,0 +1,78 @@
+# -*- coding: UTF-8 -*-
+"""Tests for the CoNLL-U export of MTE files."""
+import io
+import os
+import shutil
+import tempfile
+import unittest
+
+import nltk
+
+from mte import MTECorpusReader, MTEConllCorpusReader, MTEFileReader, write_conllu
+
+UNDERSCORES = u"""<?xml version="1.0" encoding="UTF-8"?>
+<TEI xmlns="http://www.tei-c.org/ns/1.0" xml:id="Oana-xx" xml:lang="xx">
+  <text>
+    <body>
+      <p xml:id="Oxx.1">
+        <s xml:id="Oxx.1.1">
+          <w lemma="_" ana="#Nc">_</w>
+          <w lemma="dog" ana="#Nc"/>
+          <w ana="#X">_</w>
+          <w ana="#X"/>
+          <c>_</c>
+          <c/>
+          <c>.</c>
+        </s>
+      </p>
+      <p xml:id="Oxx.2">
+        <s xml:id="Oxx.2.1">
+          <w lemma="house" ana="#Ncms">houses</w>
+        </s>
+      </p>
+    </body>
+  </text>
+</TEI>
+"""
+
+
+class MTEConllRoundTripTest(unittest.TestCase):
+    """
+    missing word forms and lemmas are written as '_' like literal underscores, reading an export back has to
+    yield the items of the xml file nevertheless.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        # nltk only lets corpus readers open files below its data paths
+        nltk.data.path.append(self.directory)
+        self.file_path = os.path.join(self.directory, 'oana-xx.xml')
+        with open(self.file_path, 'w', encoding='utf8') as f:
+            f.write(UNDERSCORES)
+
+    def tearDown(self):
+        nltk.data.path.remove(self.directory)
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        items = list(MTEFileReader._iterparse(self.file_path))
+        self.assertEqual(items[0][1][:4], [('_', '#Nc', '_'), (None, '#Nc', 'dog'), ('_', '#X', None),
+                                           (None, '#X', None)])
+        stream = io.StringIO()
+        write_conllu(items, stream)
+        conllu_path = os.path.join(self.directory, 'oana-xx.conllu')
+        with open(conllu_path, 'w', encoding='utf8') as f:
+            f.write(stream.getvalue())
+        self.assertEqual(list(MTEFileReader._iterparse(conllu_path)), items)
+
+    def test_export(self):
+        reader = MTECorpusReader(self.directory, 'oana-xx.xml')
+        target = os.path.join(self.directory, 'conllu')
+        reader.export_conllu(target)
+        exported = MTEConllCorpusReader(target)
+        for name in ('words', 'lemma_words', 'tagged_words', 'tagged_paras'):
+            self.assertEqual(list(getattr(exported, name)()), list(getattr(reader, name)()), name)
+
+
+if __name__ == '__main__':
+    unittest.main()
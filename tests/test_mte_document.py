@@ -0,0 +1,68 @@
+# -*- coding: UTF-8 -*-
+"""Tests for the compiled MTEDocument representation of MTE files."""
+import os
+import shutil
+import tempfile
+import unittest
+
+from mte import MTEDocument, MTEFileReader
+
+EDGE_CASES = u"""<?xml version="1.0" encoding="UTF-8"?>
+<TEI xmlns="http://www.tei-c.org/ns/1.0" xml:id="Oana-xx" xml:lang="xx">
+  <text>
+    <body>
+      <p xml:id="Oxx.1">
+        <s xml:id="Oxx.1.1">
+          <w lemma="dog" ana="#Ncns">dog</w>
+          <w ana="#Np">Smith</w>
+          <w lemma="x" ana="#X"/>
+          <c>.</c>
+        </s>
+      </p>
+    </body>
+  </text>
+</TEI>
+"""
+
+
+class MTEDocumentEdgeCaseTest(unittest.TestCase):
+    """
+    an empty <w/> has no word form and a <w> without lemma attribute has no lemma, the
+    compiled document has to return None for them exactly like the streaming reader.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, 'oana-xx.xml')
+        with open(self.file_path, 'w', encoding='utf8') as f:
+            f.write(EDGE_CASES)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def assertSameContent(self, document):
+        reader = MTEFileReader(self.file_path)
+        self.assertEqual(list(document.iter_lemma_words()), [('dog', 'dog'), ('Smith', None), (None, 'x')])
+        for name in ('iter_words', 'iter_sents', 'iter_paras', 'iter_lemma_words', 'iter_lemma_sents',
+                     'iter_lemma_paras', 'iter_tagged_words', 'iter_tagged_sents', 'iter_tagged_paras'):
+            self.assertEqual(list(getattr(document, name)()), list(getattr(reader, name)()), name)
+        self.assertEqual(list(document.iter_tagged_words('#X')), list(reader.iter_tagged_words('#X')))
+        self.assertEqual([document.token(i) for i in range(len(document))],
+                         [('dog', 'dog', '#Ncns', False), ('Smith', None, '#Np', False), (None, 'x', '#X', False),
+                          ('.', None, None, True)])
+
+    def test_compiled_document(self):
+        self.assertSameContent(MTEDocument.compile(self.file_path))
+
+    def test_cache_hit(self):
+        cache_path = os.path.join(self.directory, 'cache', 'oana-xx.mtec')
+        MTEDocument.cached(self.file_path, cache_path)
+        # the second call memory-maps the cache file written by the first one
+        document = MTEDocument.cached(self.file_path, cache_path)
+        self.assertIsInstance(document._word_ids, memoryview)
+        self.assertSameContent(document)
+        self.assertSameContent(MTEDocument.load(cache_path, self.file_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+# -*- coding: UTF-8 -*-
+"""Tests for the corpus downloader, run against a local http server."""
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import zipfile
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import MTEDownloader
+
+# garbage behind the end of the central directory, like in the archives of clarin.si
+GARBAGE = b'<html>garbage</html>' * 10
+
+
+class ArchiveHandler(BaseHTTPRequestHandler):
+    """
+    serves the archive of the server, supports Range requests unless ranges is unset
+    and sends only the first cut bytes if cut is set
+    """
+
+    def do_GET(self):
+        data = self.server.archive
+        start = 0
+        if self.server.ranges and self.headers.get('Range'):
+            start = int(self.headers['Range'][len('bytes='):-1])
+            if start >= len(data):
+                self.send_response(416)
+                self.end_headers()
+                return
+            self.send_response(206)
+        else:
+            self.send_response(200)
+        body = data[start:]
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.server.requests.append(start)
+        self.wfile.write(body[:self.server.cut] if self.server.cut is not None else body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MTEDownloaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        source = os.path.join(self.directory, 'source.zip')
+        with zipfile.ZipFile(source, 'w', zipfile.ZIP_STORED) as z:
+            for name in ('oana-en.xml', 'oana-cs.xml', '00README.txt'):
+                z.writestr('MTE1984-ana/' + name, (u'<content of %s/>' % name * 500).encode('utf8'))
+        with open(source, 'rb') as f:
+            self.repaired = f.read()
+        self.server = HTTPServer(('127.0.0.1', 0), ArchiveHandler)
+        self.server.archive = self.repaired + GARBAGE
+        self.server.ranges, self.server.cut, self.server.requests = True, None, []
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+        self.url = 'http://127.0.0.1:%d/MTE1984-ana.zip' % self.server.server_port
+        self.archive = os.path.join(self.directory, MTEDownloader.ARCHIVE_NAME)
+        self.events = []
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        shutil.rmtree(self.directory)
+
+    def fetch(self, checksum=None):
+        MTEDownloader.fetch_archive(self.url, self.archive, checksum, self.events.append)
+
+    def assertFetched(self):
+        with open(self.archive, 'rb') as f:
+            self.assertEqual(f.read(), self.repaired)
+        self.assertFalse(os.path.exists(self.archive + '.part'))
+        with open(self.archive + '.sha256') as f:
+            self.assertEqual(f.read().strip(), MTEDownloader.file_checksum(self.archive))
+
+    def test_repair_zip_trailer(self):
+        path = os.path.join(self.directory, 'broken.zip')
+        with open(path, 'wb') as f:
+            f.write(self.server.archive)
+        self.assertTrue(MTEDownloader.repair_zip_trailer(path))
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), self.repaired)
+        with open(path, 'wb') as f:
+            f.write(GARBAGE)
+        self.assertFalse(MTEDownloader.repair_zip_trailer(path))
+
+    def test_fetch(self):
+        self.fetch()
+        self.assertFetched()
+        self.assertEqual([e.phase for e in self.events][-1], 'verify')
+
+    def test_resume(self):
+        with open(self.archive + '.part', 'wb') as f:
+            f.write(self.server.archive[:1000])
+        self.fetch()
+        self.assertFetched()
+        self.assertEqual(self.server.requests, [1000])
+        self.assertEqual(self.events[0].phase, 'resume')
+        self.assertEqual(self.events[0].bytes_done, 1000)
+
+    def test_server_ignores_range(self):
+        self.server.ranges = False
+        with open(self.archive + '.part', 'wb') as f:
+            f.write(b'x' * 1000)
+        self.fetch()
+        self.assertFetched()
+
+    def test_interrupted_download_is_resumed(self):
+        self.server.cut = 1500
+        self.assertRaises(IOError, self.fetch)
+        self.assertEqual(os.path.getsize(self.archive + '.part'), 1500)
+        self.server.cut = None
+        self.fetch()
+        self.assertFetched()
+        self.assertEqual(self.server.requests, [0, 1500])
+
+    def test_checksum(self):
+        self.assertRaises(IOError, self.fetch, '0' * 64)
+        self.assertFalse(os.path.exists(self.archive))
+        self.assertFalse(os.path.exists(self.archive + '.part'))
+        # the checksum is that of the repaired archive
+        self.fetch(hashlib.sha256(self.repaired).hexdigest().upper())
+        self.assertFetched()
+
+    def test_download_skips_verified_archive(self):
+        MTEDownloader.download(self.directory, on_progress=self.events.append, url=self.url, extract=False)
+        self.assertFetched()
+        self.events = []
+        MTEDownloader.download(self.directory, on_progress=self.events.append, url=self.url, extract=False)
+        self.assertEqual([e.phase for e in self.events], ['skip', 'done'])
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_extract_languages(self):
+        self.fetch()
+        for workers in (None, 2):
+            target = os.path.join(self.directory, 'mte_teip5')
+            members = MTEDownloader.extract_archive(self.archive, target, ['en'], workers)
+            self.assertEqual(sorted(members), ['MTE1984-ana/00README.txt', 'MTE1984-ana/oana-en.xml'])
+            self.assertEqual(sorted(os.listdir(target)), ['00README.txt', 'oana-en.xml'])
+
+
+if __name__ == '__main__':
+    unittest.main()
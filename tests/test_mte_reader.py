@@ -0,0 +1,239 @@
+# -*- coding: UTF-8 -*-
+"""Tests for the access methods of the MTECorpusReader."""
+import asyncio
+import contextlib
+import gzip
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+import nltk
+
+from mte import MTECorpusReader, MTETagConverter
+
+TEMPLATE = u"""<?xml version="1.0" encoding="UTF-8"?>
+<TEI xmlns="http://www.tei-c.org/ns/1.0" xml:id="Oana-%(lang)s" xml:lang="%(lang)s">
+  <teiHeader><fileDesc><titleStmt><title>1984</title></titleStmt></fileDesc></teiHeader>
+  <text>
+    <body>
+      <div>
+%(paras)s
+      </div>
+    </body>
+  </text>
+</TEI>
+"""
+
+TOKENS = [(u'The', u'the', u'#Dd'), (u'dog', u'dog', u'#Ncms'), (u'sees', u'see', u'#Vmip3s'),
+          (u'a', u'a', u'#Di'), (u'house', u'house', u'#Ncns'), (u',', None, None), (u'and', u'and', u'#Cc'),
+          (u'it', u'it', u'#Pp3ns'), (u'is', u'be', u'#Va-p3s'), (u'big', u'big', u'#Afp'), (u'.', None, None)]
+
+
+def make_paras(lang, n_paras):
+    # paragraphs of two or three sentences, the sentence 1.1 is punctuation only
+    paras = []
+    for p in range(n_paras):
+        sents = []
+        for s in range(2 + p % 2):
+            tokens = [TOKENS[(3 * p + s + j) % len(TOKENS)] for j in range(2 + (p + s) % 5)]
+            if (p, s) == (1, 1):
+                tokens = [TOKENS[5]]
+            sents.append((u'O%s.%d.%d' % (lang, p, s), tokens))
+        paras.append((u'O%s.%d' % (lang, p), sents))
+    return paras
+
+
+def write_file(path, lang, paras):
+    def token(word, lemma, ana):
+        if ana is None:
+            return u'<c>%s</c>' % word
+        return u'<w lemma="%s" ana="%s">%s</w>' % (lemma, ana, word)
+    body = u'\n'.join(u'<p xml:id="%s">%s</p>' % (para_id, u''.join(
+        u'<s xml:id="%s">%s</s>' % (sent_id, u''.join(token(*t) for t in tokens)) for (sent_id, tokens) in sents))
+        for (para_id, sents) in paras)
+    with open(path, 'w', encoding='utf8') as f:
+        f.write(TEMPLATE % {'lang': lang, 'paras': body})
+
+
+def tagged(tokens, tags=None):
+    return [(w, t) for (w, _, t) in tokens if t is not None and (tags is None or t.startswith(tags))]
+
+
+class MTECorpusTestCase(unittest.TestCase):
+    """
+    writes a corpus of two translations into a temporary directory. The Czech one lacks a
+    sentence and has two paragraphs in the opposite order.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        # nltk only lets corpus readers open files below its data paths
+        nltk.data.path.append(self.directory)
+        self.paras = {'oana-en.xml': make_paras('en', 8), 'oana-cs.xml': make_paras('cs', 8)}
+        cs = self.paras['oana-cs.xml']
+        cs[2][1].pop()
+        cs[3], cs[4] = cs[4], cs[3]
+        for (fileid, paras) in self.paras.items():
+            write_file(os.path.join(self.directory, fileid), fileid[5:7], paras)
+
+    def tearDown(self):
+        nltk.data.path.remove(self.directory)
+        shutil.rmtree(self.directory)
+
+    def readers(self):
+        # the streaming reader and the readers backed by documents
+        return [MTECorpusReader(self.directory, r'oana-.*\.xml'),
+                MTECorpusReader(self.directory, r'oana-.*\.xml', cache_dir=os.path.join(self.directory, 'cache')),
+                MTECorpusReader(self.directory, r'oana-.*\.xml', document_cache_size=None)]
+
+    def tagged_sents(self, fileid, tags=None):
+        return [s for s in (tagged(tokens, tags) for (_, sents) in self.paras[fileid] for (_, tokens) in sents) if s]
+
+    def tagged_paras(self, fileid, tags=None):
+        paras = [[s for s in (tagged(tokens, tags) for (_, tokens) in sents) if s] for (_, sents) in self.paras[fileid]]
+        return [p for p in paras if p]
+
+
+class MTECorpusViewTest(MTECorpusTestCase):
+
+    def test_views(self):
+        words = [w for f in ('oana-cs.xml', 'oana-en.xml') for (_, sents) in self.paras[f]
+                 for (_, tokens) in sents for (w, _, _) in tokens]
+        for reader in self.readers():
+            view = reader.words()
+            self.assertNotIsInstance(view, list)
+            self.assertEqual(len(view), len(words))
+            self.assertEqual(list(view), words)
+            self.assertEqual((view[0], view[-1], list(view[5:17])), (words[0], words[-1], words[5:17]))
+            self.assertEqual(list(reader.tagged_sents('oana-en.xml')), self.tagged_sents('oana-en.xml'))
+            self.assertEqual(list(reader.tagged_paras('oana-en.xml')), self.tagged_paras('oana-en.xml'))
+            self.assertEqual(list(reader.tagged_sents('oana-en.xml', tagset='universal')),
+                             [[(w, MTETagConverter.msd_to_universal(t)) for (w, t) in s]
+                              for s in self.tagged_sents('oana-en.xml')])
+
+    def test_filtered_reads(self):
+        for reader in self.readers():
+            for tags in ('#Nc', '#V', '#D'):
+                self.assertEqual(list(reader.tagged_words('oana-en.xml', tags=tags)),
+                                 [wt for s in self.tagged_sents('oana-en.xml', tags) for wt in s])
+                self.assertEqual(list(reader.tagged_sents('oana-en.xml', tags=tags)),
+                                 self.tagged_sents('oana-en.xml', tags))
+                self.assertEqual(list(reader.tagged_paras('oana-en.xml', tags=tags)),
+                                 self.tagged_paras('oana-en.xml', tags))
+
+    def test_unknown_tagset(self):
+        reader = MTECorpusReader(self.directory, r'oana-.*\.xml')
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            self.assertIsNone(reader.tagged_sents(tagset='bogus'))
+        self.assertEqual(output.getvalue(), "Unknown tagset specified.\n")
+
+
+class MTERandomAccessTest(MTECorpusTestCase):
+
+    def test_positions(self):
+        for reader in self.readers():
+            sents, paras = self.tagged_sents('oana-en.xml'), self.tagged_paras('oana-en.xml')
+            self.assertEqual([reader.tagged_sent('oana-en.xml', i) for i in range(len(sents))], sents)
+            self.assertEqual(reader.tagged_sent('oana-en.xml', -1), sents[-1])
+            self.assertEqual(reader.tagged_sents_slice('oana-en.xml', 2, 7), sents[2:7])
+            self.assertEqual([reader.tagged_para('oana-en.xml', i) for i in range(len(paras))], paras)
+
+    def test_by_id(self):
+        for reader in self.readers():
+            for (fileid, paras) in self.paras.items():
+                for (para_id, sents) in paras:
+                    self.assertEqual(reader.by_id(para_id), [s for s in (tagged(t) for (_, t) in sents) if s])
+                    for (sent_id, tokens) in sents:
+                        self.assertEqual(reader.by_id(sent_id, [fileid]), tagged(tokens))
+            self.assertEqual(reader.by_id('Oen.0.0', tagset='msd:0'),
+                             [(w, t[:2]) for (w, t) in tagged(self.paras['oana-en.xml'][0][1][0][1])])
+            self.assertRaises(KeyError, reader.by_id, 'Oxx.0.0')
+
+    def test_lookups_keep_one_document(self):
+        reader = MTECorpusReader(self.directory, r'oana-.*\.xml')
+        self.assertRaises(KeyError, reader.by_id, 'Oxx.0.0')
+        self.assertEqual(reader._lookup_cache.info().currsize, 1)
+
+
+class MTEAlignmentTest(MTECorpusTestCase):
+
+    def expected(self, complete=False):
+        sents = dict((sent_id[4:], tagged(tokens)) for (_, s) in self.paras['oana-cs.xml'] for (sent_id, tokens) in s)
+        aligned = [(tagged(tokens), sents.get(sent_id[4:])) for (_, s) in self.paras['oana-en.xml']
+                   for (sent_id, tokens) in s]
+        return [a for a in aligned if not complete or None not in a]
+
+    def test_aligned_tagged_sents(self):
+        for reader in self.readers():
+            self.assertEqual(list(reader.aligned_tagged_sents(['oana-en.xml', 'oana-cs.xml'])), self.expected())
+            self.assertEqual(list(reader.aligned_tagged_sents(['oana-en.xml', 'oana-cs.xml'], complete=True)),
+                             self.expected(True))
+            self.assertEqual(len(self.expected()) - len(self.expected(True)), 1)
+
+    def test_unknown_tagset_is_reported_on_call(self):
+        reader = MTECorpusReader(self.directory, r'oana-.*\.xml')
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            self.assertIsNone(reader.aligned_tagged_sents(['oana-en.xml', 'oana-cs.xml'], tagset='bogus'))
+        self.assertEqual(output.getvalue(), "Unknown tagset specified.\n")
+
+
+class MTEConcordanceTest(MTECorpusTestCase):
+
+    def test_concordance(self):
+        reader = MTECorpusReader(self.directory, r'oana-.*\.xml', document_cache_size=None)
+        tokens = [t for f in ('oana-cs.xml', 'oana-en.xml') for (_, sents) in self.paras[f]
+                  for (_, s) in sents for t in s]
+        lines = reader.concordance(lemma='house', context=2)
+        self.assertEqual(len(lines), sum(1 for t in tokens if t[1] == 'house'))
+        self.assertEqual(set(line.keyword for line in lines), set([(u'house', u'house', u'#Ncns')]))
+        self.assertTrue(all(len(line.left) <= 2 and len(line.right) <= 2 for line in lines))
+        self.assertEqual(len(reader.concordance(tags='#Nc')), sum(1 for t in tokens if t[2] in ('#Ncms', '#Ncns')))
+        self.assertEqual(reader.concordance(tags='#Nc', limit=3), reader.concordance(tags='#Nc')[:3])
+        self.assertEqual(set(line.keyword[2] for line in reader.concordance(word=['dog', 'sees'], tagset='universal')),
+                         set(['NOUN', 'VERB']))
+
+
+class MTEArchiveTest(MTECorpusTestCase):
+
+    def test_zip_archive(self):
+        archive = os.path.join(self.directory, 'mte_teip5.zip')
+        with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as z:
+            for fileid in self.paras:
+                z.write(os.path.join(self.directory, fileid), 'MTE1984-ana/' + fileid)
+        reader = MTECorpusReader(archive + '/MTE1984-ana/', r'oana-.*\.xml')
+        self.assertEqual(reader.fileids(), ['oana-cs.xml', 'oana-en.xml'])
+        self.assertEqual(list(reader.tagged_sents('oana-en.xml')), self.tagged_sents('oana-en.xml'))
+        cached = MTECorpusReader(archive + '/MTE1984-ana/', r'oana-.*\.xml',
+                                 cache_dir=os.path.join(self.directory, 'cache'))
+        self.assertEqual(cached.by_id('Ocs.0.0'), tagged(self.paras['oana-cs.xml'][0][1][0][1]))
+
+    def test_compressed_file(self):
+        path = os.path.join(self.directory, 'oana-en.xml')
+        with open(path, 'rb') as f, gzip.open(path + '.gz', 'wb') as g:
+            g.write(f.read())
+        reader = MTECorpusReader(path + '.gz')
+        self.assertEqual(reader.fileids(), ['oana-en.xml.gz'])
+        self.assertEqual(list(reader.tagged_paras()), self.tagged_paras('oana-en.xml'))
+
+
+class MTEAsyncTest(MTECorpusTestCase):
+
+    def test_async_accessors(self):
+        reader = MTECorpusReader(self.directory, r'oana-.*\.xml')
+
+        async def read():
+            sents = [s async for s in reader.aiter_tagged_sents('oana-en.xml', batch_size=3)]
+            return sents, await reader.atagged_paras(tagset='universal'), await reader.atagged_sents(tagset='bogus')
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            sents, paras, unknown = asyncio.run(read())
+        self.assertEqual(sents, self.tagged_sents('oana-en.xml'))
+        self.assertEqual(paras, list(reader.tagged_paras(tagset='universal')))
+        self.assertIsNone(unknown)
+
+
+if __name__ == '__main__':
+    unittest.main()
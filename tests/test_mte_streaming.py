@@ -0,0 +1,131 @@
+# -*- coding: UTF-8 -*-
+"""Tests for the streaming parser of MTE files."""
+import os
+import shutil
+import tempfile
+import unittest
+
+from mte import MTECorpusStatistics, MTEDocument, MTEFileReader, etree, xpath
+
+HEADER = u"""<?xml version="1.0" encoding="UTF-8"?>
+<TEI xmlns="http://www.tei-c.org/ns/1.0" xml:id="Oana-xx" xml:lang="xx">
+  <teiHeader>
+    <fileDesc>
+      <titleStmt><title>1984</title></titleStmt>
+      <publicationStmt><p>first</p><p/></publicationStmt>
+      <sourceDesc><p><s><w lemma="head" ana="#Ncns">head</w></s></p></sourceDesc>
+    </fileDesc>
+  </teiHeader>
+  <text>
+    <body>
+%s
+    </body>
+    <back><p><s><w lemma="back" ana="#Ncns">back</w></s></p></back>
+  </text>
+</TEI>
+"""
+
+PARAGRAPH = u"""      <div xml:id="Oxx.%(i)d">
+        <p xml:id="Oxx.%(i)d.1">
+          <s xml:id="Oxx.%(i)d.1.1">
+            <w lemma="dog" ana="#Ncns">dog%(i)d</w>
+            <w lemma="bark" ana="#Vmip3s">barks</w>
+            <c>.</c>
+          </s>
+          %(note)s
+        </p>
+        %(outside)s
+        <p xml:id="Oxx.%(i)d.3"/>
+      </div>"""
+
+NOTE = u'<note><p><s><w lemma="note" ana="#Ncns">note</w></s></p></note>'
+
+OUTSIDE = u'<s xml:id="Oxx.%d.2"><w lemma="out" ana="#Rgp">outside</w></s>'
+
+
+def make_file(path, n_paras, nested=True):
+    # nested adds paragraphs in notes and sentences outside of paragraphs
+    body = u'\n'.join(PARAGRAPH % {'i': i, 'note': NOTE if nested and i % 3 == 0 else u'',
+                                   'outside': OUTSIDE % i if nested else u''} for i in range(n_paras))
+    with open(path, 'w', encoding='utf8') as f:
+        f.write(HEADER % body)
+
+
+class MTEStreamingTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, 'oana-xx.xml')
+        make_file(self.file_path, 5, nested=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_only_body_is_read(self):
+        # the paragraphs of the teiHeader and of the <back> are not part of the corpus
+        body = xpath(etree.parse(self.file_path).getroot(), './tei:text/tei:body', MTEFileReader.ns)[0]
+        expected = [[[w.text for w in xpath(s, './/tei:w|.//tei:c', MTEFileReader.ns)]
+                     for s in xpath(p, './/tei:s', MTEFileReader.ns)] for p in xpath(body, './/tei:p', MTEFileReader.ns)]
+        reader = MTEFileReader(self.file_path)
+        self.assertEqual(list(reader.iter_paras()), expected)
+        self.assertEqual(reader.paras(), expected)
+        self.assertEqual(len(expected), 10)
+        self.assertNotIn('head', reader.words())
+        self.assertNotIn('back', reader.words())
+
+        document = MTEDocument.compile(self.file_path)
+        self.assertEqual(document.para_count(), 10)
+        self.assertEqual(document.para_id(0), 'Oxx.0.1')
+        self.assertEqual(MTECorpusStatistics.compute(self.file_path).para_count, 10)
+
+    def test_iterators_equal_lists(self):
+        reader = MTEFileReader(self.file_path)
+        for name in ('words', 'sents', 'paras', 'lemma_words', 'lemma_sents', 'lemma_paras', 'tagged_words',
+                     'tagged_sents', 'tagged_paras'):
+            self.assertEqual(list(getattr(reader, 'iter_' + name)()), getattr(reader, name)(), name)
+        self.assertEqual(list(reader.iter_tagged_sents('#V')), reader.tagged_sents('#V'))
+
+
+class MTEChunkedParserTest(unittest.TestCase):
+    """
+    a large file parsed in chunks by several processes gives the same items as a serial parse
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, 'oana-xx.xml')
+        make_file(self.file_path, 3000)
+        self.min_chunk_size = MTEFileReader.min_chunk_size
+        MTEFileReader.min_chunk_size = 1 << 16
+
+    def tearDown(self):
+        MTEFileReader.min_chunk_size = self.min_chunk_size
+        shutil.rmtree(self.directory)
+
+    def test_chunks(self):
+        chunks = MTEFileReader._split_chunks(self.file_path, 3)
+        self.assertGreater(len(chunks), 1)
+        with open(self.file_path, 'rb') as f:
+            data = f.read()
+        # every chunk ends behind a top level paragraph of the body
+        for (start, end, prefix) in chunks[:-1]:
+            self.assertTrue(data[:end].endswith(b'</p>'))
+            self.assertGreater(end, data.find(b'<body'))
+
+    def test_chunked_equals_serial(self):
+        serial = list(MTEFileReader._iterparse(self.file_path))
+        self.assertEqual(list(MTEFileReader._iterparse(self.file_path, 3)), serial)
+        self.assertEqual(len([item for item in serial if item[1] is None]), 3000 * 2 + 1000)
+
+    def test_unparsable_chunk_falls_back_to_serial(self):
+        # a </p> in a comment is taken for the end of its paragraph, the chunk behind it cannot be parsed
+        with open(self.file_path, 'r', encoding='utf8') as f:
+            content = f.read().replace(u'<c>.</c>', u'<c>.</c><!-- </p> -->')
+        with open(self.file_path, 'w', encoding='utf8') as f:
+            f.write(content)
+        self.assertEqual(list(MTEFileReader._iterparse(self.file_path, 3)),
+                         list(MTEFileReader._iterparse(self.file_path)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+# -*- coding: UTF-8 -*-
+"""Tests for the tag conversions of MTETagConverter and CompactTaggedCorpus."""
+import pickle
+import unittest
+from functools import partial
+
+from mte import CompactTaggedCorpus, MTETagConverter
+
+SENTS = [[(u'The', u'#Dd'), (u'dog', u'#Ncms'), (u'barks', u'#Vmip3s')],
+         [(u'Smith', u'#Np'), (u'is', u'#Va-p3s'), (u'here', u'#Rgp')],
+         [(u'because', u'#Cs'), (u'of', u'#Sp'), (u'this', u'#Pd-ns')]]
+
+
+class MTETagConverterTest(unittest.TestCase):
+
+    def test_universal(self):
+        self.assertEqual([MTETagConverter.msd_to_universal(t) for (_, t) in SENTS[0] + SENTS[1]],
+                         ['DET', 'NOUN', 'VERB', 'NOUN', 'VERB', 'ADV'])
+        self.assertEqual(MTETagConverter.msd_to_universal('#Y'), 'X')
+
+    def test_upos(self):
+        self.assertEqual([MTETagConverter.msd_to_upos(t) for (_, t) in SENTS[1] + SENTS[2]],
+                         ['PROPN', 'AUX', 'ADV', 'SCONJ', 'ADP', 'PRON'])
+
+    def test_truncate(self):
+        self.assertEqual(MTETagConverter.msd_truncate('#Ds3-sm', 2), '#Ds3')
+        self.assertEqual(MTETagConverter.msd_truncate('Ds3-sm', 5), 'Ds3-sm')
+        self.assertEqual(MTETagConverter.msd_truncate('#Ncms', 0), '#N')
+
+    def test_tagset_conversion(self):
+        self.assertIsNone(MTETagConverter.tagset_conversion('msd'))
+        self.assertEqual(MTETagConverter.tagset_conversion('universal'), MTETagConverter.msd_to_universal)
+        self.assertEqual(MTETagConverter.tagset_conversion('msd:1')('#Ncms'), '#Nc')
+        for tagset in ('msd:', 'msd:x', 'bogus'):
+            self.assertRaises(ValueError, MTETagConverter.tagset_conversion, tagset)
+
+    def test_attributes(self):
+        # without a table of the language the positions are not named
+        self.assertEqual(dict(MTETagConverter.msd_to_attributes('#Ncms-n', 'sl')),
+                         {'Category': 'Noun', 'Position1': 'c', 'Position2': 'm', 'Position3': 's',
+                          'Position5': 'n'})
+        MTETagConverter.msd_language_specifications['xx'] = {'N': MTETagConverter.msd_specification['N']}
+        try:
+            self.assertEqual(dict(MTETagConverter.msd_to_attributes('Ncmsn', 'xx')),
+                             {'Category': 'Noun', 'Type': 'common', 'Gender': 'masculine', 'Number': 'singular',
+                              'Case': 'nominative'})
+        finally:
+            del MTETagConverter.msd_language_specifications['xx']
+
+    def test_convert_tag_ids(self):
+        tags = [u'#Ncms', u'#Vmip3s', u'#Ncns']
+        table, ids = MTETagConverter.convert_tag_ids(tags, [2, 0, 1, 2])
+        self.assertEqual(table, ['NOUN', 'VERB'])
+        self.assertEqual(list(ids), [0, 0, 1, 0])
+
+
+class CompactTaggedCorpusTagsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.corpus = CompactTaggedCorpus.from_tagged_sents(SENTS)
+
+    def converted(self, conversion):
+        return [[(w, conversion(t)) for (w, t) in s] for s in SENTS]
+
+    def test_project_tags(self):
+        universal = self.corpus.project_tags()
+        self.assertEqual(list(universal), self.converted(MTETagConverter.msd_to_universal))
+        # a projection shares the words and token ids with its corpus
+        self.assertIs(universal.words(), self.corpus.words())
+        self.assertEqual(list(universal[1:]), self.converted(MTETagConverter.msd_to_universal)[1:])
+        self.assertEqual(list(universal.select([2, 0])), [self.converted(MTETagConverter.msd_to_universal)[i]
+                                                          for i in (2, 0)])
+        self.assertEqual(list(pickle.loads(pickle.dumps(universal))), list(universal))
+
+    def test_msd_k(self):
+        truncate = partial(MTETagConverter.msd_truncate, positions=1)
+        projected = self.corpus.project_tags(truncate)
+        self.assertEqual(list(projected), self.converted(truncate))
+        # projections of projections convert the projected tags
+        self.assertEqual(list(projected.project_tags()), self.converted(MTETagConverter.msd_to_universal))
+        self.assertEqual(list(projected.convert_tags()), self.converted(MTETagConverter.msd_to_universal))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+# -*- coding: UTF-8 -*-
+"""Tests for the integer encoded context windows of the scikit-learn taggers."""
+import pickle
+import unittest
+
+from sklearn.feature_extraction import DictVectorizer, FeatureHasher
+
+from mte import CompactTaggedCorpus
+from MTEPosTaggerEval import SKLearnVectorGenerators as generators
+from MTEPosTaggers.MTESKTagger import (ContextWindowHasher, ContextWindowVectorizer, VectorizedContextWindowGenerator,
+                                       WordTypeFeatureCache)
+
+WORDS = [(u'The', u'#Dd'), (u'dog', u'#Ncms'), (u'sees', u'#Vmip3s'), (u'a', u'#Di'), (u'House', u'#Ncns'),
+         (u'and', u'#Cc'), (u'it', u'#Pp3ns'), (u'is', u'#Va-p3s'), (u'big', u'#Afp'), (u'1984', u'#Mc'),
+         (u"McDonald's", u'#Np'), (u'sees', u'#Vmip3p')]
+
+
+def make_sents(n_sents):
+    return [[WORDS[(7 * i + 3 * j) % len(WORDS)] for j in range(1 + i % 6)] for i in range(n_sents)]
+
+
+class ContextWindowVectorizerTest(unittest.TestCase):
+    """
+    the encoded context windows have to give the same matrices as the dictionaries of generate_vector
+    """
+
+    generators = (generators.around2(), generators.left1(), generators.suf_around1(), generators.suf_right2(),
+                  generators.feat_around1())
+
+    def setUp(self):
+        self.corpus = CompactTaggedCorpus.from_tagged_sents(make_sents(60))
+        n = len(self.corpus)
+        self.train = self.corpus.select([i for i in range(n) if i % 5])
+        self.test = self.corpus.select(range(0, n, 5))
+
+    def test_dict_vectorizer(self):
+        for generator in self.generators:
+            for train in (self.train, list(self.train)):
+                X, Y = generator.generate_vector(train)
+                X_test, _ = generator.generate_vector(self.test, True)
+                dict_vectorizer = DictVectorizer()
+                A, A_test = dict_vectorizer.fit_transform(X), dict_vectorizer.transform(X_test)
+
+                windows, labels = generator.encode(train)
+                test_windows, _ = generator.encode(self.test, True)
+                vectorizer = ContextWindowVectorizer()
+                B, B_test = vectorizer.fit_transform(windows), vectorizer.transform(test_windows)
+
+                self.assertEqual(vectorizer.feature_names_, list(dict_vectorizer.feature_names_), generator)
+                self.assertEqual((A != B).nnz, 0, generator)
+                self.assertEqual((A_test != B_test).nnz, 0, generator)
+                self.assertEqual(list(labels), list(Y))
+
+    def test_feature_hasher(self):
+        for generator in self.generators:
+            X, _ = generator.generate_vector(self.train)
+            windows, _ = generator.encode(self.train)
+            for (n_features, alternate_sign) in ((2 ** 10, True), (7, False)):
+                for (n_jobs, chunk_size) in ((None, 100000), (3, 17)):
+                    A = FeatureHasher(n_features, alternate_sign=alternate_sign).transform(X)
+                    B = ContextWindowHasher(n_features, alternate_sign, n_jobs=n_jobs,
+                                            chunk_size=chunk_size).fit_transform(windows)
+                    self.assertEqual(A.shape, B.shape)
+                    self.assertEqual((A != B).nnz, 0, (generator, n_features, n_jobs))
+
+
+class VectorizedContextWindowGeneratorTest(unittest.TestCase):
+    """
+    the folds sliced from a corpus vectorized once have to give the same matrices as vectorizing every fold
+    """
+
+    def setUp(self):
+        self.corpus = CompactTaggedCorpus.from_tagged_sents(make_sents(80))
+        n, n_folds = len(self.corpus), 4
+        chunks = [range(n - 1 - i, -1, -n_folds) for i in range(n_folds)]
+        self.folds = [(self.corpus.select([k for j in range(n_folds) if j != i for k in chunks[j]]),
+                       self.corpus.select(chunks[i])) for i in range(n_folds)]
+
+    def assertSameFolds(self, generator, vectorized):
+        for (train, test) in self.folds:
+            windows, labels = generator.encode(train)
+            test_windows, test_labels = generator.encode(test, True)
+            fresh = ContextWindowVectorizer()
+            A, A_test = fresh.fit_transform(windows), fresh.transform(test_windows)
+
+            rows, row_labels = vectorized.encode(train)
+            test_rows, test_row_labels = vectorized.encode(test, True)
+            sliced = ContextWindowVectorizer()
+            B, B_test = sliced.fit_transform(rows), sliced.transform(test_rows)
+
+            self.assertEqual(fresh.feature_names_, sliced.feature_names_)
+            self.assertEqual(A.shape, B.shape)
+            self.assertEqual((A != B).nnz, 0)
+            self.assertEqual(A_test.shape, B_test.shape)
+            self.assertEqual((A_test != B_test).nnz, 0)
+            self.assertEqual((list(labels), list(test_labels)), (list(row_labels), list(test_row_labels)))
+
+    def test_folds(self):
+        for generator in (generators.around2(), generators.suf_left2(), generators.feat_around1()):
+            self.assertSameFolds(generator, VectorizedContextWindowGenerator(generator, self.corpus))
+
+    def test_windows(self):
+        vectorized = VectorizedContextWindowGenerator(generators.around3(), self.corpus)
+        for generator in (generators.left2(), generators.right1(), generators.baseline()):
+            self.assertTrue(vectorized.covers(generator))
+            self.assertSameFolds(generator, vectorized.window(generator))
+        self.assertFalse(vectorized.covers(generators.suf_left1()))
+        self.assertRaises(ValueError, vectorized.window, generators.suf_left1())
+
+    def test_foreign_sentences(self):
+        vectorized = VectorizedContextWindowGenerator(generators.around1(), self.corpus)
+        self.assertRaises(ValueError, vectorized.encode, make_sents(3))
+        self.assertRaises(ValueError, vectorized.encode, self.corpus.project_tags().select([1]))
+
+
+class WordTypeFeatureCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.words = sorted(set(w for (w, _) in WORDS))
+
+    def test_word_shape(self):
+        self.assertEqual([generators.word_shape(w) for w in ("McDonald's", '1984', 'abc-DEF')], ["XxXx'x", 'd', 'x-X'])
+
+    def test_bounded_on_insert(self):
+        cache = WordTypeFeatureCache([('suf1', 'suffix1', generators.suffix(1))], maxsize=4)
+        tables, ids = cache.lookup(self.words[:6])
+        self.assertEqual(len(cache), 4)
+        self.assertEqual([tables[0][i] for i in ids[:, 0]], [w[-1:] for w in self.words[:6]])
+        new_tables, new_ids = cache.lookup(self.words[6:8])
+        # the new words do not fit, the cache starts over, the tables returned before stay valid
+        self.assertEqual(len(cache), 2)
+        self.assertIsNot(new_tables[0], tables[0])
+        self.assertEqual([tables[0][i] for i in ids[:, 0]], [w[-1:] for w in self.words[:6]])
+        self.assertEqual([new_tables[0][i] for i in new_ids[:, 0]], [w[-1:] for w in self.words[6:8]])
+
+    def test_cache_of_generator(self):
+        generator = generators.feat_around1()
+        generator.encode([WORDS])
+        self.assertIsNot(generator.cache, generators.feat_around1().cache)
+        self.assertEqual(len(generator.cache), len(self.words))
+        self.assertEqual(len(pickle.loads(pickle.dumps(generator)).cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()